@@ -0,0 +1,126 @@
+"""Sample-counter clock model for jitter-free source timestamps.
+
+Host timestamps attached to incoming samples are noisy: they reflect when a
+packet reached the computer (or when the graph ticked), not when the sample
+was acquired. Since devices sample at a fixed rate, the sample counter is a
+far better clock. This module fits a running linear regression of host time
+against the sample counter and stamps samples from the fitted line, giving
+exact, monotonic and evenly spaced timestamps with no downstream dejitter.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ClockModel:
+    """Running linear fit of host time against sample index.
+
+    Observations are combined with exponential forgetting, so the model
+    follows slow drift between the device and host clocks while averaging
+    out transport jitter. Until one second of signal has been observed, the
+    nominal sampling rate is used as the slope; afterwards the fitted period
+    is bounded to within ``tolerance`` of the nominal one, so that a burst of
+    late packets can never produce absurd timestamps.
+
+    Args:
+        rate (float): Nominal sampling rate in Hz.
+        half_life (float): Time, in seconds of signal, after which the weight
+            of an observation is halved. Default: 10.
+        tolerance (float): Maximum relative deviation of the fitted period
+            from the nominal one. Default: 0.1.
+
+    Example:
+        >>> clock = ClockModel(rate=250)
+        >>> clock.observe(np.arange(n), host_times)
+        >>> index = clock.timestamps(0, n)
+    """
+
+    def __init__(self, rate, half_life=10.0, tolerance=0.1):
+        self._period = 1.0 / rate
+        self._bounds = (self._period * (1 - tolerance), self._period * (1 + tolerance))
+        self._half_life = half_life * rate  # in samples
+        self._warmup = rate  # samples observed before trusting the slope
+        self._x0 = None  # reference sample index
+        self._t0 = None  # reference host time
+        self._weight = 0.0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cxx = 0.0  # sum of squared deviations of x
+        self._cxy = 0.0  # sum of co-deviations of x and y
+        self._last_x = None
+        self._last_offset = None  # last emitted time, relative to t0
+
+    @property
+    def period(self):
+        """Current estimate of the sampling period, in seconds."""
+        if self._last_x is not None and self._last_x >= self._warmup and self._cxx > 0:
+            return float(np.clip(self._cxy / self._cxx, *self._bounds))
+        return self._period
+
+    def observe(self, indices, times):
+        """Register that samples ``indices`` reached the host at ``times``.
+
+        Args:
+            indices (int or array): Sample counter values.
+            times (float or array): Host times in seconds since the epoch.
+        """
+        x = np.atleast_1d(np.asarray(indices, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        if x.size == 0:
+            return
+        if self._x0 is None:
+            self._x0 = x[0]
+            self._t0 = y[0]
+            self._last_x = 0.0
+        x = x - self._x0
+        y = y - self._t0
+
+        # Forget in proportion to the amount of signal elapsed since last time
+        elapsed = max(0.0, x[-1] - self._last_x)
+        self._last_x = x[-1]
+        decay = 0.5 ** (elapsed / self._half_life)
+        weight = self._weight * decay
+        cxx = self._cxx * decay
+        cxy = self._cxy * decay
+
+        # Merge batch statistics into the running ones (Chan et al.)
+        n = x.size
+        mean_x = x.mean()
+        mean_y = y.mean()
+        dx = x - mean_x
+        total = weight + n
+        delta_x = mean_x - self._mean_x
+        delta_y = mean_y - self._mean_y
+        correction = weight * n / total
+        self._cxx = cxx + np.dot(dx, dx) + delta_x * delta_x * correction
+        self._cxy = cxy + np.dot(dx, y - mean_y) + delta_x * delta_y * correction
+        self._mean_x += delta_x * n / total
+        self._mean_y += delta_y * n / total
+        self._weight = total
+
+    def timestamps(self, start, count):
+        """Return evenly spaced host times for samples ``start .. start + count``.
+
+        Successive calls are guaranteed to be strictly increasing, even when
+        the fit moves backwards between two chunks. Offsets are computed
+        relative to the first observation and only then added to it, so the
+        spacing is exact to the nanosecond.
+
+        Args:
+            start (int): Sample counter value of the first sample.
+            count (int): Number of samples.
+
+        Returns:
+            DatetimeIndex: UTC timestamps.
+        """
+        if self._x0 is None:
+            raise RuntimeError("ClockModel needs at least one observation")
+        period = self.period
+        first = self._mean_y + period * (start - self._x0 - self._mean_x)
+        if self._last_offset is not None and first <= self._last_offset:
+            first = self._last_offset + period
+        offsets = first + period * np.arange(count)
+        if count:
+            self._last_offset = offsets[-1]
+        origin = np.int64(round(self._t0 * 1e9))
+        return pd.to_datetime(origin + np.round(offsets * 1e9).astype(np.int64), utc=True)
@@ -0,0 +1,84 @@
+"""Fixed-size circular buffer for multi-channel sample streams.
+
+Acquisition threads write into the buffer at their own cadence while the
+graph thread reads only what is new. Memory is allocated once; when the
+reader falls behind, the oldest unread samples are overwritten and counted.
+"""
+
+import threading
+import numpy as np
+
+
+class RingBuffer:
+    """Thread-safe circular buffer of shape (rows, capacity).
+
+    Samples are stored column-wise, matching the layout returned by
+    ``BoardShim.get_board_data()`` (one row per channel).
+
+    Args:
+        rows (int): Number of channels (rows) per sample.
+        capacity (int): Maximum number of samples held in the buffer.
+        dtype: Numpy dtype of the storage. Default: float64.
+
+    Attributes:
+        overflows (int): Total number of unread samples dropped because
+            the buffer was full.
+    """
+
+    def __init__(self, rows, capacity, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1 sample")
+        self._data = np.zeros((rows, capacity), dtype=dtype)
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._written = 0  # total samples ever written
+        self._read = 0     # total samples ever read (or dropped)
+        self.overflows = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def written(self):
+        """Total number of samples written since creation."""
+        return self._written
+
+    def __len__(self):
+        with self._lock:
+            return self._written - self._read
+
+    def write(self, chunk):
+        """Append a (rows, n) chunk, overwriting the oldest samples if needed."""
+        n = chunk.shape[1]
+        if n == 0:
+            return
+        with self._lock:
+            # Only the most recent `capacity` samples can ever be read back
+            skipped = max(0, n - self._capacity)
+            if skipped:
+                chunk = chunk[:, skipped:]
+            start = (self._written + skipped) % self._capacity
+            count = chunk.shape[1]
+            first = min(count, self._capacity - start)
+            self._data[:, start:start + first] = chunk[:, :first]
+            if first < count:
+                self._data[:, :count - first] = chunk[:, first:]
+            self._written += n
+            dropped = self._written - self._read - self._capacity
+            if dropped > 0:
+                self._read += dropped
+                self.overflows += dropped
+
+    def read(self):
+        """Return a copy of all unread samples as a (rows, m) array."""
+        with self._lock:
+            count = self._written - self._read
+            start = self._read % self._capacity
+            first = min(count, self._capacity - start)
+            out = np.empty((self._data.shape[0], count), dtype=self._data.dtype)
+            out[:, :first] = self._data[:, start:start + first]
+            if first < count:
+                out[:, first:] = self._data[:, :count - first]
+            self._read = self._written
+        return out
@@ -0,0 +1,112 @@
+"""Memory-mapped, looping signal bank for near-zero-CPU simulation.
+
+Long soak tests do not need unique signals. A multi-channel signal is
+generated once, with a crossfaded loop point, saved as a ``.npy`` file and
+memory-mapped. Streaming then costs one copy per chunk, with continuous
+wrap-around and an optional random gain per loop to avoid exact repetition.
+"""
+
+import json
+import os
+import numpy as np
+
+
+class WaveTable:
+    """Looping reader over a memory-mapped (samples, channels) signal bank.
+
+    Args:
+        path (str): Path of the ``.npy`` bank. It is created with ``generate``
+            if it does not exist yet. A ``.json`` sidecar records the
+            parameters it was built with: with a ``generate`` callable, the
+            bank is rebuilt when they differ.
+        generate (callable): Called as ``generate(length)`` when the bank must
+            be created. Must return a (samples, channels) array, at least
+            ``length`` samples long. Default: None (the bank must exist, and
+            is used as is).
+        length (int): Number of samples to request from ``generate``.
+        crossfade (int): Number of trailing samples blended into the start of
+            the bank, so that the loop point is seamless. They are removed
+            from the bank. Default: 0.
+        start (int): Initial read position, in samples. Readers sharing a bank
+            can be offset from each other. Default: 0.
+        modulation (float): Standard deviation of a random gain drawn for each
+            loop around the bank, around 1. Default: 0 (no modulation).
+        seed (int): Seed of the gain modulation. Default: None.
+        params (dict): JSON-serializable parameters of ``generate`` (rate,
+            seed, amplitudes...), recorded in the sidecar with ``length``
+            and ``crossfade``. Default: None.
+
+    Example:
+        >>> table = WaveTable("bank.npy", generate=simulate, length=60 * 250)
+        >>> chunk = table.read(25)  # (25, channels)
+    """
+
+    def __init__(self, path, generate=None, length=None, crossfade=0, start=0,
+                 modulation=0.0, seed=None, params=None):
+        if generate is None:
+            if not os.path.exists(path):
+                raise ValueError(f"Wavetable '{path}' does not exist and no generator was given")
+        else:
+            source = {"length": length, "crossfade": crossfade, "params": params}
+            try:
+                with open(f"{path}.json") as file:
+                    built = json.load(file)
+            except (OSError, ValueError):
+                built = None
+            if built != source or not os.path.exists(path):
+                self.create(path, generate(length), crossfade)
+                with open(f"{path}.json", "w") as file:
+                    json.dump(source, file)
+        self._data = np.load(path, mmap_mode="r")
+        if self._data.ndim != 2 or len(self._data) == 0:
+            raise ValueError(f"Wavetable '{path}' must be a non-empty (samples, channels) array")
+        self._position = start % len(self._data)
+        self._modulation = modulation
+        self._rng = np.random.default_rng(seed)
+        self._gain = self._draw_gain()
+
+    @staticmethod
+    def create(path, data, crossfade=0):
+        """Save ``data`` as a loopable bank, crossfading its tail into its head."""
+        data = np.array(data, dtype=np.float64)
+        if data.ndim == 1:
+            data = data[:, None]
+        if crossfade:
+            if crossfade >= len(data):
+                raise ValueError("Wavetable crossfade must be shorter than the signal")
+            head, tail = data[:crossfade], data[-crossfade:]
+            # Ramp from the tail continuation (at the loop point) to the head
+            weight = (np.arange(crossfade) / crossfade)[:, None]
+            data[:crossfade] = head * weight + tail * (1 - weight)
+            data = data[:-crossfade]
+        temp = f"{path}.tmp.npy"
+        np.save(temp, data)
+        os.replace(temp, path)
+
+    @property
+    def channels(self):
+        """Number of channels in the bank."""
+        return self._data.shape[1]
+
+    def __len__(self):
+        return len(self._data)
+
+    def _draw_gain(self):
+        if not self._modulation:
+            return 1.0
+        return 1.0 + self._modulation * self._rng.standard_normal()
+
+    def read(self, n):
+        """Return the next ``n`` samples as a (n, channels) array."""
+        out = np.empty((n, self._data.shape[1]))
+        filled = 0
+        while filled < n:
+            count = min(n - filled, len(self._data) - self._position)
+            np.multiply(self._data[self._position:self._position + count], self._gain,
+                        out=out[filled:filled + count])
+            filled += count
+            self._position += count
+            if self._position == len(self._data):
+                self._position = 0
+                self._gain = self._draw_gain()
+        return out
@@ -3,15 +3,40 @@
 Wraps BrainFlow's BoardShim to provide a Timeflux-compatible data source
 that supports 15+ consumer EEG devices (Muse 2/S, OpenBCI Ganglion,
 BrainBit, Unicorn, Crown, FreeEEG32, and more).
+
+An optional background reader thread can drain the board at its own
+cadence into a bounded ring buffer, so that acquisition latency and memory
+stay constant regardless of how slowly the graph ticks.
+
+Optional detrend, bandpass and notch filtering run inside the source on
+the raw numpy rows, with filter state carried from one chunk to the next,
+and the filtered stream is published next to the raw one.
+
+Accelerometer, PPG and analog channels of the same session can be fanned
+out to dedicated ports, each with its own sampling rate, so that a single
+BrainFlow session feeds EEG, motion and heart pipelines.
+
+A playback mode replays a BrainFlow CSV file or a recorded HDF5 session
+instead of opening a device, at real time, N times faster, or as fast as
+possible, for reproducible benchmarks without hardware.
 """
 
+import json
+import os
+import threading
+import time
 import numpy as np
 import pandas as pd
+from scipy import signal
 from timeflux.core.node import Node
 from timeflux.helpers.clock import now
 
-from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds
-from brainflow.data_filter import DataFilter
+from brainflow.board_shim import (
+    BoardShim, BrainFlowInputParams, BoardIds, BrainFlowPresets, BrainFlowError,
+)
+
+from nodes.common.clock import ClockModel
+from nodes.common.ringbuffer import RingBuffer
 
 # Mapping from human-readable device names to BrainFlow board IDs
 BOARD_MAP = {
@@ -57,6 +82,186 @@ CHANNEL_NAMES = {
 }
 
 
+# Auxiliary outputs: BoardShim channel getter and column name prefix
+AUX_CHANNELS = {
+    "accel": ("get_accel_channels", "ACC"),
+    "ppg": ("get_ppg_channels", "PPG"),
+    "aux": ("get_analog_channels", "AUX"),
+}
+
+
+def _resolve_board_id(device):
+    """Return the BrainFlow board ID for a device name or numeric ID."""
+    if device in BOARD_MAP:
+        return BOARD_MAP[device]
+    try:
+        return int(device)
+    except (ValueError, TypeError):
+        raise ValueError(
+            f"Unknown device '{device}'. "
+            f"Valid names: {sorted(BOARD_MAP.keys())}"
+        )
+
+
+def _column_names(device, channels, count):
+    """Return EEG column names: user override, device profile, or generic."""
+    if channels:
+        return channels[:count]
+    if device in CHANNEL_NAMES:
+        return CHANNEL_NAMES[device][:count]
+    return [f"Ch{i+1}" for i in range(count)]
+
+
+def _find_aux_channels(board_id, kind):
+    """Return the (preset, channels) providing an auxiliary channel type.
+
+    Some boards (e.g. Muse) stream accelerometer and PPG data on secondary
+    presets with their own sampling rates; others (e.g. Cyton) interleave
+    them with EEG in the default preset, which is preferred when available.
+    """
+    if kind not in AUX_CHANNELS:
+        raise ValueError(f"Unknown aux output '{kind}'. Valid names: {sorted(AUX_CHANNELS)}")
+    getter = getattr(BoardShim, AUX_CHANNELS[kind][0])
+    for preset in sorted(BoardShim.get_board_presets(board_id)):
+        try:
+            channels = getter(board_id, preset)
+        except BrainFlowError:
+            continue
+        if channels:
+            return preset, channels
+    raise ValueError(f"Board {board_id} provides no {kind} channels")
+
+
+def _aux_names(kind, count):
+    """Return column names for an auxiliary output (e.g. ACCX, ACCY, ACCZ)."""
+    prefix = AUX_CHANNELS[kind][1]
+    if kind == "accel" and count == 3:
+        return [f"{prefix}X", f"{prefix}Y", f"{prefix}Z"]
+    return [f"{prefix}{i+1}" for i in range(count)]
+
+
+def _open_board(board_id, serial_port="", mac_address="", ip_address="", ip_port=0):
+    """Prepare a BoardShim session and start streaming."""
+    params = BrainFlowInputParams()
+    if serial_port:
+        params.serial_port = serial_port
+    if mac_address:
+        params.mac_address = mac_address
+    if ip_address:
+        params.ip_address = ip_address
+    if ip_port:
+        params.ip_port = ip_port
+    board = BoardShim(board_id, params)
+    board.prepare_session()
+    board.start_stream()
+    return board
+
+
+def _release_board(board):
+    """Stop streaming and release a BoardShim session, ignoring errors."""
+    try:
+        if board.is_prepared():
+            board.stop_stream()
+            board.release_session()
+    except Exception:
+        pass
+
+
+class _BoardReader:
+    """Background thread draining a BoardShim session into a ring buffer.
+
+    Args:
+        board (BoardShim): A prepared and streaming board session.
+        rows (int): Number of rows returned by ``get_board_data()``.
+        capacity (int): Ring buffer size in samples.
+        poll_interval (float): Delay between two reads of the board, in seconds.
+        presets (dict): Optional secondary presets to drain as well, mapped
+            to their (rows, capacity). Their buffers are in ``self.presets``.
+    """
+
+    def __init__(self, board, rows, capacity, poll_interval, presets=None):
+        self._board = board
+        self._poll_interval = poll_interval
+        self.buffer = RingBuffer(rows, capacity)
+        self.presets = {
+            preset: RingBuffer(preset_rows, preset_capacity)
+            for preset, (preset_rows, preset_capacity) in (presets or {}).items()
+        }
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self._poll_interval)
+
+    def poll(self):
+        """Move everything currently held by BrainFlow into the ring buffer."""
+        data = self._board.get_board_data()
+        if data.shape[1]:
+            self.buffer.write(data)
+        for preset, buffer in self.presets.items():
+            data = self._board.get_board_data(preset=preset)
+            if data.shape[1]:
+                buffer.write(data)
+
+
+def _load_recording(path, key, board_id, num_rows, eeg_channels, timestamp_channel,
+                    column_names):
+    """Memory-map a recording as a (samples, rows) array in BoardShim's layout.
+
+    The file is parsed once into a ``.npy`` cache next to it; later runs map
+    the cache directly. A ``.json`` sidecar records the source modification
+    time and size, the board and its layout: the cache is rebuilt whenever
+    one of them differs. BrainFlow CSV files (as written by
+    ``DataFilter.write_file``) already use the board layout. HDF5 sessions
+    recorded by Timeflux are laid out by column name, so their EEG columns
+    are scattered back into the board's EEG rows.
+    """
+    if path.endswith((".h5", ".hdf5")):
+        cache = f"{path}.{key.strip('/').replace('/', '_')}.npy"
+    else:
+        cache = f"{path}.npy"
+    stat = os.stat(path)
+    source = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "board_id": int(board_id),
+        "num_rows": int(num_rows),
+        "eeg_channels": [int(row) for row in eeg_channels],
+        "timestamp_channel": int(timestamp_channel),
+        "column_names": list(column_names),
+    }
+    try:
+        with open(f"{cache}.json") as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        cached = None
+    if cached != source or not os.path.exists(cache):
+        if path.endswith((".h5", ".hdf5")):
+            frame = pd.read_hdf(path, key)
+            missing = [name for name in column_names if name not in frame.columns]
+            if missing:
+                raise ValueError(f"Channels {missing} not found in '{path}' ({key})")
+            data = np.zeros((len(frame), num_rows))
+            data[:, eeg_channels] = frame[column_names].values
+            data[:, timestamp_channel] = frame.index.as_unit("ns").asi8 / 1e9
+        else:
+            data = np.loadtxt(path, delimiter="\t", ndmin=2)
+        np.save(cache, data)
+        with open(f"{cache}.json", "w") as file:
+            json.dump(source, file)
+    return np.load(cache, mmap_mode="r")
+
+
 class BrainFlowSource(Node):
     """Acquire EEG data from any BrainFlow-supported device.
 
@@ -72,61 +277,272 @@ class BrainFlowSource(Node):
         ip_address (str): IP address for WiFi devices.
         ip_port (int): IP port for WiFi devices.
         channels (list): Override default channel names.
+        threaded (bool): If True, drain the board from a background thread
+            into a fixed-size ring buffer instead of on each graph tick.
+        poll_interval (float): Delay between two board reads of the
+            background thread, in seconds. Default: 0.01.
+        buffer_duration (float): Capacity of the ring buffer, in seconds.
+            When the graph falls further behind, the oldest samples are
+            dropped and counted. Default: 10.
+        clock (str): Timestamping strategy. "board" uses BrainFlow's
+            per-sample timestamp channel as is. "model" fits host time
+            against the sample counter and emits evenly spaced, monotonic
+            timestamps, so no downstream dejitter node is needed.
+            Default: "board".
+        playback (str): Path to a BrainFlow CSV file or a recorded HDF5
+            session to replay instead of opening the device. The device
+            name still selects the channel layout and sampling rate.
+        speed (float): Playback speed relative to real time (e.g. 4 for
+            4x). Use 0 to replay as fast as possible. Default: 1.
+        playback_chunk (float): Duration of signal emitted per update when
+            replaying as fast as possible, in seconds. Default: 1.
+        loop (bool): Restart from the beginning at the end of the file.
+            Default: False.
+        key (str): HDF5 key holding the EEG frame. Default: "/eeg_raw".
+        detrend (str): Remove a "constant" or "linear" trend before
+            filtering, fitted on the signal received so far. Default: None.
+        bandpass (list): Bandpass edges in Hz, e.g. [0.1, 40]. Default: None.
+        notch (int): Power line frequency to remove, 50 or 60. Default: None.
+        filter_order (int): Butterworth order of the bandpass. Default: 2.
+        aux (list): Auxiliary outputs to publish from the same session, any
+            of "accel", "ppg" and "aux" (analog channels). Default: None.
 
     Attributes:
-        o (Port): Default output, provides DataFrame with EEG data.
+        o (Port): Default output, provides DataFrame with raw EEG data.
+        o_filtered (Port): Filtered EEG data, when any filter is enabled.
+        o_accel (Port): Accelerometer data (ACCX, ACCY, ACCZ), if requested.
+        o_ppg (Port): PPG data (PPG1, PPG2, ...), if requested.
+        o_aux (Port): Analog channels (AUX1, AUX2, ...), if requested.
     """
 
     def __init__(self, device="synthetic", serial_port="", mac_address="",
-                 ip_address="", ip_port=0, channels=None):
+                 ip_address="", ip_port=0, channels=None, threaded=False,
+                 poll_interval=0.01, buffer_duration=10, clock="board",
+                 playback=None, speed=1, playback_chunk=1, loop=False,
+                 key="/eeg_raw", detrend=None, bandpass=None, notch=None,
+                 filter_order=2, aux=None):
         self._device = device
         self._channels_override = channels
 
-        # Resolve board ID
-        if device in BOARD_MAP:
-            self._board_id = BOARD_MAP[device]
-        else:
-            try:
-                self._board_id = int(device)
-            except (ValueError, TypeError):
-                raise ValueError(
-                    f"Unknown device '{device}'. "
-                    f"Valid names: {sorted(BOARD_MAP.keys())}"
-                )
-
-        # Configure BrainFlow parameters
-        params = BrainFlowInputParams()
-        if serial_port:
-            params.serial_port = serial_port
-        if mac_address:
-            params.mac_address = mac_address
-        if ip_address:
-            params.ip_address = ip_address
-        if ip_port:
-            params.ip_port = ip_port
-
-        # Create and start board
-        self._board = BoardShim(self._board_id, params)
-        self._board.prepare_session()
-        self._board.start_stream()
+        self._board_id = _resolve_board_id(device)
 
         # Resolve channel info
         self._eeg_channels = BoardShim.get_eeg_channels(self._board_id)
         self._timestamp_channel = BoardShim.get_timestamp_channel(self._board_id)
         self._sample_rate = BoardShim.get_sampling_rate(self._board_id)
 
-        # Resolve column names
-        if channels:
-            self._column_names = channels[:len(self._eeg_channels)]
-        elif device in CHANNEL_NAMES:
-            names = CHANNEL_NAMES[device]
-            self._column_names = names[:len(self._eeg_channels)]
+        self._column_names = _column_names(device, channels, len(self._eeg_channels))
+
+        # Timestamping
+        if clock not in ("board", "model"):
+            raise ValueError(f"Unknown clock '{clock}'. Valid values: ['board', 'model']")
+        self._clock = ClockModel(self._sample_rate) if clock == "model" else None
+        self._sample_count = 0
+
+        # In-source filtering
+        if detrend not in (None, "constant", "linear"):
+            raise ValueError(
+                f"Unknown detrend '{detrend}'. Valid values: ['constant', 'linear']"
+            )
+        if notch not in (None, 50, 60):
+            raise ValueError(f"Unknown notch '{notch}'. Valid values: [50, 60]")
+        self._detrend = detrend
+        self._filtering = bool(detrend or bandpass or notch)
+        sections = []
+        if notch:
+            sections.append(signal.tf2sos(*signal.iirnotch(notch, 30, fs=self._sample_rate)))
+        if bandpass:
+            sections.append(signal.butter(filter_order, bandpass, btype="bandpass",
+                                          fs=self._sample_rate, output="sos"))
+        self._sos = np.vstack(sections) if sections else None
+        self._zi = None  # filter state, (sections, channels, 2)
+        self._trend = None  # running sums of the detrend fit, per channel
+        self._filtered = 0  # samples filtered so far
+
+        # Auxiliary outputs, grouped by the preset that carries them
+        default = BrainFlowPresets.DEFAULT_PRESET
+        self._aux = {}      # kind -> (preset, channels, names)
+        self._presets = {}  # secondary preset -> stream state
+        for kind in aux or []:
+            preset, channels = _find_aux_channels(self._board_id, kind)
+            self._aux[kind] = (preset, channels, _aux_names(kind, len(channels)))
+            if preset == default or preset in self._presets:
+                continue
+            if playback:
+                raise ValueError(f"Aux output '{kind}' is not recorded in playback files")
+            rate = BoardShim.get_sampling_rate(self._board_id, preset)
+            self._presets[preset] = {
+                "rate": rate,
+                "timestamp_channel": BoardShim.get_timestamp_channel(self._board_id, preset),
+                "clock": ClockModel(rate) if clock == "model" else None,
+                "count": 0,
+                "overflows": 0,
+            }
+
+        self._board = None
+        self._reader = None
+        self._overflows = 0
+        self._playback = None
+        if playback:
+            self._open_playback(playback, key, speed, playback_chunk, loop)
+            return
+
+        self._board = _open_board(self._board_id, serial_port, mac_address,
+                                  ip_address, ip_port)
+
+        # Optional acquisition thread
+        if threaded:
+            rows = BoardShim.get_num_rows(self._board_id)
+            capacity = max(1, int(buffer_duration * self._sample_rate))
+            presets = {
+                preset: (BoardShim.get_num_rows(self._board_id, preset),
+                         max(1, int(buffer_duration * stream["rate"])))
+                for preset, stream in self._presets.items()
+            }
+            self._reader = _BoardReader(self._board, rows, capacity, poll_interval, presets)
+            self._reader.start()
+
+    def _open_playback(self, path, key, speed, chunk, loop):
+        rows = BoardShim.get_num_rows(self._board_id)
+        self._playback = _load_recording(
+            path, key, self._board_id, rows, self._eeg_channels,
+            self._timestamp_channel, self._column_names,
+        )
+        if len(self._playback) == 0:
+            raise ValueError(f"Recording '{path}' is empty")
+        self._speed = speed
+        self._playback_chunk = max(1, int(chunk * self._sample_rate))
+        self._loop = loop
+        self._played = 0  # samples emitted so far
+        self._start = time.time()
+        # Replayed samples are re-stamped on a virtual clock starting now
+        self._clock = ClockModel(self._sample_rate)
+        self._clock.observe(0, self._start)
+
+    def _read_playback(self):
+        """Return the next slice of the recording, as (rows, n)."""
+        if self._speed:
+            due = int((time.time() - self._start) * self._speed * self._sample_rate)
+            count = due - self._played
         else:
-            self._column_names = [f"Ch{i+1}" for i in range(len(self._eeg_channels))]
+            count = self._playback_chunk
+        total = len(self._playback)
+        if not self._loop:
+            count = min(count, total - self._played)
+        if count <= 0:
+            return np.empty((self._playback.shape[1], 0))
+        positions = (self._played + np.arange(count)) % total
+        start = positions[0]
+        if start + count <= total:
+            chunk = self._playback[start:start + count]
+        else:
+            chunk = self._playback[positions]
+        self._played += count
+        return np.asarray(chunk).T
+
+    def _read(self):
+        """Return all samples received since the previous call."""
+        if self._playback is not None:
+            return self._read_playback()
+        if self._reader is None:
+            return self._board.get_board_data()
+        overflows = self._reader.buffer.overflows
+        if overflows > self._overflows:
+            self.logger.warning(
+                f"Acquisition buffer overflow: {overflows - self._overflows} samples dropped"
+            )
+            self._overflows = overflows
+        return self._reader.buffer.read()
+
+    def _read_preset(self, preset):
+        """Return new samples of a secondary preset, with their timestamps."""
+        stream = self._presets[preset]
+        if self._reader is None:
+            data = self._board.get_board_data(preset=preset)
+        else:
+            buffer = self._reader.presets[preset]
+            if buffer.overflows > stream["overflows"]:
+                self.logger.warning(
+                    f"Acquisition buffer overflow on preset {preset}: "
+                    f"{buffer.overflows - stream['overflows']} samples dropped"
+                )
+                stream["overflows"] = buffer.overflows
+            data = buffer.read()
+        count = data.shape[1]
+        timestamps = data[stream["timestamp_channel"], :]
+        if stream["clock"] is None:
+            return data, pd.to_datetime(timestamps, unit="s", utc=True)
+        stream["clock"].observe(np.arange(stream["count"], stream["count"] + count), timestamps)
+        index = stream["clock"].timestamps(stream["count"], count)
+        stream["count"] += count
+        return data, index
+
+    def _publish_aux(self, data, index):
+        """Slice auxiliary outputs from default-preset data or their own preset."""
+        secondary = {}
+        for kind, (preset, channels, names) in self._aux.items():
+            if preset == BrainFlowPresets.DEFAULT_PRESET:
+                rows, rows_index, rate = data, index, self._sample_rate
+            else:
+                if preset not in secondary:
+                    secondary[preset] = self._read_preset(preset)
+                rows, rows_index = secondary[preset]
+                rate = self._presets[preset]["rate"]
+            if rows is None or rows.shape[1] == 0:
+                continue
+            port = getattr(self, f"o_{kind}")
+            port.data = pd.DataFrame(rows[channels, :].T, index=rows_index, columns=names)
+            port.meta = {"rate": rate}
+
+    def _remove_trend(self, eeg):
+        """Subtract the trend fitted on all samples up to each one, from running sums."""
+        count = eeg.shape[1]
+        t = np.arange(self._filtered, self._filtered + count, dtype=np.float64)
+        if self._trend is None:
+            zeros = np.zeros(eeg.shape[0])
+            self._trend = {"x": zeros, "tx": zeros.copy(), "t": 0.0, "tt": 0.0}
+        # Cumulative sums at each sample, carried over from the previous chunks
+        n = t + 1
+        sum_x = self._trend["x"][:, None] + np.cumsum(eeg, axis=1)
+        mean = sum_x / n
+        if self._detrend == "constant":
+            trend = mean
+        else:
+            sum_t = self._trend["t"] + np.cumsum(t)
+            sum_tt = self._trend["tt"] + np.cumsum(t * t)
+            sum_tx = self._trend["tx"][:, None] + np.cumsum(t * eeg, axis=1)
+            denominator = n * sum_tt - sum_t ** 2
+            with np.errstate(invalid="ignore", divide="ignore"):
+                slope = np.where(denominator > 0, (n * sum_tx - sum_t * sum_x) / denominator, 0.0)
+            trend = mean + slope * (t - sum_t / n)
+            self._trend["t"], self._trend["tt"] = sum_t[-1], sum_tt[-1]
+            self._trend["tx"] = sum_tx[:, -1]
+        self._trend["x"] = sum_x[:, -1]
+        return eeg - trend
+
+    def _filter(self, eeg):
+        """Filter a (channels, n) chunk, returning the filtered (channels, n) chunk.
+
+        Only the new samples are filtered: the detrend sums and the filter
+        state are carried across chunks, so the output is the same as one
+        pass over the whole signal.
+        """
+        eeg = eeg.astype(np.float64)
+        if self._detrend:
+            eeg = self._remove_trend(eeg)
+        if self._sos is not None:
+            if self._zi is None:
+                # Start at steady state on the first sample, so that the DC offset is not a step
+                self._zi = signal.sosfilt_zi(self._sos)[:, None, :] * eeg[None, :, :1]
+            eeg, self._zi = signal.sosfilt(self._sos, eeg, axis=1, zi=self._zi)
+        self._filtered += eeg.shape[1]
+        return eeg
 
     def update(self):
-        data = self._board.get_board_data()
+        data = self._read()
         if data.shape[1] == 0:
+            if self._aux:
+                self._publish_aux(None, None)
             return
 
         # Extract EEG channels
@@ -134,7 +550,15 @@ class BrainFlowSource(Node):
 
         # Build timestamps from BrainFlow's timestamp channel
         timestamps = data[self._timestamp_channel, :]
-        index = pd.to_datetime(timestamps, unit="s", utc=True)
+        if self._playback is not None:
+            index = self._clock.timestamps(self._played - data.shape[1], data.shape[1])
+        elif self._clock is not None:
+            count = data.shape[1]
+            self._clock.observe(np.arange(self._sample_count, self._sample_count + count), timestamps)
+            index = self._clock.timestamps(self._sample_count, count)
+            self._sample_count += count
+        else:
+            index = pd.to_datetime(timestamps, unit="s", utc=True)
 
         # Build output DataFrame
         self.o.data = pd.DataFrame(
@@ -144,10 +568,225 @@ class BrainFlowSource(Node):
         )
         self.o.meta = {"rate": self._sample_rate}
 
+        if self._filtering:
+            self.o_filtered.data = pd.DataFrame(
+                self._filter(eeg_data).T,
+                index=index,
+                columns=self._column_names,
+            )
+            self.o_filtered.meta = {"rate": self._sample_rate}
+
+        if self._aux:
+            self._publish_aux(data, index)
+
     def terminate(self):
+        if self._reader is not None:
+            self._reader.stop()
+        if self._board is not None:
+            _release_board(self._board)
+
+
+def _align(grid, stamps, values, tolerance):
+    """Resample a stream onto a time grid by nearest sample.
+
+    Args:
+        grid (ndarray): Target times, int64 nanoseconds.
+        stamps (ndarray): Sample times, int64 nanoseconds, increasing.
+        values (ndarray): Samples, shape (channels, len(stamps)).
+        tolerance (int): Maximum distance to the nearest sample, in
+            nanoseconds. Grid points further away are filled with NaN.
+
+    Returns:
+        ndarray: Aligned samples, shape (channels, len(grid)).
+    """
+    out = np.full((values.shape[0], grid.size), np.nan)
+    if stamps.size == 0:
+        return out
+    right = np.clip(np.searchsorted(stamps, grid), 0, stamps.size - 1)
+    left = np.clip(right - 1, 0, stamps.size - 1)
+    nearest = np.where(grid - stamps[left] <= stamps[right] - grid, left, right)
+    valid = np.abs(stamps[nearest] - grid) <= tolerance
+    out[:, valid] = values[:, nearest[valid]]
+    return out
+
+
+class MultiBrainFlowSource(Node):
+    """Acquire EEG from several BrainFlow boards in a single node.
+
+    Each board gets its own BoardShim session, reader thread and clock
+    model. Since BrainFlow stamps every sample with host time, all clock
+    models share the same time base, which is used to align the streams.
+
+    Args:
+        boards (list[dict]): One entry per board, with a unique ``name`` and
+            any of ``device``, ``serial_port``, ``mac_address``,
+            ``ip_address``, ``ip_port`` and ``channels`` (see BrainFlowSource).
+        combine (bool): If True, resample all boards on a common time grid
+            and emit one frame whose columns are prefixed with the board
+            name (e.g. ``alice_Fp1``). All boards must then share the same
+            sampling rate. If False, emit each board on its own port.
+            Default: True.
+        poll_interval (float): Delay between two board reads of each reader
+            thread, in seconds. Default: 0.01.
+        buffer_duration (float): Capacity of each ring buffer, in seconds.
+            Default: 10.
+        max_delay (float): How long, in seconds, the combined output waits
+            for a late board before emitting its missing samples as NaN.
+            Default: 1.
+
+    Attributes:
+        o (Port): Combined EEG frame, when ``combine`` is True.
+        o_* (Port): One EEG frame per board, named after the board, when
+            ``combine`` is False.
+
+    Example:
+        .. code-block:: yaml
+
+           - id: eeg
+             module: nodes.eeg.brainflow_source
+             class: MultiBrainFlowSource
+             params:
+               boards:
+                 - {name: alice, device: muse2, mac_address: "00:55:DA:B0:00:01"}
+                 - {name: bob, device: muse2, mac_address: "00:55:DA:B0:00:02"}
+    """
+
+    def __init__(self, boards, combine=True, poll_interval=0.01,
+                 buffer_duration=10, max_delay=1):
+        names = [board.get("name") for board in boards]
+        if not boards or None in names or len(set(names)) != len(names):
+            raise ValueError("Each board needs a unique 'name'")
+        self._combine = combine
+        self._max_delay = int(max_delay * 1e9)
+        self._boards = []
         try:
-            if self._board.is_prepared():
-                self._board.stop_stream()
-                self._board.release_session()
+            for config in boards:
+                self._boards.append(self._open(config, poll_interval, buffer_duration))
         except Exception:
-            pass
+            self.terminate()
+            raise
+        rates = {board["rate"] for board in self._boards}
+        if combine and len(rates) > 1:
+            self.terminate()
+            raise ValueError(
+                f"Cannot combine boards with different sampling rates: {sorted(rates)}"
+            )
+        self._rate = rates.pop()
+        self._period = int(round(1e9 / self._rate))
+        self._columns = [
+            f"{board['name']}_{column}" for board in self._boards for column in board["columns"]
+        ]
+        self._origin = None  # first grid time, in nanoseconds
+        self._emitted = 0    # grid points emitted so far
+
+    @staticmethod
+    def _open(config, poll_interval, buffer_duration):
+        device = config.get("device", "synthetic")
+        board_id = _resolve_board_id(device)
+        eeg_channels = BoardShim.get_eeg_channels(board_id)
+        rate = BoardShim.get_sampling_rate(board_id)
+        board = _open_board(
+            board_id, config.get("serial_port", ""), config.get("mac_address", ""),
+            config.get("ip_address", ""), config.get("ip_port", 0),
+        )
+        state = {
+            "name": config["name"],
+            "board": board,
+            "reader": None,
+            "eeg_channels": eeg_channels,
+            "timestamp_channel": BoardShim.get_timestamp_channel(board_id),
+            "rate": rate,
+            "columns": _column_names(device, config.get("channels"), len(eeg_channels)),
+            "clock": ClockModel(rate),
+            "count": 0,
+            "overflows": 0,
+            "first": None,  # time of the first and last samples received
+            "last": None,
+            "stamps": np.empty(0, dtype=np.int64),
+            "values": np.empty((len(eeg_channels), 0)),
+            "capacity": max(1, int(buffer_duration * rate)),
+        }
+        rows = BoardShim.get_num_rows(board_id)
+        state["reader"] = _BoardReader(board, rows, state["capacity"], poll_interval)
+        state["reader"].start()
+        return state
+
+    def update(self):
+        for board in self._boards:
+            buffer = board["reader"].buffer
+            if buffer.overflows > board["overflows"]:
+                self.logger.warning(
+                    f"Acquisition buffer overflow on '{board['name']}': "
+                    f"{buffer.overflows - board['overflows']} samples dropped"
+                )
+                board["overflows"] = buffer.overflows
+            data = buffer.read()
+            count = data.shape[1]
+            if count == 0:
+                continue
+            start = board["count"]
+            board["clock"].observe(
+                np.arange(start, start + count), data[board["timestamp_channel"], :]
+            )
+            index = board["clock"].timestamps(start, count)
+            board["count"] += count
+            eeg = data[board["eeg_channels"], :]
+            if not self._combine:
+                port = getattr(self, f"o_{board['name']}")
+                port.data = pd.DataFrame(eeg.T, index=index, columns=board["columns"])
+                port.meta = {"rate": board["rate"]}
+                continue
+            # Keep at most one buffer worth of samples waiting for alignment.
+            # The grid is in nanoseconds, whatever the unit of the index.
+            nanos = index.as_unit("ns").asi8
+            stamps = np.concatenate([board["stamps"], nanos])[-board["capacity"]:]
+            values = np.concatenate([board["values"], eeg], axis=1)[:, -board["capacity"]:]
+            board["stamps"], board["values"] = stamps, values
+            if board["first"] is None:
+                board["first"] = nanos[0]
+            board["last"] = nanos[-1]
+        if self._combine:
+            self._update_combined()
+
+    def _update_combined(self):
+        seen = [board for board in self._boards if board["last"] is not None]
+        if not seen:
+            return
+        latest = max(board["last"] for board in seen)
+        complete = len(seen) == len(self._boards)
+
+        # Start the grid once every board delivered, or a late one timed out
+        if self._origin is None:
+            if not complete and latest - min(board["first"] for board in seen) < self._max_delay:
+                return
+            self._origin = max(board["first"] for board in seen)
+
+        # Emit up to the slowest board, unless it lags more than max_delay
+        horizon = min(board["last"] for board in seen) if complete else latest - self._max_delay
+        horizon = max(horizon, latest - self._max_delay)
+        count = (horizon - self._origin) // self._period + 1 - self._emitted
+        if count <= 0:
+            return
+        grid = self._origin + self._period * np.arange(self._emitted, self._emitted + count)
+        self._emitted += count
+
+        tolerance = self._period // 2
+        blocks = []
+        for board in self._boards:
+            blocks.append(_align(grid, board["stamps"], board["values"], tolerance))
+            # Drop samples that can no longer be the nearest to a future grid point
+            keep = np.searchsorted(board["stamps"], grid[-1] + tolerance, side="right")
+            board["stamps"] = board["stamps"][keep:]
+            board["values"] = board["values"][:, keep:]
+        self.o.data = pd.DataFrame(
+            np.concatenate(blocks).T,
+            index=pd.to_datetime(grid, utc=True),
+            columns=self._columns,
+        )
+        self.o.meta = {"rate": self._rate}
+
+    def terminate(self):
+        for board in self._boards:
+            if board["reader"] is not None:
+                board["reader"].stop()
+            _release_board(board["board"])
@@ -0,0 +1,149 @@
+"""Lab Streaming Layer (LSL) source node.
+
+Pulls chunks from an LSL inlet straight into a buffer that is allocated once,
+selects the requested channels by label, and stamps samples from a
+sample-counter clock model. One node therefore replaces the usual
+``Receive`` → ``LocQuery`` → ``Reindex`` chain, and it publishes frames that
+are already selected and evenly spaced.
+
+LSL timestamps are clock-synchronized by liblsl (``proc_clocksync``), then
+converted from the LSL clock to unix time so that they line up with the
+other sources of the graph.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from timeflux.core.node import Node
+from pylsl import StreamInlet, resolve_byprop, local_clock, proc_clocksync
+
+from nodes.common.clock import ClockModel
+
+# pylsl channel formats (cf_*) mapped to numpy dtypes; strings are unsupported
+_DTYPES = {
+    1: np.float32,
+    2: np.float64,
+    4: np.int32,
+    5: np.int16,
+    6: np.int8,
+    7: np.int64,
+}
+
+
+def _channel_labels(info):
+    """Read channel labels from the stream description, or number them."""
+    labels = []
+    channel = info.desc().child("channels").child("channel")
+    for _ in range(info.channel_count()):
+        labels.append(channel.child_value("label"))
+        channel = channel.next_sibling()
+    if not all(labels):
+        return [str(i) for i in range(info.channel_count())]
+    return labels
+
+
+class LSLSource(Node):
+    """Receive an LSL stream as evenly stamped, channel-selected frames.
+
+    The stream is resolved lazily, so the graph starts even if the outlet
+    appears later.
+
+    Args:
+        prop (str): Stream property to match. Default: "name".
+        value (str): Value of the property to match.
+        channels (list[str]): Channel labels to keep, in output order.
+            Default: None (all channels).
+        timeout (float): Resolve timeout in seconds per attempt. Default: 1.
+        buffer_duration (float): Size of the pull buffer in seconds of signal.
+            Larger backlogs are drained in several pulls. Default: 1.
+        clock (str): Timestamp source. "model" (default) stamps samples from
+            a clock model fitted on the LSL timestamps; "lsl" keeps the
+            clock-synchronized LSL timestamps as they are, which suits
+            irregular streams.
+
+    Attributes:
+        o (Port): Default output, provides DataFrame with the selected channels.
+    """
+
+    def __init__(self, prop="name", value=None, channels=None, timeout=1.0,
+                 buffer_duration=1.0, clock="model"):
+        if clock not in ("model", "lsl"):
+            raise ValueError(f"Unknown clock '{clock}'. Valid values: ['lsl', 'model']")
+        self._prop = prop
+        self._value = value
+        self._channels = channels
+        self._timeout = timeout
+        self._buffer_duration = buffer_duration
+        self._use_model = clock == "model"
+        self._inlet = None
+
+    def _open(self):
+        """Resolve the stream and allocate the pull buffer. Return success."""
+        streams = resolve_byprop(self._prop, self._value, timeout=self._timeout)
+        if not streams:
+            return False
+        self._inlet = StreamInlet(streams[0], processing_flags=proc_clocksync)
+        info = self._inlet.info()
+        dtype = _DTYPES.get(info.channel_format())
+        if dtype is None:
+            raise ValueError(f"Unsupported LSL channel format for stream '{self._value}'")
+        labels = _channel_labels(info)
+        if self._channels:
+            missing = [label for label in self._channels if label not in labels]
+            if missing:
+                raise ValueError(f"Unknown channels {missing}. Valid values: {labels}")
+            self._indices = [labels.index(label) for label in self._channels]
+            self._columns = list(self._channels)
+        else:
+            self._indices = list(range(len(labels)))
+            self._columns = labels
+        self._rate = info.nominal_srate()
+        size = max(1, int(self._buffer_duration * (self._rate or 100)))
+        self._buffer = np.zeros((size, info.channel_count()), dtype=dtype)
+        self._clock = ClockModel(self._rate) if self._use_model and self._rate > 0 else None
+        self._sample_count = 0
+        self.logger.info(f"Connected to LSL stream '{self._value}'")
+        return True
+
+    def _pull(self):
+        """Drain the inlet. Return selected samples (n, channels) and LSL stamps."""
+        chunks, stamps = [], []
+        size = self._buffer.shape[0]
+        while True:
+            _, timestamps = self._inlet.pull_chunk(
+                timeout=0.0, max_samples=size, dest_obj=self._buffer
+            )
+            n = len(timestamps)
+            if n:
+                # Fancy indexing copies, so the buffer can be refilled
+                chunks.append(self._buffer[:n, self._indices])
+                stamps.extend(timestamps)
+            if n < size:
+                break
+        if not chunks:
+            return None, None
+        data = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        return data, np.asarray(stamps)
+
+    def update(self):
+        if self._inlet is None and not self._open():
+            return
+        data, stamps = self._pull()
+        if data is None:
+            return
+        # LSL clock to unix time
+        stamps = stamps + (time.time() - local_clock())
+        n = len(stamps)
+        if self._clock is None:
+            index = pd.to_datetime(stamps, unit="s", utc=True)
+        else:
+            indices = np.arange(self._sample_count, self._sample_count + n)
+            self._clock.observe(indices, stamps)
+            index = self._clock.timestamps(self._sample_count, n)
+            self._sample_count += n
+        self.o.data = pd.DataFrame(data, index=index, columns=self._columns)
+        self.o.meta = {"rate": self._rate}
+
+    def terminate(self):
+        if self._inlet is not None:
+            self._inlet.close_stream()
@@ -0,0 +1,70 @@
+"""Lab Streaming Layer (LSL) outlets for external consumers.
+
+Stimulus software and recorders can then read filtered EEG and metrics
+directly over LSL, without joining the ZMQ broker.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from timeflux.core.node import Node
+from pylsl import StreamInfo, StreamOutlet, local_clock, cf_float32
+
+
+class Outlet(Node):
+    """Push every input port to its own LSL outlet.
+
+    Outlets are created on the first non-empty frame of each port. The
+    nominal rate comes from the ``rate`` meta (0, i.e. irregular, if absent)
+    and channel labels from the numeric columns of that first frame. Each
+    frame is then pushed in a single ``push_chunk`` call, from a contiguous
+    float32 array, with its timestamps converted to the LSL clock.
+
+    Args:
+        prefix (str): Prefix of the stream names, followed by the port
+            suffix (e.g. ``i_eeg_filtered`` → ``prometheus_eeg_filtered``).
+            Default: "prometheus_".
+        types (dict): LSL content type per port suffix (e.g.
+            ``{eeg_filtered: EEG}``). Default: "Misc" for all ports.
+
+    Attributes:
+        i_* (Port): Dynamic inputs, expect DataFrame with a DatetimeIndex.
+    """
+
+    def __init__(self, prefix="prometheus_", types=None):
+        super().__init__()
+        self._prefix = prefix
+        self._types = types or {}
+        self._outlets = {}  # suffix -> (outlet, columns)
+
+    def _open(self, suffix, port):
+        """Create the outlet of a port from its first frame."""
+        columns = list(port.data.select_dtypes("number").columns)
+        rate = (port.meta or {}).get("rate", 0) or 0
+        name = f"{self._prefix}{suffix}"
+        info = StreamInfo(name, self._types.get(suffix, "Misc"), len(columns),
+                          float(rate), cf_float32, name)
+        channels = info.desc().append_child("channels")
+        for column in columns:
+            channels.append_child("channel").append_child_value("label", str(column))
+        self.logger.info(f"Opened LSL outlet '{name}' ({len(columns)} channels @ {rate} Hz)")
+        return StreamOutlet(info), columns
+
+    def update(self):
+        offset = None
+        for _, suffix, port in self.iterate("i_*"):
+            if not port.ready():
+                continue
+            if suffix not in self._outlets:
+                self._outlets[suffix] = self._open(suffix, port)
+            outlet, columns = self._outlets[suffix]
+            if not columns:
+                continue
+            # Channels missing from a later frame are pushed as NaN
+            frame = port.data.reindex(columns=columns)
+            data = np.ascontiguousarray(frame.values, dtype=np.float32)
+            if offset is None:
+                # Unix time to LSL clock
+                offset = time.time() - local_clock()
+            timestamps = pd.DatetimeIndex(port.data.index).as_unit("ns").asi8 / 1e9 - offset
+            outlet.push_chunk(data, timestamps.tolist())
@@ -0,0 +1,164 @@
+"""Streaming ECG R-peak detection.
+
+Pan–Tompkins style detector: band-pass, derivative, squaring and moving-window
+integration are run as stateful filters carried across chunks, so every sample
+is processed exactly once. Candidate peaks of the integrated signal are
+classified against adaptive signal/noise thresholds with a refractory period,
+and each accepted QRS complex is located on the band-passed signal.
+
+The output is indexed by R-peak time, which is what the HRV nodes of
+``nodes.physio.ppg`` expect, so ECG can feed the same metric chain as PPG.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+from timeflux.core.node import Node
+
+
+class RPeakDetector(Node):
+    """Detect R peaks in a streaming ECG signal.
+
+    The first ``learning`` seconds are used to initialise the thresholds, and
+    no beat is emitted during that phase.
+
+    Args:
+        rate (float): Sampling rate in Hz. Default: None (read from the
+            ``rate`` meta of the input).
+        column (str): ECG column. Default: None (first column).
+        band (tuple): Band-pass edges in Hz. Default: (5, 15).
+        integration (float): Moving-window integration length in seconds.
+            Default: 0.15.
+        refractory (float): Minimum delay between two beats in seconds.
+            Default: 0.25.
+        learning (float): Threshold initialisation period in seconds.
+            Default: 2.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with an ECG column.
+        o (Port): Default output, provides DataFrame indexed by R-peak time
+            with the ``rr`` interval in milliseconds (NaN for the first beat).
+    """
+
+    def __init__(self, rate=None, column=None, band=(5, 15), integration=0.15,
+                 refractory=0.25, learning=2):
+        self._rate = rate
+        self._column = column
+        self._band = band
+        self._integration = integration
+        self._refractory = refractory
+        self._learning = learning
+        self._ready = False
+
+    def _setup(self, rate, first):
+        """Design the filters once the sampling rate is known."""
+        self._sos = signal.butter(2, self._band, btype="bandpass", fs=rate, output="sos")
+        self._sos_zi = signal.sosfilt_zi(self._sos) * first
+        # Five-point derivative
+        self._diff_b = np.array([1, 2, 0, -2, -1]) * rate / 8
+        self._diff_zi = np.zeros(4)
+        width = max(1, int(round(self._integration * rate)))
+        self._mwi_b = np.ones(width) / width
+        self._mwi_zi = np.zeros(width - 1)
+        # Lag of the band-pass impulse response peak, to locate R on the input timeline
+        impulse = np.zeros(int(rate))
+        impulse[0] = 1
+        self._delay = int(np.argmax(signal.sosfilt(self._sos, impulse)))
+        # Band-passed history kept to search the QRS behind each candidate
+        self._search = width + 2 + self._delay
+        self._band_history = np.zeros(0)
+        self._stamp_history = np.zeros(0, dtype=np.int64)
+        self._refractory_samples = int(self._refractory * rate)
+        self._learning_samples = int(self._learning * rate)
+        self._learning_max = 0.0
+        self._learning_sum = 0.0
+        self._carry = np.zeros(0)  # last two integrated samples
+        self._count = 0  # samples processed
+        self._spki = self._npki = self._threshold = None
+        self._last_r = None  # sample index of the last accepted candidate
+        self._last_time = None  # timestamp of the last R peak
+        self._ready = True
+
+    def _classify(self, candidates, values):
+        """Return the indices of candidates accepted as QRS complexes."""
+        beats = []
+        for index, value in zip(candidates, values):
+            if value > self._threshold and (
+                self._last_r is None or index - self._last_r > self._refractory_samples
+            ):
+                self._spki = 0.125 * value + 0.875 * self._spki
+                self._last_r = index
+                beats.append(index)
+            else:
+                self._npki = 0.125 * value + 0.875 * self._npki
+            self._threshold = self._npki + 0.25 * (self._spki - self._npki)
+        return beats
+
+    def update(self):
+        if not self.i.ready():
+            return
+        column = self._column if self._column is not None else self.i.data.columns[0]
+        ecg = self.i.data[column].values.astype(np.float64)
+        if ecg.size == 0:
+            return
+        if not self._ready:
+            rate = self._rate or (self.i.meta or {}).get("rate")
+            if not rate:
+                raise ValueError("RPeakDetector needs a 'rate', from params or meta")
+            self._setup(rate, ecg[0])
+        stamps = pd.DatetimeIndex(self.i.data.index).as_unit("ns").asi8
+
+        # Stateful Pan–Tompkins chain
+        band, self._sos_zi = signal.sosfilt(self._sos, ecg, zi=self._sos_zi)
+        diff, self._diff_zi = signal.lfilter(self._diff_b, 1, band, zi=self._diff_zi)
+        mwi, self._mwi_zi = signal.lfilter(self._mwi_b, 1, diff ** 2, zi=self._mwi_zi)
+
+        start = self._count
+        self._count += ecg.size
+        history_start = start - self._band_history.size
+        self._band_history = np.concatenate([self._band_history, band])
+        self._stamp_history = np.concatenate([self._stamp_history, stamps])
+
+        # Local maxima of the integrated signal, including across chunk edges
+        padded = np.concatenate([self._carry, mwi])
+        offset = start - self._carry.size
+        self._carry = padded[-2:]
+        peaks = np.flatnonzero((padded[1:-1] > padded[:-2]) & (padded[1:-1] >= padded[2:])) + 1
+        candidates = peaks + offset
+        values = padded[peaks]
+
+        if self._threshold is None:
+            learned = min(mwi.size, max(0, self._learning_samples - start))
+            self._learning_max = max(self._learning_max, mwi[:learned].max(initial=0.0))
+            self._learning_sum += mwi[:learned].sum()
+            if self._count >= self._learning_samples:
+                self._spki = 0.25 * self._learning_max
+                self._npki = 0.5 * self._learning_sum / max(1, self._learning_samples)
+                self._threshold = self._npki + 0.25 * (self._spki - self._npki)
+                keep = candidates >= self._learning_samples
+                candidates, values = candidates[keep], values[keep]
+            else:
+                candidates = candidates[:0]
+
+        times, rr = [], []
+        for index in self._classify(candidates, values) if candidates.size else []:
+            # R peak = band-pass maximum in the integration window, minus filter delay
+            lo = max(history_start, index - self._search)
+            window = self._band_history[lo - history_start:index - history_start + 1]
+            r = lo + int(np.argmax(window)) - self._delay
+            r = min(max(r, history_start), history_start + self._stamp_history.size - 1)
+            time = self._stamp_history[r - history_start]
+            if self._last_time is not None and time <= self._last_time:
+                continue
+            rr.append((time - self._last_time) / 1e6 if self._last_time is not None else np.nan)
+            times.append(time)
+            self._last_time = time
+
+        # Keep only what the next search windows can reach
+        keep = self._search + 2
+        self._band_history = self._band_history[-keep:]
+        self._stamp_history = self._stamp_history[-keep:]
+
+        if times:
+            index = pd.to_datetime(np.array(times, dtype=np.int64), utc=True)
+            self.o.data = pd.DataFrame({"rr": rr}, index=index)
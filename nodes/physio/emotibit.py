@@ -0,0 +1,140 @@
+"""Batched EmotiBit OSC receiver.
+
+The EmotiBit Oscilloscope forwards each data packet as an OSC message whose
+arguments are consecutive samples of one stream (PPG, EDA, temperature...).
+Instead of producing a frame per message, this node parses packets on a
+background socket thread into one ring buffer per stream, and emits a single
+consolidated chunk per stream at each graph tick. Samples are stamped from a
+sample-counter clock model, so chunks are contiguous and evenly spaced.
+"""
+
+import socket
+import threading
+import time
+import numpy as np
+import pandas as pd
+from timeflux.core.node import Node
+from pythonosc.osc_packet import OscPacket, ParseError
+
+from nodes.common.clock import ClockModel
+from nodes.common.ringbuffer import RingBuffer
+
+# Default streams of a single EmotiBit (device 0), with their sampling rates.
+# Heart rate is derived per beat and has no fixed rate.
+DEFAULT_STREAMS = {
+    "ppg": {"address": "/EmotiBit/0/PPG_RED", "rate": 25},
+    "hr": {"address": "/EmotiBit/0/HR"},
+    "eda": {"address": "/EmotiBit/0/EDA", "rate": 15},
+    "temperature": {"address": "/EmotiBit/0/TEMP", "rate": 7.5},
+}
+
+# Buffer size, in samples, of streams without a nominal rate
+_IRREGULAR_CAPACITY = 1024
+
+
+class EmotiBitReceiver(Node):
+    """Receive EmotiBit OSC streams as one chunk per stream and tick.
+
+    Several EmotiBits can share the same port: declare one stream per device
+    and address (e.g. ``/EmotiBit/1/PPG_RED``).
+
+    Args:
+        ip (str): Address to listen on. Default: "localhost".
+        port (int): UDP port to listen on. Default: 12345.
+        streams (dict): Stream name mapped to its OSC ``address`` and
+            optional sampling ``rate`` in Hz. Streams without a rate are
+            stamped with their arrival time. Default: PPG, HR, EDA and
+            temperature of EmotiBit 0.
+        buffer_duration (float): Ring buffer size per stream, in seconds of
+            signal. Default: 10.
+
+    Attributes:
+        o_* (Port): One output per stream (e.g. ``o_ppg``), provides
+            DataFrame with a single column ``"0"``, as the UIs and the
+            simulated PPG source expect.
+    """
+
+    def __init__(self, ip="localhost", port=12345, streams=None, buffer_duration=10):
+        self._streams = {}
+        self._addresses = {}
+        for name, config in (streams or DEFAULT_STREAMS).items():
+            rate = config.get("rate")
+            capacity = int(buffer_duration * rate) if rate else _IRREGULAR_CAPACITY
+            stream = {
+                "rate": rate,
+                "buffer": RingBuffer(2, max(1, capacity)),  # values, host times
+                "clock": ClockModel(rate) if rate else None,
+                "count": 0,
+                "overflows": 0,
+            }
+            self._streams[name] = stream
+            self._addresses[config["address"]] = stream
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((ip, port))
+        self._socket.settimeout(0.1)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                dgram = self._socket.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.receive(dgram, time.time())
+
+    def receive(self, dgram, arrival):
+        """Parse an OSC datagram and buffer the samples of known streams."""
+        try:
+            packet = OscPacket(dgram)
+        except ParseError:
+            return
+        for timed in packet.messages:
+            message = timed.message
+            stream = self._addresses.get(message.address)
+            if stream is None:
+                continue
+            values = [value for value in message.params if isinstance(value, (int, float))]
+            if not values:
+                continue
+            chunk = np.empty((2, len(values)))
+            chunk[0] = values
+            chunk[1] = arrival
+            if stream["rate"]:
+                # The last sample of the packet is the one that just arrived
+                chunk[1] -= np.arange(len(values) - 1, -1, -1) / stream["rate"]
+            stream["buffer"].write(chunk)
+
+    def update(self):
+        for name, stream in self._streams.items():
+            buffer = stream["buffer"]
+            if buffer.overflows > stream["overflows"]:
+                self.logger.warning(
+                    f"EmotiBit buffer overflow on '{name}': "
+                    f"{buffer.overflows - stream['overflows']} samples dropped"
+                )
+                stream["overflows"] = buffer.overflows
+            data = buffer.read()
+            n = data.shape[1]
+            if n == 0:
+                continue
+            if stream["clock"] is None:
+                index = pd.to_datetime(data[1], unit="s", utc=True)
+            else:
+                count = stream["count"]
+                stream["clock"].observe(np.arange(count, count + n), data[1])
+                index = stream["clock"].timestamps(count, n)
+                stream["count"] += n
+            port = getattr(self, f"o_{name}")
+            port.data = pd.DataFrame(data[0], index=index, columns=["0"])
+            if stream["rate"]:
+                port.meta = {"rate": stream["rate"]}
+
+    def terminate(self):
+        self._stop.set()
+        self._socket.close()
+        self._thread.join(timeout=1)
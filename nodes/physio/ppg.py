@@ -1,14 +1,21 @@
+import time
+from collections import deque
 import neurokit2 as nk
 import pandas as pd
 from timeflux.core.node import Node
 from scipy import signal
+from scipy.integrate import trapezoid
 import numpy as np
+from nodes.common.clock import ClockModel
+from nodes.common.wavetable import WaveTable
 
 class PPGSimulator(Node):
     """Generates a realistic streaming PPG waveform with physiological peaks.
 
     Produces a continuous 25 Hz signal with heart-rate variability,
     suitable for downstream peak detection and HRV metric calculation.
+    Phases are built per beat segment rather than per sample, so that many
+    channels or high sampling rates stay cheap.
 
     Args:
         heart_rate (float): Mean heart rate in BPM. Default: 70.
@@ -17,18 +24,61 @@ class PPGSimulator(Node):
         sampling_rate (int): Output sampling rate in Hz. Default: 25.
         chunk_duration (float): Duration of each output chunk in seconds.
             Should match the graph rate (e.g. 0.1s for rate=10). Default: 0.2.
+        channels (int): Number of independent PPG channels, output as columns
+            ``"0"``, ``"1"``... Default: 1.
+        wavetable (str): If set, path of a ``.npy`` signal bank to loop over
+            instead of generating signal at every tick. The bank is generated
+            once if the file does not exist, and ends on a beat onset so that
+            the loop is seamless. Default: None.
+        wavetable_duration (float): Length of a generated bank in seconds.
+            Default: 300.
+        modulation (float): Standard deviation of the random gain applied at
+            each loop around the wavetable. Default: 0.
     """
 
-    def __init__(self, heart_rate=70, hrv_std=0.04, sampling_rate=25, chunk_duration=0.2):
+    def __init__(self, heart_rate=70, hrv_std=0.04, sampling_rate=25, chunk_duration=0.2,
+                 channels=1, wavetable=None, wavetable_duration=300, modulation=0.0):
         super().__init__()
         self._sr = sampling_rate
         self._mean_rr = 60.0 / heart_rate  # seconds between beats
         self._hrv_std = hrv_std
         self._chunk_samples = max(1, int(sampling_rate * chunk_duration))
-        self._phase = 0.0  # continuous phase accumulator
+        self._columns = [str(c) for c in range(channels)]
+        self._phase = np.zeros(channels)  # continuous phase accumulators
         self._rng = np.random.default_rng(seed=42)
-        # Current RR interval (with slight drift)
-        self._current_rr = self._mean_rr
+        # Current RR intervals (with slight drift)
+        self._current_rr = np.full(channels, self._mean_rr)
+        # Sample-counter clock for contiguous, evenly spaced timestamps
+        self._clock = ClockModel(sampling_rate)
+        self._sample_counter = 0
+        self._wavetable = None
+        if wavetable:
+            # Only the first channel can be cut at a beat onset: crossfade the others
+            crossfade = int(self._mean_rr * sampling_rate) if channels > 1 else 0
+            params = {"heart_rate": heart_rate, "hrv_std": hrv_std,
+                      "sampling_rate": sampling_rate, "channels": channels, "seed": 42}
+            self._wavetable = WaveTable(wavetable, self._generate_bank,
+                                        int(wavetable_duration * sampling_rate),
+                                        crossfade=crossfade, modulation=modulation, seed=42,
+                                        params=params)
+
+    @property
+    def heart_rate(self):
+        """Mean heart rate in BPM. A new value applies from the next beat."""
+        return 60.0 / self._mean_rr
+
+    @heart_rate.setter
+    def heart_rate(self, value):
+        self._mean_rr = 60.0 / value
+
+    @property
+    def hrv_std(self):
+        """Standard deviation of RR interval variation in seconds."""
+        return self._hrv_std
+
+    @hrv_std.setter
+    def hrv_std(self, value):
+        self._hrv_std = value
 
     def _ppg_waveform(self, phase):
         """Compute PPG amplitude from cardiac phase [0, 1).
@@ -45,109 +95,314 @@ class PPGSimulator(Node):
         diastolic = 0.15 * np.exp(-((phase - 0.55) ** 2) / (2 * 0.02))
         return systolic + dicrotic + diastolic
 
-    def update(self):
-        samples = np.empty(self._chunk_samples)
-        now = pd.Timestamp.now("UTC")
+    def _phases(self, channel, n):
+        """Advance the cardiac phase of one channel by ``n`` samples.
+
+        The RR interval is constant within a beat, so the phase is linear
+        between two onsets: each beat segment is filled at once.
+        """
+        phases = np.empty(n)
         dt = 1.0 / self._sr
+        phase = self._phase[channel]
+        i = 0
+        while i < n:
+            step = dt / self._current_rr[channel]
+            ramp = phase + step * np.arange(1, n - i + 1)
+            # Index of the sample completing the beat, if within the chunk
+            onset = int(np.searchsorted(ramp, 1.0))
+            if onset == ramp.size:
+                phases[i:] = ramp
+                break
+            phases[i:i + onset] = ramp[:onset]
+            phase = phases[i + onset] = ramp[onset] - 1.0
+            i += onset + 1
+            # New beat: vary RR interval (mean-reverting random walk)
+            drift = self._rng.normal(0, self._hrv_std)
+            self._current_rr[channel] = np.clip(
+                self._mean_rr + drift,
+                self._mean_rr * 0.7,  # floor: ~100 BPM
+                self._mean_rr * 1.4,  # ceiling: ~50 BPM
+            )
+        self._phase[channel] = phases[-1]
+        return phases
+
+    def _generate(self, n):
+        """Return the next ``n`` samples and their cardiac phases, as (n, channels) arrays."""
+        phases = np.column_stack([self._phases(c, n) for c in range(len(self._columns))])
+        samples = self._ppg_waveform(phases)
+        # Add small sensor noise
+        samples += self._rng.normal(0, 0.01, size=samples.shape)
+        return samples, phases
 
-        for i in range(self._chunk_samples):
-            # Advance phase
-            self._phase += dt / self._current_rr
-            if self._phase >= 1.0:
-                self._phase -= 1.0
-                # New beat: vary RR interval (mean-reverting random walk)
-                drift = self._rng.normal(0, self._hrv_std)
-                self._current_rr = np.clip(
-                    self._mean_rr + drift,
-                    self._mean_rr * 0.7,  # floor: ~100 BPM
-                    self._mean_rr * 1.4,  # ceiling: ~50 BPM
-                )
-            samples[i] = self._ppg_waveform(self._phase)
+    def generate(self, n):
+        """Return the next ``n`` samples as an (n, channels) array, without stamping them."""
+        samples, _ = self._generate(n)
+        return samples
 
-        # Add small sensor noise
-        samples += self._rng.normal(0, 0.01, size=self._chunk_samples)
+    def _generate_bank(self, length):
+        """Generate at least ``length`` samples, cut at a beat onset for a seamless loop."""
+        samples, phases = self._generate(length + int(2 * self._mean_rr * self._sr * 1.4) + 1)
+        onsets = np.flatnonzero(np.diff(phases[:, 0]) < 0) + 1
+        return samples[:onsets[onsets >= length][0]]
 
-        index = pd.date_range(
-            start=now,
-            periods=self._chunk_samples,
-            freq=pd.tseries.offsets.Milli(int(1000 / self._sr)),
-        )
-        self.o.data = pd.DataFrame({"0": samples}, index=index)
+    def update(self):
+        n = self._chunk_samples
+        if self._wavetable is not None:
+            samples = self._wavetable.read(n)
+        else:
+            samples, _ = self._generate(n)
+
+        self._clock.observe(self._sample_counter + n - 1, time.time())
+        index = self._clock.timestamps(self._sample_counter, n)
+        self._sample_counter += n
+        self.o.data = pd.DataFrame(samples, index=index, columns=self._columns)
         self.o.meta = {"rate": self._sr}
 
-class EDASimulator(Node):
-    def __init__(self):
-        super().__init__()
 
-    def update(self):
+class _SegmentSimulator(Node):
+    """Stream a simulated signal chunk by chunk, synthesizing it by segments.
 
-        # Simulate an EDA signal: https://neuropsychology.github.io/NeuroKit/examples/signal_simulation/signal_simulation.html
-        eda_signal = nk.eda_simulate(duration=20, scr_number=1, drift=-0.01, noise=0.01)
-    
-        # Convert it to a DataFrame
-        df = pd.DataFrame(eda_signal, columns=['eda_signal'])
-        
-        # Create a datetime index with Timeflux's UTC
-        now = pd.Timestamp.now("UTC")
-        df.index = pd.date_range(start=now, periods=len(eda_signal), freq='0.1ms')  
+    A segment of ``segment_duration`` seconds is synthesized when the buffered
+    signal runs out. It is crossfaded into the end of the previous one.
+    Each tick then emits exactly one chunk, stamped from a sample-counter
+    clock model at the declared rate.
 
-        # Output the EDA Signal
-        self.o.data = df
+    Args:
+        column (str): Output column name.
+        sampling_rate (int): Sampling rate in Hz.
+        chunk_duration (float): Duration of each output chunk in seconds.
+            Should match the graph rate.
+        segment_duration (float): Duration of each synthesized segment in seconds.
+        crossfade (float): Overlap between consecutive segments in seconds.
+        seed (int): Seed of the first segment, incremented for each new one.
+    """
 
-class ECGSimulator(Node):
-    def __init__(self):
+    def __init__(self, column, sampling_rate, chunk_duration, segment_duration, crossfade, seed):
         super().__init__()
+        self._column = column
+        self._sr = sampling_rate
+        self._chunk_samples = max(1, int(sampling_rate * chunk_duration))
+        self._segment_samples = max(self._chunk_samples, int(segment_duration * sampling_rate))
+        self._crossfade = min(int(crossfade * sampling_rate), self._segment_samples - 1)
+        self._seed = seed
+        self._buffer = np.zeros(0)
+        self._clock = ClockModel(sampling_rate)
+        self._sample_counter = 0
+
+    def _synthesize(self, length, seed):
+        """Return ``length`` new samples. Implemented by subclasses."""
+        raise NotImplementedError
+
+    def _extend(self):
+        """Append a new segment, blending its head into the buffered tail."""
+        segment = np.asarray(self._synthesize(self._segment_samples + self._crossfade, self._seed),
+                             dtype=np.float64)
+        self._seed += 1
+        if not self._buffer.size:
+            self._buffer = segment
+            return
+        xf = self._crossfade
+        weight = np.arange(1, xf + 1) / (xf + 1)
+        tail = self._buffer[-xf:] * (1 - weight) + segment[:xf] * weight if xf else segment[:0]
+        self._buffer = np.concatenate([self._buffer[:self._buffer.size - xf], tail, segment[xf:]])
 
     def update(self):
-        
-        # Simulate an ECG Signal: https://neuropsychology.github.io/NeuroKit/examples/signal_simulation/signal_simulation.html
-        ecg_signal = nk.ecg_simulate(duration=20, noise=0.01, heart_rate=70) 
-    
-        # Convert it to a DataFrame
-        df = pd.DataFrame(ecg_signal, columns=['ecg_signal'])
-        
-        # Create a datetime index with Timeflux's UTC
-        now = pd.Timestamp.now("UTC")
-        df.index = pd.date_range(start=now, periods=len(ecg_signal), freq='1ms')  
+        n = self._chunk_samples
+        # Keep the crossfade region until the next segment is blended in
+        while self._buffer.size - self._crossfade < n:
+            self._extend()
+        samples, self._buffer = self._buffer[:n], self._buffer[n:]
+
+        self._clock.observe(self._sample_counter + n - 1, time.time())
+        index = self._clock.timestamps(self._sample_counter, n)
+        self._sample_counter += n
+        self.o.data = pd.DataFrame({self._column: samples}, index=index)
+        self.o.meta = {"rate": self._sr}
+
+
+class EDASimulator(_SegmentSimulator):
+    """Generates a streaming EDA signal with skin conductance responses.
+
+    The signal is synthesized with NeuroKit by segments, and emitted one
+    chunk per tick: see ``nk.eda_simulate`` for the signal model.
+
+    Args:
+        sampling_rate (int): Output sampling rate in Hz. Default: 15.
+        chunk_duration (float): Duration of each output chunk in seconds. Default: 0.2.
+        segment_duration (float): Duration of each synthesized segment in seconds.
+            Default: 60.
+        scr_number (int): Number of skin conductance responses per segment. Default: 3.
+        drift (float): Slope of the tonic drift within a segment. Default: -0.01.
+        noise (float): Noise level. Default: 0.01.
+        seed (int): Random seed. Default: 42.
+
+    Attributes:
+        o (Port): Default output, provides DataFrame with an ``eda_signal`` column.
+    """
+
+    def __init__(self, sampling_rate=15, chunk_duration=0.2, segment_duration=60,
+                 scr_number=3, drift=-0.01, noise=0.01, seed=42):
+        super().__init__("eda_signal", sampling_rate, chunk_duration, segment_duration,
+                         crossfade=1.0, seed=seed)
+        self._scr_number = scr_number
+        self._drift = drift
+        self._noise = noise
 
-        # Output the ECG Signal
-        self.o.data = df
+    def _synthesize(self, length, seed):
+        # https://neuropsychology.github.io/NeuroKit/examples/signal_simulation/signal_simulation.html
+        return nk.eda_simulate(length=length, sampling_rate=self._sr, scr_number=self._scr_number,
+                               drift=self._drift, noise=self._noise, random_state=seed)
+
+
+class ECGSimulator(_SegmentSimulator):
+    """Generates a streaming ECG signal.
+
+    The signal is synthesized with NeuroKit by segments, and emitted one
+    chunk per tick: see ``nk.ecg_simulate`` for the signal model. Segments
+    are joined with a short crossfade, which can distort one beat per segment.
+
+    Args:
+        sampling_rate (int): Output sampling rate in Hz. Default: 100.
+        chunk_duration (float): Duration of each output chunk in seconds. Default: 0.2.
+        segment_duration (float): Duration of each synthesized segment in seconds.
+            Default: 60.
+        heart_rate (float): Mean heart rate in BPM. Default: 70.
+        heart_rate_std (float): Standard deviation of the heart rate in BPM. Default: 1.
+        noise (float): Noise level. Default: 0.01.
+        column (str): Output column name, e.g. ``A1_ECG`` to stand in for a
+            BITalino. Default: "ecg_signal".
+        seed (int): Random seed. Default: 42.
+
+    Attributes:
+        o (Port): Default output, provides DataFrame with the ECG column.
+    """
+
+    def __init__(self, sampling_rate=100, chunk_duration=0.2, segment_duration=60,
+                 heart_rate=70, heart_rate_std=1, noise=0.01, column="ecg_signal", seed=42):
+        super().__init__(column, sampling_rate, chunk_duration, segment_duration,
+                         crossfade=0.05, seed=seed)
+        self._heart_rate = heart_rate
+        self._heart_rate_std = heart_rate_std
+        self._noise = noise
+
+    def _synthesize(self, length, seed):
+        # https://neuropsychology.github.io/NeuroKit/examples/signal_simulation/signal_simulation.html
+        return nk.ecg_simulate(length=length, sampling_rate=self._sr, noise=self._noise,
+                               heart_rate=self._heart_rate, heart_rate_std=self._heart_rate_std,
+                               random_state=seed)
 
 class RespiratorySignalExtractor(Node):
-    def __init__(self):
+    """Extract a respiratory signal from PPG beat intervals, as a stream.
+
+    Respiration modulates the inter-beat interval (respiratory sinus
+    arrhythmia). The PPG is cleaned with the NeuroKit default band-pass
+    (0.5–8 Hz), systolic peaks are detected incrementally, the inter-beat
+    interval is interpolated between peaks, and a 0.1–0.5 Hz band-pass
+    isolates respiration. Filters carry their state across chunks, and a
+    peak is only confirmed once ``min_interval`` of signal has followed it,
+    so each sample is processed once and the output only holds new samples,
+    up to the last confirmed peak.
+
+    Args:
+        rate (float): Sampling rate in Hz. Default: None (read from the
+            ``rate`` meta of the input).
+        column (str): PPG column. Default: None (first column).
+        min_interval (float): Minimum delay between two beats, in seconds.
+            Default: 0.33.
+        max_interval (float): Maximum delay between two beats, in seconds.
+            The interval chain restarts after longer gaps. Default: 2.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with a PPG column.
+        o (Port): Default output, provides DataFrame with a ``rsp_signal`` column.
+    """
+
+    def __init__(self, rate=None, column=None, min_interval=0.33, max_interval=2):
         super().__init__()
+        self._rate = rate
+        self._column = column
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._ready = False
+
+    def _setup(self, rate, first):
+        """Design the filters once the sampling rate is known."""
+        self._fs = rate
+        self._clean_sos = signal.butter(3, [0.5, min(8, 0.45 * rate)], btype="bandpass",
+                                        fs=rate, output="sos")
+        self._clean_zi = signal.sosfilt_zi(self._clean_sos) * first
+        self._rsp_sos = signal.butter(3, [0.1, 0.5], btype="bandpass", fs=rate, output="sos")
+        self._rsp_zi = None  # initialised on the first interval
+        self._distance = max(1, int(self._min_interval * rate))
+        self._max_gap = int(self._max_interval * rate)
+        self._values = np.zeros(0)  # cleaned PPG, from sample self._offset
+        self._stamps = np.zeros(0, dtype=np.int64)
+        self._offset = 0
+        self._count = 0
+        self._last_peak = None  # absolute sample index
+        self._last_ibi = None  # seconds
+        self._ready = True
+
+    def _peaks(self):
+        """Return the absolute indices of new, confirmed peaks."""
+        peaks, _ = signal.find_peaks(self._values, distance=self._distance,
+                                     prominence=0.25 * np.std(self._values))
+        peaks = peaks + self._offset
+        # Confirmed: enough signal after them for no higher peak to follow
+        peaks = peaks[peaks <= self._count - 1 - self._distance]
+        if self._last_peak is not None:
+            peaks = peaks[peaks >= self._last_peak + self._distance]
+        return peaks
 
     def update(self):
-        if self.i.ready():
-            ppg_signal = self.i.data['ppg_signal'].values
-
-            # Clean the PPG signal
-            ppg_cleaned = nk.ppg_clean(ppg_signal, sampling_rate=100)
-            
-            # Find PPG peaks
-            peaks, _ = nk.ppg_peaks(ppg_cleaned, sampling_rate=100)
-            
-            # Extract peak locations
-            peak_locations = np.where(peaks['PPG_Peaks'] == 1)[0]
-            
-            if len(peak_locations) > 1:
-                # Calculate inter-beat intervals (IBIs)
-                ibis = np.diff(peak_locations) / 100  # Convert to seconds
-                
-                # Interpolate IBIs to create a continuous signal
-                ibi_signal = np.interp(np.arange(len(ppg_cleaned)), peak_locations[1:], ibis)
-                
-                # Apply a bandpass filter to isolate respiratory frequencies
-                sos = signal.butter(3, [0.1, 0.5], btype='bandpass', fs=100, output='sos')
-                rsp_signal = signal.sosfilt(sos, ibi_signal)
-                
-                # Output the respiratory signal
-                self.o.data = pd.DataFrame({'rsp_signal': rsp_signal}, index=self.i.data.index)
-            else:
-                self.logger.warning("Not enough peaks detected to extract respiratory signal")
-                self.o.data = None
-        else:
-            self.o.data = None
+        if not self.i.ready():
+            return
+        column = self._column if self._column is not None else self.i.data.columns[0]
+        ppg = self.i.data[column].values.astype(np.float64)
+        if ppg.size == 0:
+            return
+        if not self._ready:
+            rate = self._rate or (self.i.meta or {}).get("rate")
+            if not rate:
+                raise ValueError("RespiratorySignalExtractor needs a 'rate', from params or meta")
+            self._setup(rate, ppg[0])
+
+        cleaned, self._clean_zi = signal.sosfilt(self._clean_sos, ppg, zi=self._clean_zi)
+        self._values = np.concatenate([self._values, cleaned])
+        stamps = pd.DatetimeIndex(self.i.data.index).as_unit("ns").asi8
+        self._stamps = np.concatenate([self._stamps, stamps])
+        self._count += ppg.size
+
+        segments, stamps = [], []
+        for peak in self._peaks():
+            previous, self._last_peak = self._last_peak, peak
+            if previous is None or peak - previous > self._max_gap:
+                self._last_ibi = None  # (re)start the interval chain
+                continue
+            ibi = (self._stamps[peak - self._offset] - self._stamps[previous - self._offset]) / 1e9
+            start = self._last_ibi if self._last_ibi is not None else ibi
+            # Interval interpolated over the samples after the previous peak, up to this one
+            segments.append(np.linspace(start, ibi, peak - previous + 1)[1:])
+            stamps.append(self._stamps[previous + 1 - self._offset:peak + 1 - self._offset])
+            self._last_ibi = ibi
+
+        # Keep the samples since the last peak, and at most one gap of look-back
+        keep = self._count - self._max_gap - self._distance
+        if self._last_peak is not None:
+            keep = max(min(self._last_peak, self._count - self._distance), keep)
+        keep = max(keep, self._offset)
+        self._values = self._values[keep - self._offset:]
+        self._stamps = self._stamps[keep - self._offset:]
+        self._offset = keep
+
+        if segments:
+            ibi = np.concatenate(segments)
+            if self._rsp_zi is None:
+                self._rsp_zi = signal.sosfilt_zi(self._rsp_sos) * ibi[0]
+            rsp, self._rsp_zi = signal.sosfilt(self._rsp_sos, ibi, zi=self._rsp_zi)
+            index = pd.to_datetime(np.concatenate(stamps), utc=True)
+            self.o.data = pd.DataFrame({"rsp_signal": rsp}, index=index)
+            self.o.meta = {"rate": self._fs}
 
 class RespiratoryMetricsCalculator(Node):
     def __init__(self):
@@ -208,7 +463,8 @@ class RespiratoryRateCalculator(Node):
     def update(self):
         if self.i.ready():
             rsp_signal = self.i.data['rsp_signal'].values
-            respiratory_rate = self.calculate_respiratory_rate(rsp_signal, sampling_rate=100)
+            rate = (self.i.meta or {}).get("rate", 100)
+            respiratory_rate = self.calculate_respiratory_rate(rsp_signal, sampling_rate=rate)
             
             if respiratory_rate is not None:
                 self.o.data = pd.DataFrame({'respiratory_rate': [respiratory_rate]}, index=[self.i.data.index[-1]])
@@ -382,40 +638,717 @@ class AttentionCalculator(Node):
         else:
             self.o.data = None
 
+# Respiratory rate range (breaths per minute) mapped to a 0-100 score, per score
+DEFAULT_RESPIRATORY_SCORES = {
+    "stress_score": (10, 40),
+    "CognitiveLoad_score": (18, 30),
+    "awakeness_score": (6, 15),
+    "attention_score": (10, 20),
+}
+
+
+class RespiratoryScores(Node):
+    """Compute every respiratory-rate score in a single frame.
+
+    Replaces one calculator node per score: each score is the respiratory
+    rate clipped to its range and scaled to 0-100, computed for all scores
+    and input rows at once.
+
+    Args:
+        scores (dict): Score name mapped to the ``[min_rate, max_rate]``
+            respiratory rates (breaths per minute) giving scores 0 and 100.
+            Default: stress, cognitive load, awakeness and attention, with
+            the ranges of the single-score calculators.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with a ``respiratory_rate`` column.
+        o (Port): Default output, provides DataFrame with one column per score.
+    """
+
+    def __init__(self, scores=None):
+        super().__init__()
+        scores = scores or DEFAULT_RESPIRATORY_SCORES
+        self._names = list(scores)
+        bounds = np.array([scores[name] for name in self._names], dtype=np.float64)
+        if bounds.shape != (len(self._names), 2) or np.any(bounds[:, 1] <= bounds[:, 0]):
+            raise ValueError("Respiratory scores must map names to [min_rate, max_rate], with min_rate < max_rate")
+        self._min = bounds[:, 0]
+        self._range = bounds[:, 1] - bounds[:, 0]
+
+    def update(self):
+        if not self.i.ready():
+            return
+        if "respiratory_rate" not in self.i.data.columns:
+            self.logger.error("'respiratory_rate' column not found in input data")
+            return
+        rates = self.i.data["respiratory_rate"].values.astype(np.float64)[:, None]
+        scores = np.round(np.clip((rates - self._min) / self._range, 0, 1) * 100, 2)
+        self.o.data = pd.DataFrame(scores, index=self.i.data.index, columns=self._names)
+
+
+def _ppg_columns(column, data):
+    """Return the PPG columns to process, and whether they are several devices."""
+    if isinstance(column, (list, tuple)):
+        return list(column), True
+    return [column if column is not None else data.columns[0]], False
+
+
+class PPGPeakDetector(Node):
+    """Detect systolic peaks in a streaming PPG signal and emit RR intervals.
+
+    The signal goes through a stateful band-pass, then local maxima are
+    searched over each chunk, the last two samples being carried over to the
+    next one. A maximum is a beat if it exceeds a fraction of the running
+    peak amplitude and falls outside the refractory period, which rejects the
+    dicrotic notch. The running amplitude halves whenever no beat is found
+    for ``timeout`` seconds, so that the detector recovers from a drop in
+    perfusion. Each beat time is refined by parabolic interpolation over the
+    three samples around the maximum, so that RR intervals are not quantized
+    to the sampling period.
+
+    Several PPG columns (one per device) can be processed at once: the
+    filter and the maxima search run on the 2-D array, and thresholds are
+    kept per column. Beats are then emitted in one stream, with a ``device``
+    column holding the PPG column name.
+
+    The first ``learning`` seconds are used to initialise the amplitude, and
+    no beat is emitted during that phase.
+
+    Args:
+        rate (float): Sampling rate in Hz. Default: None (read from the
+            ``rate`` meta of the input).
+        column (str|list): PPG column, or list of columns for several
+            devices. Default: None (first column).
+        band (tuple): Band-pass edges in Hz, or None to use the input as is.
+            Default: (0.5, 8).
+        threshold (float): Fraction of the running peak amplitude a maximum
+            must exceed. Default: 0.5.
+        refractory (float): Minimum delay between two beats in seconds.
+            Default: 0.33.
+        timeout (float): Delay without beat after which the threshold is
+            lowered, in seconds. Default: 2.
+        learning (float): Threshold initialisation period in seconds.
+            Default: 2.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with the PPG columns.
+        o (Port): Default output, provides DataFrame indexed by refined peak
+            time with the ``rr`` interval in milliseconds (NaN for the first
+            beat), and the ``device`` column when several columns are given.
+    """
+
+    def __init__(self, rate=None, column=None, band=(0.5, 8), threshold=0.5, refractory=0.33,
+                 timeout=2, learning=2):
+        self._rate = rate
+        self._column = column
+        self._band = band
+        self._threshold = threshold
+        self._refractory = refractory
+        self._timeout = timeout
+        self._learning = learning
+        self._ready = False
+
+    def _setup(self, rate, first):
+        """Design the filter once the sampling rate and the columns are known."""
+        self._sos = None
+        if self._band:
+            high = min(self._band[1], 0.45 * rate)
+            self._sos = signal.butter(2, [self._band[0], high], btype="bandpass", fs=rate,
+                                      output="sos")
+            self._sos_zi = signal.sosfilt_zi(self._sos)[:, :, None] * first
+        self._refractory_ns = int(self._refractory * 1e9)
+        self._timeout_ns = int(self._timeout * 1e9)
+        self._learning_samples = int(self._learning * rate)
+        self._learning_max = np.zeros(first.size)
+        self._carry = np.zeros((0, first.size))  # last two filtered samples
+        self._carry_stamps = np.zeros(0, dtype=np.int64)
+        self._count = 0  # samples processed
+        self._amplitude = None  # running peak amplitude, per column
+        self._deadline = [None] * first.size  # time after which the threshold is lowered, in ns
+        self._last_time = [None] * first.size  # time of the last beat, in ns
+        self._ready = True
+
+    def _refine(self, values, times, k):
+        """Return the time of the parabola vertex through the samples around ``k``."""
+        before, peak, after = values[k - 1], values[k], values[k + 1]
+        curvature = before - 2 * peak + after
+        if curvature >= 0:
+            return times[k]
+        offset = 0.5 * (before - after) / curvature
+        return times[k] + int(round(offset * (times[k + 1] - times[k - 1]) / 2))
+
+    def update(self):
+        if not self.i.ready():
+            return
+        columns, several = _ppg_columns(self._column, self.i.data)
+        ppg = self.i.data[columns].values.astype(np.float64)
+        if ppg.shape[0] == 0:
+            return
+        if not self._ready:
+            rate = self._rate or (self.i.meta or {}).get("rate")
+            if not rate:
+                raise ValueError("PPGPeakDetector needs a 'rate', from params or meta")
+            self._setup(rate, ppg[0])
+        stamps = pd.DatetimeIndex(self.i.data.index).as_unit("ns").asi8
+        if self._sos is not None:
+            ppg, self._sos_zi = signal.sosfilt(self._sos, ppg, axis=0, zi=self._sos_zi)
+
+        start = self._count
+        self._count += ppg.shape[0]
+
+        # Local maxima of every column, including across chunk edges
+        values = np.concatenate([self._carry, ppg])
+        times = np.concatenate([self._carry_stamps, stamps])
+        offset = start - self._carry.shape[0]
+        self._carry, self._carry_stamps = values[-2:], times[-2:]
+        maxima = (values[1:-1] > values[:-2]) & (values[1:-1] >= values[2:])
+        peaks, channels = np.nonzero(maxima)
+        peaks += 1
+
+        if self._amplitude is None:
+            learned = min(ppg.shape[0], max(0, self._learning_samples - start))
+            self._learning_max = np.maximum(self._learning_max,
+                                            ppg[:learned].max(axis=0, initial=0.0))
+            if self._count < self._learning_samples:
+                return
+            self._amplitude = self._learning_max.copy()
+            keep = peaks + offset >= self._learning_samples
+            peaks, channels = peaks[keep], channels[keep]
+
+        beats = []  # (time, rr, channel)
+        for k, c in zip(peaks, channels):
+            time = times[k]
+            height = values[k, c]
+            if self._deadline[c] is None:
+                self._deadline[c] = time + self._timeout_ns
+            while time > self._deadline[c]:
+                self._amplitude[c] *= 0.5  # no beat for too long: lower the threshold
+                self._deadline[c] += self._timeout_ns
+            if height < self._threshold * self._amplitude[c]:
+                continue
+            last = self._last_time[c]
+            if last is not None and time - last < self._refractory_ns:
+                continue
+            self._amplitude[c] = 0.125 * height + 0.875 * self._amplitude[c]
+            refined = self._refine(values[:, c], times, k)
+            beats.append((refined, (refined - last) / 1e6 if last is not None else np.nan, c))
+            self._last_time[c] = refined
+            self._deadline[c] = time + self._timeout_ns
+
+        if beats:
+            beats.sort(key=lambda beat: beat[0])
+            beat_times, rr, channel = zip(*beats)
+            index = pd.to_datetime(np.array(beat_times, dtype=np.int64), utc=True)
+            self.o.data = pd.DataFrame({"rr": rr}, index=index)
+            if several:
+                self.o.data["device"] = [columns[c] for c in channel]
+
+
+class BeatQuality(Node):
+    """Score each detected beat and flag artefacts before HRV computation.
+
+    For each beat, a segment of the PPG around the peak is compared with a
+    running template of clean pulses (Pearson correlation), and its amplitude
+    and half-height width are compared with those of the recent clean
+    pulses. A beat is valid if all checks pass and its RR interval is
+    physiological. Each beat costs O(segment length). The template is built
+    from the median of the first ``learning`` beats, then adapted with valid
+    beats only.
+
+    Beats are emitted once the signal after them has been received, in
+    time order for each device. The ``rr`` of a beat following an invalid one is set to NaN, since
+    it is not a normal-to-normal interval: the HRV nodes skip it, and skip
+    invalid beats when a ``valid`` column is present.
+
+    With several PPG columns, beats are matched to their column through the
+    ``device`` column set by ``PPGPeakDetector``, and each device has its own
+    template.
+
+    Args:
+        rate (float): PPG sampling rate in Hz. Default: None (read from the
+            ``rate`` meta of the PPG input).
+        column (str|list): PPG column, or list of columns for several
+            devices. Default: None (first column).
+        mode (str): ``"mark"`` to emit every beat with its ``quality`` and
+            ``valid`` columns, or ``"drop"`` to emit valid beats only.
+            Default: ``"mark"``.
+        min_correlation (float): Minimum correlation with the template.
+            Default: 0.8.
+        amplitude (tuple): Accepted range of the amplitude, relative to the
+            recent clean pulses. Default: (0.4, 2.5).
+        width (tuple): Accepted range of the half-height width, relative to
+            the template. Default: (0.5, 2).
+        rr (tuple): Accepted range of the RR interval in milliseconds.
+            Default: (300, 2000).
+        window (tuple): Segment extent before and after the peak, in
+            seconds. Default: (0.25, 0.45).
+        learning (int): Number of beats used to build the template.
+            Default: 5.
+        adaptation (float): Weight of a valid beat in the template and
+            amplitude updates. Default: 0.05.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with the PPG columns.
+        i_beats (Port): Beat input, expects DataFrame indexed by beat time
+            with an ``rr`` column, and a ``device`` column for several
+            devices (e.g. from ``PPGPeakDetector``).
+        o (Port): Default output, provides the beats with ``rr``,
+            ``quality`` (template correlation) and ``valid`` columns, and
+            ``device`` for several devices.
+    """
+
+    def __init__(self, rate=None, column=None, mode="mark", min_correlation=0.8,
+                 amplitude=(0.4, 2.5), width=(0.5, 2), rr=(300, 2000), window=(0.25, 0.45),
+                 learning=5, adaptation=0.05):
+        if mode not in ("mark", "drop"):
+            raise ValueError(f"Unknown mode '{mode}'. Valid values: ['mark', 'drop']")
+        self._rate = rate
+        self._column = column
+        self._mode = mode
+        self._min_correlation = min_correlation
+        self._amplitude_range = amplitude
+        self._width_range = width
+        self._rr_range = rr
+        self._window = window
+        self._learning = learning
+        self._adaptation = adaptation
+        self._columns = None
+        self._pending = deque()  # (time in ns, rr, channel) awaiting the signal after them
+        self._before = self._after = None
+
+    def _setup(self, rate, columns, several):
+        """Allocate the per-device state once the rate and the columns are known."""
+        self._columns, self._several = columns, several
+        self._before = int(round(self._window[0] * rate))
+        self._after = int(round(self._window[1] * rate))
+        self._history = self._before + self._after + int(2 * rate)
+        self._values = np.zeros((0, len(columns)))
+        self._stamps = np.zeros(0, dtype=np.int64)
+        # (time, rr, segment) of each device, until its template is built
+        self._learning_beats = [[] for _ in columns]
+        self._template = [None] * len(columns)  # z-scored clean pulse
+        self._template_width = [None] * len(columns)
+        self._amplitude = [None] * len(columns)
+        self._last_valid = [True] * len(columns)
+
+    @staticmethod
+    def _width(segment, center):
+        """Return the number of samples around ``center`` above half height."""
+        above = segment >= segment.min() + 0.5 * np.ptp(segment)
+        left = np.argmin(above[center::-1]) if not above[center::-1].all() else center + 1
+        right = np.argmin(above[center:]) if not above[center:].all() else segment.size - center
+        return left + right - 1
+
+    @staticmethod
+    def _zscore(segment):
+        std = segment.std()
+        return (segment - segment.mean()) / std if std > 0 else np.zeros_like(segment)
+
+    def _segment(self, time, channel):
+        """Return the segment around ``time``, or None if the signal does not cover it yet."""
+        k = np.searchsorted(self._stamps, time)
+        if k + self._after >= self._stamps.size:
+            return None
+        if k - self._before < 0:
+            return np.zeros(0)  # history lost: cannot be scored
+        return self._values[k - self._before:k + self._after + 1, channel]
+
+    def _complete(self, segment):
+        """Whether a segment covers the whole window around its beat."""
+        return segment.size == self._before + self._after + 1
+
+    def _build_template(self, channel):
+        segments = [segment for _, _, segment in self._learning_beats[channel]
+                    if self._complete(segment)]
+        self._template[channel] = np.median([self._zscore(segment) for segment in segments], axis=0)
+        self._template_width[channel] = self._width(self._template[channel], self._before)
+        self._amplitude[channel] = np.median([np.ptp(segment) for segment in segments])
+
+    def _score(self, rr, segment, channel):
+        """Return the template correlation of a beat, and whether it is valid."""
+        if not self._complete(segment):
+            return np.nan, False
+        z = self._zscore(segment)
+        template = self._zscore(self._template[channel])
+        reference = self._amplitude[channel]
+        quality = float(np.dot(z, template) / z.size)
+        amplitude = np.ptp(segment) / reference if reference > 0 else np.nan
+        width = self._width(segment, self._before) / self._template_width[channel]
+        valid = bool(
+            quality >= self._min_correlation
+            and self._amplitude_range[0] <= amplitude <= self._amplitude_range[1]
+            and self._width_range[0] <= width <= self._width_range[1]
+            and (np.isnan(rr) or self._rr_range[0] <= rr <= self._rr_range[1])
+        )
+        if valid:
+            self._template[channel] += self._adaptation * (z - self._template[channel])
+            self._amplitude[channel] += self._adaptation * (np.ptp(segment) - reference)
+        return quality, valid
+
+    def _emit(self, beats):
+        """Build the output rows of scored beats, as (time, rr, quality, valid, channel)."""
+        rows = []
+        for time, rr, quality, valid, channel in sorted(beats, key=lambda beat: beat[0]):
+            if not self._last_valid[channel]:
+                rr = np.nan
+            self._last_valid[channel] = valid
+            if valid or self._mode == "mark":
+                rows.append((time, rr, quality, valid, channel))
+        return rows
+
+    def update(self):
+        if self.i.ready():
+            if self._columns is None:
+                rate = self._rate or (self.i.meta or {}).get("rate")
+                if not rate:
+                    raise ValueError("BeatQuality needs a 'rate', from params or meta")
+                self._setup(rate, *_ppg_columns(self._column, self.i.data))
+            values = self.i.data[self._columns].values.astype(np.float64)
+            self._values = np.concatenate([self._values, values])
+            stamps = pd.DatetimeIndex(self.i.data.index).as_unit("ns").asi8
+            self._stamps = np.concatenate([self._stamps, stamps])
+        if self.i_beats.ready():
+            beats = self.i_beats.data
+            rr = beats["rr"].values if "rr" in beats else np.full(len(beats), np.nan)
+            channels = (np.zeros(len(beats), dtype=int) if "device" not in beats
+                        else [self._columns.index(device) for device in beats["device"]])
+            stamps = pd.DatetimeIndex(beats.index).as_unit("ns").asi8
+            for time, value, channel in zip(stamps, rr, channels):
+                self._pending.append((time, float(value), channel))
+        if self._columns is None:
+            return
+
+        scored = []
+        while self._pending:
+            time, rr, channel = self._pending[0]
+            segment = self._segment(time, channel)
+            if segment is None:
+                break
+            self._pending.popleft()
+            if self._template[channel] is not None:
+                scored.append((time, rr, *self._score(rr, segment, channel), channel))
+                continue
+            # Beats that cannot be scored are kept in order, but not used for the template
+            learning = self._learning_beats[channel]
+            learning.append((time, rr, segment))
+            if self._complete(segment) and sum(
+                    self._complete(beat[2]) for beat in learning) == self._learning:
+                self._build_template(channel)
+                for beat in learning:
+                    scored.append((beat[0], beat[1], *self._score(beat[1], beat[2], channel),
+                                   channel))
+                self._learning_beats[channel] = []
+
+        # Keep the signal needed by pending beats, within a bounded history
+        keep = self._history
+        if self._pending:
+            first = np.searchsorted(self._stamps, self._pending[0][0])
+            keep = max(keep, self._stamps.size - first + self._before)
+        self._values, self._stamps = self._values[-keep:], self._stamps[-keep:]
+
+        rows = self._emit(scored)
+        if rows:
+            times, rr, quality, valid, channels = zip(*rows)
+            index = pd.to_datetime(np.array(times, dtype=np.int64), utc=True)
+            self.o.data = pd.DataFrame({"rr": rr, "quality": quality, "valid": valid}, index=index)
+            if self._several:
+                self.o.data["device"] = [self._columns[c] for c in channels]
+
+
+def _new_beats(data, last):
+    """Return the sorted, unique beat times of ``data`` that come after ``last``.
+
+    Each time comes with whether the RR interval ending at it can be used:
+    beats marked invalid (``valid`` column) and NaN ``rr`` values, as set by
+    ``BeatQuality``, are skipped. Inputs without these columns are all usable.
+    """
+    data = data[~data.index.duplicated(keep="last")].sort_index()
+    if last is not None:
+        data = data[data.index > last]
+    usable = np.ones(len(data), dtype=bool)
+    if "valid" in data:
+        usable &= data["valid"].values.astype(bool)
+    if "rr" in data:
+        usable &= ~np.isnan(data["rr"].values.astype(np.float64))
+    return zip(pd.DatetimeIndex(data.index), usable)
+
+
+def _hrv_update(node):
+    """Feed the input of an HRV node to its ``_process`` method, device by device.
+
+    Without a ``device`` column, the node processes the beats itself. With
+    one, each device gets its own calculator, built with the node parameters,
+    and the output row holds the last indices of every device so far, as
+    ``<device>_<index>`` columns, at the last new beat.
+
+    Returns:
+        DataFrame: The published row, or None if there was nothing new.
+    """
+    data = node.i.data
+    if "device" not in data:
+        result = node._process(data)
+        if result is None:
+            return None
+        node.o.data = pd.DataFrame([result[1]], index=[result[0]])
+        return node.o.data
+    last = None
+    for device, beats in data.groupby("device", sort=False):
+        if device not in node._devices:
+            node._devices[device] = type(node)(*node._params)
+        result = node._devices[device]._process(beats)
+        if result is not None:
+            node._latest[device] = result[1]
+            last = result[0] if last is None else max(last, result[0])
+    if last is not None:
+        row = {f"{device}_{name}": value
+               for device, indices in node._latest.items() for name, value in indices.items()}
+        node.o.data = pd.DataFrame([row], index=[last])
+        return node.o.data
+    return None
+
+
 class HRVTimeDomainCalculator(Node):
-    def __init__(self):
+    """Compute time-domain HRV indices incrementally, beat by beat.
+
+    Beats are read from the input index and deduplicated by timestamp, so
+    overlapping windows (e.g. from a ``Slide`` node) can be fed as is. RR
+    intervals are kept for a bounded horizon, with running sums updated as
+    beats enter and leave it: each beat costs O(1), and memory is constant.
+    Indices follow the NeuroKit conventions (``nk.hrv_time``). Intervals
+    flagged by ``BeatQuality`` are skipped, and successive differences are
+    not taken across them; nothing is computed until a usable beat arrives.
+
+    Args:
+        horizon (float): Duration covered by the RR intervals, in seconds.
+            Default: 300.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame indexed by beat time,
+            with optional ``rr`` and ``valid`` columns.
+        o (Port): Default output, provides DataFrame with ``HRV_MeanNN``,
+            ``HRV_SDNN``, ``HRV_RMSSD``, ``HRV_SDSD`` and ``HRV_pNN50``, one
+            row at the last beat of each update with new beats.
+    """
+
+    def __init__(self, horizon=300):
         super().__init__()
+        self._params = (horizon,)
+        self._devices = {}  # device name: calculator, when several devices share the input
+        self._latest = {}  # device name: last indices
+        self._horizon = pd.Timedelta(seconds=horizon)
         self.last_peak_time = None
-        self.rr_intervals = []
+        self._beats = deque()  # (time, RR in ms)
+        self._diffs = deque()  # (time, successive RR difference in ms)
+        self._shift = None  # RR offset, for numerically stable running sums
+        self._rr_sum = self._rr_sq = 0.0
+        self._diff_sum = self._diff_sq = 0.0
+        self._nn50 = 0
+        self._contiguous = True  # whether the previous RR interval was kept
+
+    def _add(self, time, rr, contiguous):
+        if self._shift is None:
+            self._shift = rr
+        if self._beats and contiguous:
+            diff = rr - self._beats[-1][1]
+            self._diffs.append((time, diff))
+            self._diff_sum += diff
+            self._diff_sq += diff ** 2
+            self._nn50 += abs(diff) > 50
+        self._beats.append((time, rr))
+        self._rr_sum += rr - self._shift
+        self._rr_sq += (rr - self._shift) ** 2
+
+    def _evict(self, now):
+        while self._beats and now - self._beats[0][0] > self._horizon:
+            _, rr = self._beats.popleft()
+            self._rr_sum -= rr - self._shift
+            self._rr_sq -= (rr - self._shift) ** 2
+        # A difference leaves with the earlier of its two intervals
+        while self._diffs and (not self._beats or self._diffs[0][0] <= self._beats[0][0]):
+            _, diff = self._diffs.popleft()
+            self._diff_sum -= diff
+            self._diff_sq -= diff ** 2
+            self._nn50 -= abs(diff) > 50
+
+    def _indices(self):
+        n = len(self._beats)
+        mean = self._rr_sum / n
+        var = (self._rr_sq - n * mean ** 2) / (n - 1)
+        m = len(self._diffs)
+        if m > 1:
+            diff_mean = self._diff_sum / m
+            sdsd = np.sqrt(max((self._diff_sq - m * diff_mean ** 2) / (m - 1), 0))
+        else:
+            sdsd = np.nan
+        return {
+            "HRV_MeanNN": mean + self._shift,
+            "HRV_SDNN": np.sqrt(max(var, 0)),
+            "HRV_RMSSD": np.sqrt(self._diff_sq / m) if m else np.nan,
+            "HRV_SDSD": sdsd,
+            "HRV_pNN50": 100 * self._nn50 / n,
+        }
+
+    def _process(self, data):
+        """Add the new beats of ``data``, and return the last beat time and indices, if any."""
+        new = False
+        for time, usable in _new_beats(data, self.last_peak_time):
+            if self.last_peak_time is not None and usable:
+                self._add(time, (time.value - self.last_peak_time.value) / 1e6, self._contiguous)
+                new = True
+            self._contiguous = usable
+            self.last_peak_time = time
+        if not new:
+            return None
+        self._evict(self.last_peak_time)
+        if len(self._beats) > 1:
+            return self.last_peak_time, self._indices()
+        return None
 
     def update(self):
         if self.i.ready():
-            for time, row in self.i.data.iterrows():
-                if self.last_peak_time is not None:
-                    rr_interval = (time - self.last_peak_time).total_seconds() * 1000  # Convert to milliseconds
-                    self.rr_intervals.append(rr_interval)
-                self.last_peak_time = time
+            _hrv_update(self)
+
+class HRVFrequencyDomainCalculator(Node):
+    """Compute LF and HF heart rate variability with a streaming Lomb–Scargle periodogram.
+
+    The RR series is unevenly sampled, which the Lomb–Scargle periodogram
+    handles without resampling. For each frequency of a fixed grid, the
+    trigonometric sums it needs are updated as beats enter and leave a
+    bounded horizon, so each beat costs O(frequencies) and each spectrum
+    O(frequencies), whatever the horizon. The sums are rebuilt from the
+    window once it has been fully renewed, to bound rounding drift.
+    Intervals flagged by ``BeatQuality`` are left out of the series, and
+    nothing is computed until a usable beat arrives. Between two spectra,
+    the last one is repeated every ``interval``, so that a dropout or a run
+    of invalid beats does not stall the output.
 
-            if len(self.rr_intervals) > 1:
-                # Convert RR intervals to peak indices
-                peak_indices = nk.intervals_to_peaks(self.rr_intervals, sampling_rate=25)
+    Args:
+        horizon (float): Duration covered by the RR intervals, in seconds.
+            Default: 300.
+        min_duration (float): Minimum duration of the RR series before
+            publishing, in seconds. Default: 60.
+        lf (tuple): Low frequency band in Hz. Default: (0.04, 0.15).
+        hf (tuple): High frequency band in Hz. Default: (0.15, 0.4).
+        resolution (float): Frequency grid step in Hz. Default: 0.005.
+        interval (float): Seconds without a new spectrum after which the
+            last one is published again, stamped at the current time. None
+            publishes on new beats only. Default: 5.
+
+    Attributes:
+        i (Port): Default input, expects DataFrame indexed by beat time,
+            with optional ``rr`` and ``valid`` columns.
+        o (Port): Default output, provides DataFrame with ``HRV_LF`` and
+            ``HRV_HF`` (ms²) and ``HRV_LFHF``, one row per update with new
+            beats, at the last beat, or the last row repeated every
+            ``interval``.
+    """
+
+    def __init__(self, horizon=300, min_duration=60, lf=(0.04, 0.15), hf=(0.15, 0.4),
+                 resolution=0.005, interval=5):
+        super().__init__()
+        self._params = (horizon, min_duration, lf, hf, resolution, interval)
+        self._interval = interval
+        self._last = None  # last published row
+        self._published = None  # host time of the last publication
+        self._devices = {}  # device name: calculator, when several devices share the input
+        self._latest = {}  # device name: last indices
+        self._horizon = pd.Timedelta(seconds=horizon)
+        self._min_duration = pd.Timedelta(seconds=min_duration)
+        self._freqs = np.arange(lf[0], hf[1] + resolution / 2, resolution)
+        self._omega = 2 * np.pi * self._freqs
+        self._lf = (self._freqs >= lf[0]) & (self._freqs < lf[1])
+        self._hf = (self._freqs >= hf[0]) & (self._freqs <= hf[1])
+        self.last_peak_time = None
+        self._origin = None  # time reference of the trigonometric sums
+        self._beats = deque()  # (time, seconds since origin, RR in ms)
+        self._changes = 0  # beats added or removed since the last rebuild
+        self._reset_sums()
+
+    def _reset_sums(self):
+        size = self._freqs.size
+        self._rr_sum = 0.0
+        self._c, self._s = np.zeros(size), np.zeros(size)  # sum cos(wt), sin(wt)
+        self._c2, self._s2 = np.zeros(size), np.zeros(size)  # sum cos(2wt), sin(2wt)
+        self._yc, self._ys = np.zeros(size), np.zeros(size)  # sum y cos(wt), y sin(wt)
+
+    def _accumulate(self, t, rr, sign):
+        phase = self._omega * t
+        cos, sin = np.cos(phase), np.sin(phase)
+        self._rr_sum += sign * rr
+        self._c += sign * cos
+        self._s += sign * sin
+        self._c2 += sign * (cos * cos - sin * sin)
+        self._s2 += sign * 2 * sin * cos
+        self._yc += sign * rr * cos
+        self._ys += sign * rr * sin
+        self._changes += 1
+
+    def _rebuild(self):
+        self._reset_sums()
+        for _, t, rr in self._beats:
+            self._accumulate(t, rr, 1)
+        self._changes = 0
+
+    def _spectrum(self):
+        """Return the power spectral density of the RR series, in ms²/Hz."""
+        n = len(self._beats)
+        mean = self._rr_sum / n
+        # Centered sums, then the Lomb–Scargle time offset tau
+        yc = self._yc - mean * self._c
+        ys = self._ys - mean * self._s
+        two_tau = np.arctan2(self._s2, self._c2)
+        cos_tau, sin_tau = np.cos(two_tau / 2), np.sin(two_tau / 2)
+        cos2 = self._c2 * np.cos(two_tau) + self._s2 * np.sin(two_tau)
+        cc = (n + cos2) / 2
+        ss = np.maximum((n - cos2) / 2, 1e-12)
+        a = cos_tau * yc + sin_tau * ys
+        b = cos_tau * ys - sin_tau * yc
+        power = 0.5 * (a ** 2 / cc + b ** 2 / ss)
+        # One-sided density, so that the integral is the variance
+        duration = self._beats[-1][1] - self._beats[0][1]
+        return power * 2 * duration / n
+
+    def _process(self, data):
+        """Add the new beats of ``data``, and return the last beat time and indices, if any."""
+        new = False
+        for time, usable in _new_beats(data, self.last_peak_time):
+            if self.last_peak_time is not None and usable:
+                if self._origin is None:
+                    self._origin = time
+                t = (time.value - self._origin.value) / 1e9
+                rr = (time.value - self.last_peak_time.value) / 1e6
+                self._beats.append((time, t, rr))
+                self._accumulate(t, rr, 1)
+                new = True
+            self.last_peak_time = time
+        if not new:
+            return None
+        while self.last_peak_time - self._beats[0][0] > self._horizon:
+            _, t, rr = self._beats.popleft()
+            self._accumulate(t, rr, -1)
+        if self._changes > 2 * len(self._beats):
+            self._rebuild()
+        if len(self._beats) < 3 or self._beats[-1][0] - self._beats[0][0] < self._min_duration:
+            return None
 
-                # Calculate time-domain HRV metrics
-                hrv_metrics_time = nk.hrv_time(peak_indices, sampling_rate=25, show=False)
+        psd = self._spectrum()
+        lf = trapezoid(psd[self._lf], self._freqs[self._lf])
+        hf = trapezoid(psd[self._hf], self._freqs[self._hf])
+        return self.last_peak_time, {
+            "HRV_LF": lf, "HRV_HF": hf, "HRV_LFHF": lf / hf if hf > 0 else np.nan,
+        }
 
-                # Create a DataFrame with the timestamp as the index
-                output_df = pd.DataFrame(hrv_metrics_time)
-                
-                # If you want to use the last peak time as the index for the entire DataFrame
-                if self.last_peak_time is not None:
-                    output_df.index = [self.last_peak_time]
+    def update(self):
+        now = time.time()
+        row = _hrv_update(self) if self.i.ready() else None
+        if row is not None:
+            self._last, self._published = row, now
+        elif (self._interval is not None and self._last is not None
+              and now - self._published >= self._interval):
+            self.o.data = pd.DataFrame(self._last.values, columns=self._last.columns,
+                                       index=pd.to_datetime([now], unit="s", utc=True))
+            self._published = now
 
-                # Ensure the index is in UTC datetime format
-                # If 'self.last_peak_time' is already a datetime, you might need to convert it to UTC
-                # output_df.index = pd.to_datetime(output_df.index).tz_convert('UTC')
-                
-                # Properly format the output DataFrame
-                self.o.data = output_df
 
 class ArousalMetric(Node):
 
@@ -612,3 +1545,107 @@ class StressMetric(Node):
                 if self.last_peak_time is not None:
                     output_df.index = [self.last_peak_time] * len(stress_metrics)
                 self.o.data = output_df
+
+# HRV metrics, as HRV feature -> (weight, value scoring 0, value scoring 1).
+# Features scoring 1 at their low bound are inverted (low variability = high metric).
+DEFAULT_HRV_METRICS = {
+    "PPG_Arousal_Metric": {
+        "HRV_MeanNN": (0.34, 120, 50),
+        "HRV_RMSSD": (0.33, 100, 20),
+        "HRV_SDSD": (0.33, 100, 20),
+    },
+    "PPG_Attention_Metric": {
+        "HRV_RMSSD": (0.40, 100, 20),
+        "HRV_SDNN": (0.30, 100, 20),
+        "HRV_pNN50": (0.30, 0, 20),
+    },
+    "PPG_Cognitive_Load_Metric": {
+        "HRV_SDNN": (0.5, 140, 30),
+        "HRV_RMSSD": (0.5, 100, 20),
+    },
+    "PPG_Stress_Metric": {
+        "HRV_SDNN": (0.33, 140, 30),
+        "HRV_RMSSD": (0.33, 100, 20),
+        "HRV_pNN50": (0.34, 0, 20),
+    },
+}
+
+
+class HRVMetrics(Node):
+    """Compute every HRV-based metric for every row in one vectorized pass.
+
+    Replaces one node per metric: the table is held as (metrics x features)
+    weight and bound matrices, each feature is scaled between its two bounds
+    and clipped to [0, 1], and metrics are the weighted sums.
+
+    Features of several devices, as ``<device>_<feature>`` columns (e.g. from
+    the HRV nodes fed with several devices), are scored in the same pass,
+    and the metrics are named ``<device>_<metric>`` likewise.
+
+    Args:
+        metrics (dict): Metric name mapped to its features, each given as
+            ``[weight, zero, one]``: the feature values scoring 0 and 1
+            (``zero > one`` inverts the feature). Default: arousal,
+            attention, cognitive load and stress, with the bounds of the
+            single-metric nodes and the weights of the PPG graph.
+        source (str): Name prefix of the default metrics, e.g. ``"ECG"`` for
+            ``ECG_Stress_Metric``. Ignored with custom ``metrics``.
+            Default: "PPG".
+
+    Attributes:
+        i (Port): Default input, expects DataFrame with HRV features.
+        o (Port): Default output, provides DataFrame with one column per metric.
+        o_* (Port): One output per metric (e.g. ``o_PPG_Stress_Metric``),
+            provides DataFrame with that metric only, for every device.
+    """
+
+    def __init__(self, metrics=None, source="PPG"):
+        super().__init__()
+        if not metrics:
+            metrics = {f"{source}_{name[len('PPG_'):]}": table
+                       for name, table in DEFAULT_HRV_METRICS.items()}
+        self._metrics = list(metrics)
+        self._features = sorted({feature for table in metrics.values() for feature in table})
+        shape = (len(self._metrics), len(self._features))
+        self._weights = np.zeros(shape)
+        self._zero = np.zeros(shape)
+        self._span = np.ones(shape)
+        for m, name in enumerate(self._metrics):
+            for feature, (weight, zero, one) in metrics[name].items():
+                if zero == one:
+                    raise ValueError(f"HRV metric '{name}' has equal bounds for '{feature}'")
+                f = self._features.index(feature)
+                self._weights[m, f] = weight
+                self._zero[m, f] = zero
+                self._span[m, f] = one - zero
+        self._used = self._weights != 0
+
+    def _devices(self, columns):
+        """Return the device prefixes of ``<device>_<feature>`` columns, or ``[None]``."""
+        devices = []
+        for column in columns:
+            for feature in self._features:
+                if column.endswith(f"_{feature}"):
+                    device = column[:-len(feature) - 1]
+                    if device not in devices:
+                        devices.append(device)
+                    break
+        return devices or [None]
+
+    def update(self):
+        if not self.i.ready():
+            return
+        devices = self._devices(self.i.data.columns)
+        prefixes = [f"{device}_" if device is not None else "" for device in devices]
+        # (rows, devices, 1, features) against (metrics, features) bounds
+        columns = [prefix + feature for prefix in prefixes for feature in self._features]
+        features = self.i.data.reindex(columns=columns).values.astype(np.float64)
+        features = features.reshape(len(self.i.data), len(devices), 1, len(self._features))
+        scaled = np.clip((features - self._zero) / self._span, 0, 1)
+        scaled = np.where(self._used, scaled, 0)  # unused features may be missing
+        values = np.einsum("rdmf,mf->rdm", scaled, self._weights)
+        names = [prefix + name for prefix in prefixes for name in self._metrics]
+        self.o.data = pd.DataFrame(values.reshape(len(self.i.data), -1), index=self.i.data.index,
+                                   columns=names)
+        for name in self._metrics:
+            getattr(self, f"o_{name}").data = self.o.data[[prefix + name for prefix in prefixes]]
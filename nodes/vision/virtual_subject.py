@@ -0,0 +1,226 @@
+"""Hardware-free virtual subject for benchmarking the multimodal fusion path.
+
+A latent state (stress, attention, arousal) follows correlated
+Ornstein–Uhlenbeck processes. It drives:
+
+- the EEG band amplitudes of the EEG simulator (e.g. attention lowers alpha
+  and raises beta),
+- the heart rate and heart rate variability of the PPG simulator,
+- a synthetic ``facial_metrics`` stream with the columns of
+  ``UnifiedFacialMetricsAndTracking``, and blendshapes with the categories of
+  ``FaceBlendshapes``.
+
+Everything is seeded, so that a benchmark run can be replayed exactly.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from timeflux.core.node import Node
+
+from nodes.common.clock import ClockModel
+from nodes.eeg.simulator import DEFAULT_CHANNELS, EEGGenerator
+from nodes.physio.ppg import PPGSimulator
+
+# Latent dimensions, each in [0, 1]
+LATENTS = ["stress", "attention", "arousal"]
+
+# Correlation of the latent innovations (stress, attention, arousal)
+_LATENT_CORRELATION = np.array([
+    [1.0, -0.3, 0.5],
+    [-0.3, 1.0, 0.3],
+    [0.5, 0.3, 1.0],
+])
+
+# EEG band gain per unit of latent deviation from 0.5, (bands, latents).
+# Band order follows EEGGenerator.bands: delta, theta, alpha, beta, gamma.
+_EEG_COUPLING = np.array([
+    [0.0, 0.0, -0.4],   # delta: drowsiness
+    [0.2, -0.4, -0.4],  # theta: mind wandering, low arousal
+    [-0.4, -0.6, 0.0],  # alpha: desynchronized by attention and stress
+    [0.6, 0.6, 0.2],    # beta: engagement and stress
+    [0.4, 0.0, 0.0],    # gamma: stress (muscle tension)
+])
+
+FACIAL_METRICS = ["head_speed", "left_eye_speed", "right_eye_speed", "avg_eye_speed",
+                  "left_EAR", "right_EAR", "EAR", "attention", "vigilance", "stress"]
+
+BLENDSHAPES = [
+    "_neutral", "browDownLeft", "browDownRight", "browInnerUp", "browOuterUpLeft",
+    "browOuterUpRight", "cheekPuff", "cheekSquintLeft", "cheekSquintRight", "eyeBlinkLeft",
+    "eyeBlinkRight", "eyeLookDownLeft", "eyeLookDownRight", "eyeLookInLeft", "eyeLookInRight",
+    "eyeLookOutLeft", "eyeLookOutRight", "eyeLookUpLeft", "eyeLookUpRight", "eyeSquintLeft",
+    "eyeSquintRight", "eyeWideLeft", "eyeWideRight", "jawForward", "jawLeft", "jawOpen",
+    "jawRight", "mouthClose", "mouthDimpleLeft", "mouthDimpleRight", "mouthFrownLeft",
+    "mouthFrownRight", "mouthFunnel", "mouthLeft", "mouthLowerDownLeft", "mouthLowerDownRight",
+    "mouthPressLeft", "mouthPressRight", "mouthPucker", "mouthRight", "mouthRollLower",
+    "mouthRollUpper", "mouthShrugLower", "mouthShrugUpper", "mouthSmileLeft", "mouthSmileRight",
+    "mouthStretchLeft", "mouthStretchRight", "mouthUpperUpLeft", "mouthUpperUpRight",
+    "noseSneerLeft", "noseSneerRight",
+]
+
+# Normalization of the camera node
+_MAX_HEAD_SPEED = 30
+_MAX_EYE_SPEED = 4.0
+_EYE_CLOSED_EAR = 0.2
+
+
+class VirtualSubject(Node):
+    """Simulate a subject whose EEG, PPG and face share a latent state.
+
+    Each tick emits one chunk of EEG and PPG, one row of facial metrics and
+    blendshapes (like the camera nodes), and the latent state as ground truth.
+
+    Args:
+        channels (list[str]): EEG channel names. Default: the EEG simulator channels.
+        eeg_rate (int): EEG sampling rate in Hz. Default: 250.
+        ppg_rate (int): PPG sampling rate in Hz. Default: 25.
+        chunk_duration (float): Duration of each tick in seconds. Should
+            match the graph rate. Default: 0.1.
+        time_constant (float): Time constant of the latent state, in seconds.
+            Default: 30.
+        heart_rate (float): Heart rate at a neutral state, in BPM. Default: 70.
+        hrv_std (float): RR interval variability at a neutral state, in
+            seconds. Default: 0.04.
+        blink_rate (float): Blink rate at full arousal, in blinks per second,
+            doubling when arousal is lowest. Default: 0.3.
+        seed (int): Random seed. Default: 42.
+
+    Attributes:
+        o_eeg (Port): EEG chunk, provides DataFrame in uV.
+        o_ppg (Port): PPG chunk, provides DataFrame with a ``"0"`` column.
+        o_facial_metrics (Port): Facial metrics, one row per tick.
+        o_blendshapes (Port): Facial blendshape scores, one row per tick.
+        o_state (Port): Latent ``stress``, ``attention`` and ``arousal``, one
+            row per tick.
+    """
+
+    def __init__(self, channels=None, eeg_rate=250, ppg_rate=25, chunk_duration=0.1,
+                 time_constant=30, heart_rate=70, hrv_std=0.04, blink_rate=0.3, seed=42):
+        self._channels = channels or DEFAULT_CHANNELS
+        self._eeg_rate = eeg_rate
+        self._ppg_rate = ppg_rate
+        self._dt = chunk_duration
+        self._eeg_samples = max(1, int(eeg_rate * chunk_duration))
+        self._ppg_samples = max(1, int(ppg_rate * chunk_duration))
+        self._rng = np.random.default_rng(seed)
+
+        # Latent state, as OU processes with unit stationary variance, squashed to [0, 1]
+        self._decay = np.exp(-chunk_duration / time_constant)
+        self._mixing = np.linalg.cholesky(_LATENT_CORRELATION)
+        self._latent = self._mixing @ self._rng.standard_normal(len(LATENTS))
+
+        # Band amplitudes are driven by the latent state only: no intrinsic drift
+        self._eeg = EEGGenerator(self._channels, eeg_rate, alpha_amplitude=15.0,
+                                 noise_amplitude=30.0, drift_speed=0, seed=seed, state=1.0)
+        self._ppg = PPGSimulator(heart_rate=heart_rate, hrv_std=hrv_std,
+                                 sampling_rate=ppg_rate, chunk_duration=chunk_duration)
+        self._heart_rate = heart_rate
+        self._hrv_std = hrv_std
+        self._blink_rate = blink_rate
+
+        self._eeg_clock = ClockModel(eeg_rate)
+        self._ppg_clock = ClockModel(ppg_rate)
+        self._eeg_counter = 0
+        self._ppg_counter = 0
+
+    @property
+    def state(self):
+        """Current latent state, as a dict of values in [0, 1]."""
+        return dict(zip(LATENTS, 1 / (1 + np.exp(-self._latent))))
+
+    def _step(self):
+        """Advance the latent state by one tick."""
+        noise = self._mixing @ self._rng.standard_normal(len(LATENTS))
+        self._latent = self._decay * self._latent + np.sqrt(1 - self._decay ** 2) * noise
+        return self.state
+
+    def _facial(self, state):
+        """Return facial metrics and blendshapes for one frame."""
+        rng = self._rng
+        stress, attention, arousal = state["stress"], state["attention"], state["arousal"]
+
+        # Fidgeting grows with stress and inattention
+        motion = np.clip(0.6 * (1 - attention) + 0.4 * stress + 0.05 * rng.standard_normal(), 0, 1)
+        head_speed = _MAX_HEAD_SPEED * motion * abs(1 + 0.1 * rng.standard_normal())
+        left_eye_speed, right_eye_speed = _MAX_EYE_SPEED * motion * np.abs(
+            1 + 0.1 * rng.standard_normal(2))
+        avg_eye_speed = (left_eye_speed + right_eye_speed) / 2
+
+        # Eyes open wider with arousal, and blink more often when drowsy
+        blink_probability = self._blink_rate * (2 - arousal) * self._dt
+        if rng.random() < blink_probability:
+            left_EAR, right_EAR = 0.08 + 0.02 * rng.random(2)
+        else:
+            left_EAR, right_EAR = 0.19 + 0.18 * arousal + 0.01 * rng.standard_normal(2)
+        EAR = (left_EAR + right_EAR) / 2
+
+        # Same scores as the camera node
+        norm_head = min(max(head_speed / _MAX_HEAD_SPEED, 0), 1)
+        norm_eyes = min(max(avg_eye_speed / _MAX_EYE_SPEED, 0), 1)
+        eyes_closed = left_EAR < _EYE_CLOSED_EAR and right_EAR < _EYE_CLOSED_EAR
+        metrics = {
+            "head_speed": head_speed,
+            "left_eye_speed": left_eye_speed,
+            "right_eye_speed": right_eye_speed,
+            "avg_eye_speed": avg_eye_speed,
+            "left_EAR": left_EAR,
+            "right_EAR": right_EAR,
+            "EAR": EAR,
+            "attention": 0.0 if eyes_closed else 1.0 - (norm_head + norm_eyes) / 2.0,
+            "vigilance": min(max((EAR - 0.1) / (0.4 - 0.1), 0), 1),
+            "stress": (norm_head + norm_eyes) / 2.0,
+        }
+
+        blendshapes = dict.fromkeys(BLENDSHAPES, 0.0)
+        blendshapes.update({
+            "eyeBlinkLeft": (0.35 - left_EAR) / 0.25,
+            "eyeBlinkRight": (0.35 - right_EAR) / 0.25,
+            "browDownLeft": 0.6 * stress,
+            "browDownRight": 0.6 * stress,
+            "browInnerUp": 0.4 * stress,
+            "mouthPressLeft": 0.3 * stress,
+            "mouthPressRight": 0.3 * stress,
+            "eyeWideLeft": 0.3 * arousal,
+            "eyeWideRight": 0.3 * arousal,
+            "mouthSmileLeft": 0.4 * (1 - stress) * arousal,
+            "mouthSmileRight": 0.4 * (1 - stress) * arousal,
+            "jawOpen": 0.05,
+        })
+        values = np.array(list(blendshapes.values()))
+        values = np.clip(values + 0.02 * rng.standard_normal(values.size), 0, 1)
+        return metrics, dict(zip(blendshapes, values))
+
+    def update(self):
+        now = time.time()
+        state = self._step()
+        deviation = np.array([state[name] for name in LATENTS]) - 0.5
+
+        # EEG: one gain per band, shared by all channels
+        gains = np.clip(1 + _EEG_COUPLING @ deviation, 0.1, None)
+        modulation = np.broadcast_to(gains[None, :, None],
+                                     (len(self._channels), len(self._eeg.bands), self._eeg_samples))
+        eeg = self._eeg.generate(self._eeg_samples, modulation).T
+        self._eeg_clock.observe(self._eeg_counter + self._eeg_samples - 1, now)
+        eeg_index = self._eeg_clock.timestamps(self._eeg_counter, self._eeg_samples)
+        self._eeg_counter += self._eeg_samples
+        self.o_eeg.data = pd.DataFrame(eeg, index=eeg_index, columns=self._channels)
+        self.o_eeg.meta = {"rate": self._eeg_rate}
+
+        # PPG: arousal and stress speed the heart up, stress lowers its variability
+        heart_rate = self._heart_rate * (1 + 0.25 * deviation[2] + 0.15 * deviation[0])
+        self._ppg.heart_rate = heart_rate
+        self._ppg.hrv_std = self._hrv_std * (1 - 0.8 * deviation[0])
+        ppg = self._ppg.generate(self._ppg_samples)
+        self._ppg_clock.observe(self._ppg_counter + self._ppg_samples - 1, now)
+        ppg_index = self._ppg_clock.timestamps(self._ppg_counter, self._ppg_samples)
+        self._ppg_counter += self._ppg_samples
+        self.o_ppg.data = pd.DataFrame(ppg, index=ppg_index, columns=["0"])
+        self.o_ppg.meta = {"rate": self._ppg_rate}
+
+        # Face and ground truth: one row per tick, like the camera nodes
+        metrics, blendshapes = self._facial(state)
+        index = eeg_index[-1:]
+        self.o_facial_metrics.data = pd.DataFrame([metrics], index=index, columns=FACIAL_METRICS)
+        self.o_blendshapes.data = pd.DataFrame([blendshapes], index=index, columns=BLENDSHAPES)
+        self.o_state.data = pd.DataFrame([state], index=index, columns=LATENTS)
@@ -33,6 +33,9 @@ SCHEMA = [
             {"key": "ECG", "label": "ECG Serial Port", "type": "text", "default": "",
              "description": "BITalino serial port (leave empty to disable)",
              "placeholder": "/dev/tty.BITalino-XX-XX"},
+            {"key": "ECG_TOPIC", "label": "ECG Topic", "type": "text", "default": "",
+             "description": "Topic of the ECG heart metrics (leave empty for the BITalino)",
+             "placeholder": "ecg_simulated"},
             {"key": "CAMERA_ENABLE", "label": "Camera", "type": "bool", "default": "false",
              "description": "Enable facial expression detection via camera"},
         ],
@@ -84,6 +87,14 @@ SCHEMA = [
              "description": "Target OSC server port"},
         ],
     },
+    {
+        "section": "LSL Output",
+        "icon": "radio",
+        "fields": [
+            {"key": "LSL_ENABLE", "label": "LSL Streaming", "type": "bool", "default": "false",
+             "description": "Publish filtered EEG and metrics as LSL outlets"},
+        ],
+    },
     {
         "section": "Paths & Models",
         "icon": "folder",
@@ -52,6 +52,9 @@ sys.modules["pyautogui"] = MagicMock()
 # Mock cv2
 sys.modules["cv2"] = MagicMock()
 
+# Mock pylsl
+sys.modules["pylsl"] = MagicMock()
+
 # Mock brainflow
 brainflow_mock = MagicMock()
 # Provide BoardIds as an enum-like object with integer values
@@ -73,7 +76,17 @@ class FakeBoardIds:
     CROWN_BOARD = 23
     FREEEEG32_BOARD = 17
 
+class FakeBrainFlowPresets:
+    DEFAULT_PRESET = 0
+    AUXILIARY_PRESET = 1
+    ANCILLARY_PRESET = 2
+
+class FakeBrainFlowError(Exception):
+    pass
+
 brainflow_mock.board_shim.BoardIds = FakeBoardIds
+brainflow_mock.board_shim.BrainFlowPresets = FakeBrainFlowPresets
+brainflow_mock.board_shim.BrainFlowError = FakeBrainFlowError
 brainflow_mock.board_shim.BrainFlowInputParams = MagicMock
 brainflow_mock.board_shim.BoardShim = MagicMock
 
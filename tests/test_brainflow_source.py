@@ -4,13 +4,16 @@ Uses mocked BoardShim to verify the node produces correctly shaped
 DataFrames with expected column names — no hardware required.
 """
 
+import os
 import numpy as np
 import pandas as pd
 import pytest
 from unittest.mock import MagicMock, patch
 
+from brainflow.board_shim import BrainFlowError
+
 from nodes.eeg.brainflow_source import (
-    BrainFlowSource, BOARD_MAP, CHANNEL_NAMES,
+    BrainFlowSource, MultiBrainFlowSource, BOARD_MAP, CHANNEL_NAMES, _align,
 )
 
 
@@ -105,6 +108,66 @@ class TestBrainFlowSource:
         with pytest.raises(ValueError, match="Unknown device"):
             BrainFlowSource(device="nonexistent_device_xyz")
 
+    def test_threaded_reads_from_ring_buffer(self, mock_board):
+        MockShim, instance = mock_board
+        MockShim.get_num_rows.return_value = 31
+        node = BrainFlowSource(device="synthetic", threaded=True, poll_interval=60)
+        node._reader.stop()
+        node.o = MagicMock()
+        node.logger = MagicMock()
+
+        # Two polls accumulate before the graph ticks once
+        node._reader.buffer.read()
+        node._reader.poll()
+        node._reader.poll()
+        node.update()
+
+        assert node.o.data.shape == (200, 16)
+        assert len(node._reader.buffer) == 0
+
+    def test_threaded_overflow_is_reported(self, mock_board):
+        MockShim, instance = mock_board
+        MockShim.get_num_rows.return_value = 31
+        node = BrainFlowSource(device="synthetic", threaded=True,
+                               poll_interval=60, buffer_duration=0.6)
+        node._reader.stop()
+        node.o = MagicMock()
+        node.logger = MagicMock()
+
+        # Capacity is 150 samples: three polls of 100 overflow the buffer
+        for _ in range(3):
+            node._reader.poll()
+        node.update()
+
+        assert node.o.data.shape == (150, 16)
+        node.logger.warning.assert_called_once()
+
+    def test_terminate_stops_reader(self, mock_board):
+        MockShim, instance = mock_board
+        MockShim.get_num_rows.return_value = 31
+        node = BrainFlowSource(device="synthetic", threaded=True, poll_interval=60)
+        node.terminate()
+
+        assert not node._reader._thread.is_alive()
+        instance.release_session.assert_called_once()
+
+    def test_clock_model_timestamps_evenly_spaced(self, mock_board):
+        MockShim, instance = mock_board
+        data = instance.get_board_data.return_value
+        # Jitter BrainFlow's host timestamps
+        data[30, :] += np.random.default_rng(0).uniform(0, 0.01, 100)
+        node = BrainFlowSource(device="synthetic", clock="model")
+        node.o = MagicMock()
+        node.update()
+
+        deltas = np.diff(node.o.data.index.asi8)
+        assert np.all(deltas > 0)
+        assert deltas.max() - deltas.min() <= 1  # nanosecond rounding
+
+    def test_unknown_clock_raises(self, mock_board):
+        with pytest.raises(ValueError, match="Unknown clock"):
+            BrainFlowSource(device="synthetic", clock="bogus")
+
     def test_timestamp_index_is_datetime(self, mock_board):
         MockShim, instance = mock_board
         node = BrainFlowSource(device="synthetic")
@@ -115,6 +178,373 @@ class TestBrainFlowSource:
         assert pd.api.types.is_datetime64_any_dtype(df.index)
 
 
+class TestInSourceFiltering:
+
+    def _node(self, **kwargs):
+        node = BrainFlowSource(device="synthetic", **kwargs)
+        node.o = MagicMock()
+        node.o_filtered = MagicMock()
+        return node
+
+    def test_no_filtered_output_by_default(self, mock_board):
+        node = BrainFlowSource(device="synthetic")
+        node.o = MagicMock()
+        node.update()
+        assert not hasattr(node, "o_filtered")
+
+    def _stream(self, instance, signal, chunk, **kwargs):
+        """Feed a (channels, n) signal to a filtering node, chunk by chunk."""
+        chunks = []
+        for start in range(0, signal.shape[1], chunk):
+            data = np.zeros((31, min(chunk, signal.shape[1] - start)))
+            data[1:17] = signal[:, start:start + chunk]
+            data[30] = 1700000000 + (start + np.arange(data.shape[1])) / 250
+            chunks.append(data)
+        instance.get_board_data.side_effect = chunks
+        node = self._node(**kwargs)
+        outputs = []
+        for _ in chunks:
+            node.update()
+            outputs.append(node.o_filtered.data)
+        return node, pd.concat(outputs)
+
+    def _eeg(self, seconds=20):
+        rng = np.random.default_rng(0)
+        t = np.arange(seconds * 250) / 250
+        alpha = 5 * np.sin(2 * np.pi * 10 * t)
+        return 800 + alpha + 50 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 2, (16, t.size))
+
+    def test_chunked_filtering_matches_one_pass(self, mock_board):
+        MockShim, instance = mock_board
+        eeg = self._eeg()
+        _, chunked = self._stream(instance, eeg, 26, bandpass=[1, 40], notch=50)
+        node, whole = self._stream(instance, eeg, eeg.shape[1], bandpass=[1, 40], notch=50)
+        np.testing.assert_allclose(chunked.values, whole.values, atol=1e-9)
+        assert chunked.index.equals(whole.index)
+        assert node.o_filtered.meta == {"rate": 250}
+
+    def test_dc_offset_and_line_noise_removed(self, mock_board):
+        MockShim, instance = mock_board
+        eeg = self._eeg()
+        _, filtered = self._stream(instance, eeg, 26, bandpass=[1, 40], notch=50)
+        settled = filtered.values[250 * 5:]
+        # The 800 uV offset is gone, and what is left is the 10 Hz rhythm
+        assert abs(settled.mean()) < 0.5
+        assert settled.std() == pytest.approx(5 / np.sqrt(2), rel=0.15)
+
+    def test_detrend_matches_one_pass(self, mock_board):
+        MockShim, instance = mock_board
+        eeg = self._eeg() + np.linspace(0, 300, 20 * 250)
+        for detrend in ("constant", "linear"):
+            _, chunked = self._stream(instance, eeg, 26, detrend=detrend)
+            _, whole = self._stream(instance, eeg, eeg.shape[1], detrend=detrend)
+            np.testing.assert_allclose(chunked.values, whole.values, atol=1e-6)
+        # The fitted line absorbs the drift
+        assert abs(chunked.values[-250:].mean()) < 5
+
+    def test_invalid_notch_raises(self, mock_board):
+        with pytest.raises(ValueError, match="notch"):
+            BrainFlowSource(device="synthetic", notch=55)
+
+
+@pytest.fixture
+def recording(tmp_path, mock_board):
+    """Write a 1000-sample BrainFlow CSV file (synthetic board layout)."""
+    MockShim, instance = mock_board
+    MockShim.get_num_rows.return_value = 31
+    data = np.zeros((1000, 31))
+    data[:, 1] = np.arange(1000)  # first EEG row holds the sample index
+    path = tmp_path / "session.csv"
+    np.savetxt(path, data, delimiter="\t")
+    return str(path)
+
+
+class TestPlayback:
+
+    def _node(self, recording, **kwargs):
+        with patch("nodes.eeg.brainflow_source.time.time", return_value=100.0):
+            node = BrainFlowSource(device="synthetic", playback=recording, **kwargs)
+        node.o = MagicMock()
+        return node
+
+    def _tick(self, node, at):
+        with patch("nodes.eeg.brainflow_source.time.time", return_value=at):
+            node.update()
+
+    def test_no_board_session(self, mock_board, recording):
+        MockShim, instance = mock_board
+        node = self._node(recording)
+        instance.prepare_session.assert_not_called()
+        node.terminate()
+        instance.release_session.assert_not_called()
+
+    def test_real_time_pacing(self, mock_board, recording):
+        node = self._node(recording)
+        self._tick(node, 100.4)
+        df = node.o.data
+        assert df.shape == (100, 16)  # 0.4 s at 250 Hz
+        assert list(df.columns) == CHANNEL_NAMES["synthetic"]
+        np.testing.assert_array_equal(df["Fp1"].values, np.arange(100))
+
+    def test_accelerated_pacing(self, mock_board, recording):
+        node = self._node(recording, speed=4)
+        self._tick(node, 100.4)
+        assert node.o.data.shape == (400, 16)
+
+    def test_as_fast_as_possible(self, mock_board, recording):
+        node = self._node(recording, speed=0, playback_chunk=0.5)
+        self._tick(node, 100.0)
+        self._tick(node, 100.0)
+        assert node.o.data.shape == (125, 16)
+        assert node.o.data["Fp1"].iloc[0] == 125
+
+    def test_stops_at_end_without_loop(self, mock_board, recording):
+        node = self._node(recording, speed=0, playback_chunk=3)
+        self._tick(node, 100.0)
+        assert node.o.data.shape == (750, 16)
+        self._tick(node, 100.0)
+        assert node.o.data.shape == (250, 16)
+        node.o = MagicMock()
+        self._tick(node, 100.0)
+        assert not [c for c in node.o.mock_calls if "data" in str(c)]
+
+    def test_loop_wraps_around(self, mock_board, recording):
+        node = self._node(recording, speed=0, playback_chunk=3, loop=True)
+        self._tick(node, 100.0)
+        self._tick(node, 100.0)
+        values = node.o.data["Fp1"].values
+        np.testing.assert_array_equal(values[:250], np.arange(750, 1000))
+        np.testing.assert_array_equal(values[250:], np.arange(500))
+
+    def test_timestamps_continuous_at_nominal_rate(self, mock_board, recording):
+        node = self._node(recording, speed=0, playback_chunk=0.2)
+        self._tick(node, 100.0)
+        first = node.o.data.index
+        self._tick(node, 100.0)
+        second = node.o.data.index
+        assert first[0] == pd.Timestamp(100.0, unit="s", tz="UTC")
+        assert (second[0] - first[-1]) == pd.Timedelta(milliseconds=4)
+
+    def test_csv_is_cached_as_npy(self, mock_board, recording):
+        self._node(recording)
+        assert os.path.exists(recording + ".npy")
+
+    def test_cache_rebuilt_when_source_changes(self, mock_board, recording):
+        self._node(recording)
+        data = np.zeros((500, 31))
+        data[:, 1] = -1
+        np.savetxt(recording, data, delimiter="\t")
+        # Same modification time as the cache: only the size tells them apart
+        cache = os.stat(recording + ".npy")
+        os.utime(recording, ns=(cache.st_atime_ns, cache.st_mtime_ns))
+        node = self._node(recording, speed=0)
+        assert len(node._playback) == 500
+        self._tick(node, 100.0)
+        assert (node.o.data["Fp1"].values == -1).all()
+
+    def test_cache_rebuilt_for_another_board(self, mock_board, recording):
+        self._node(recording)
+        with patch("nodes.eeg.brainflow_source.np.loadtxt", wraps=np.loadtxt) as loadtxt:
+            self._node(recording)
+            assert loadtxt.call_count == 0
+            BrainFlowSource(device="muse2", playback=recording)
+            assert loadtxt.call_count == 1
+
+    def test_hdf5_session(self, mock_board, tmp_path):
+        pytest.importorskip("tables")
+        MockShim, instance = mock_board
+        MockShim.get_num_rows.return_value = 31
+        names = CHANNEL_NAMES["synthetic"]
+        index = pd.date_range("2024-01-01", periods=500, freq="4ms", tz="UTC")
+        frame = pd.DataFrame(np.tile(np.arange(500.0), (16, 1)).T, index=index, columns=names)
+        path = str(tmp_path / "session.hdf5")
+        frame.to_hdf(path, key="/eeg_raw")
+
+        node = self._node(path, speed=0)
+        self._tick(node, 100.0)
+        assert node.o.data.shape == (250, 16)
+        np.testing.assert_array_equal(node.o.data["Oz"].values, np.arange(250))
+
+
+class TestAuxOutputs:
+
+    def test_unknown_aux_raises(self, mock_board):
+        with pytest.raises(ValueError, match="Unknown aux output"):
+            BrainFlowSource(device="synthetic", aux=["gyro"])
+
+    def test_missing_aux_raises(self, mock_board):
+        MockShim, _ = mock_board
+        MockShim.get_board_presets.return_value = [0]
+        MockShim.get_ppg_channels.side_effect = BrainFlowError
+        with pytest.raises(ValueError, match="no ppg channels"):
+            BrainFlowSource(device="synthetic", aux=["ppg"])
+
+    def test_default_preset_shares_eeg_index(self, mock_board):
+        MockShim, instance = mock_board
+        MockShim.get_board_presets.return_value = [0]
+        MockShim.get_accel_channels.return_value = [17, 18, 19]
+        node = BrainFlowSource(device="synthetic", aux=["accel"])
+        node.o = MagicMock()
+        node.o_accel = MagicMock()
+        node.update()
+        df = node.o_accel.data
+        assert list(df.columns) == ["ACCX", "ACCY", "ACCZ"]
+        np.testing.assert_array_equal(df["ACCY"].values, instance.get_board_data.return_value[18])
+        assert df.index.equals(node.o.data.index)
+        assert node.o_accel.meta == {"rate": 250}
+
+    def test_secondary_preset_has_own_rate_and_timestamps(self, mock_board):
+        MockShim, instance = mock_board
+        MockShim.get_board_presets.return_value = [0, 1, 2]
+
+        def ppg_channels(board_id, preset):
+            if preset != 2:
+                raise BrainFlowError()
+            return [1, 2]
+
+        MockShim.get_ppg_channels.side_effect = ppg_channels
+        MockShim.get_sampling_rate.side_effect = lambda board_id, preset=0: 64 if preset == 2 else 250
+        MockShim.get_timestamp_channel.side_effect = lambda board_id, preset=0: 5 if preset == 2 else 30
+        eeg = instance.get_board_data.return_value
+        ppg = np.zeros((6, 10))
+        ppg[1] = np.arange(10)
+        ppg[5] = 1700000000 + np.arange(10) / 64
+        instance.get_board_data.side_effect = lambda preset=0: ppg if preset == 2 else eeg
+
+        node = BrainFlowSource(device="synthetic", aux=["ppg"])
+        node.o = MagicMock()
+        node.o_ppg = MagicMock()
+        node.update()
+        df = node.o_ppg.data
+        assert df.shape == (10, 2)
+        assert list(df.columns) == ["PPG1", "PPG2"]
+        np.testing.assert_array_equal(df["PPG1"].values, np.arange(10))
+        assert df.index[0] == pd.Timestamp(1700000000, unit="s", tz="UTC")
+        assert node.o_ppg.meta == {"rate": 64}
+
+    def test_secondary_preset_rejected_in_playback(self, mock_board, recording):
+        MockShim, _ = mock_board
+        MockShim.get_board_presets.return_value = [0, 1]
+        MockShim.get_accel_channels.side_effect = lambda board_id, preset: [1, 2, 3] if preset else []
+        with pytest.raises(ValueError, match="playback"):
+            BrainFlowSource(device="synthetic", playback=recording, aux=["accel"])
+
+
+def _board_data(offset, value, n=100):
+    """Synthetic board chunk: EEG rows hold `value`, timestamps start at `offset`."""
+    data = np.full((31, n), float(value))
+    data[30, :] = 1700000000 + offset + np.arange(n) / 250
+    return data
+
+
+class TestMultiBrainFlowSource:
+
+    def _node(self, mock_board, chunks, **kwargs):
+        """Build a two-board node whose readers receive the given chunks."""
+        MockShim, _ = mock_board
+        MockShim.get_num_rows.return_value = 31
+        boards = [MagicMock(), MagicMock()]
+        for board, data in zip(boards, chunks):
+            board.get_board_data.return_value = data
+        MockShim.side_effect = boards
+        node = MultiBrainFlowSource(
+            boards=[{"name": "alice"}, {"name": "bob"}], poll_interval=60, **kwargs
+        )
+        for board in node._boards:
+            board["reader"].stop()
+            board["reader"].buffer.read()
+        node.o = MagicMock()
+        node.logger = MagicMock()
+        return node, boards
+
+    def _poll(self, node):
+        for board in node._boards:
+            board["reader"].poll()
+
+    def test_requires_unique_names(self, mock_board):
+        with pytest.raises(ValueError, match="unique"):
+            MultiBrainFlowSource(boards=[{"name": "a"}, {"name": "a"}])
+
+    def test_combined_frame_has_namespaced_channels(self, mock_board):
+        node, _ = self._node(mock_board, [_board_data(0, 1), _board_data(0, 2)])
+        self._poll(node)
+        node.update()
+        df = node.o.data
+        assert df.shape == (100, 32)
+        assert df.columns[0] == "alice_Fp1"
+        assert df.columns[16] == "bob_Fp1"
+        assert (df.filter(like="alice_").values == 1).all()
+        assert (df.filter(like="bob_").values == 2).all()
+        assert node.o.meta == {"rate": 250}
+
+    def test_combined_waits_for_slowest_board(self, mock_board):
+        # Bob started 0.2 s (50 samples) after Alice
+        node, _ = self._node(mock_board, [_board_data(0, 1), _board_data(0.2, 2)])
+        self._poll(node)
+        node.update()
+        df = node.o.data
+        # Grid starts when both boards stream and stops at the earliest end
+        assert len(df) == 50
+        assert not df.isna().any().any()
+
+    def test_microsecond_index(self, mock_board):
+        node, _ = self._node(mock_board, [_board_data(0, 1), _board_data(0.2, 2)])
+        reference, _ = self._node(mock_board, [_board_data(0, 1), _board_data(0.2, 2)])
+        for board in node._boards:
+            timestamps = board["clock"].timestamps
+            board["clock"].timestamps = lambda *args, t=timestamps: t(*args).as_unit("us")
+        for n in (node, reference):
+            self._poll(n)
+            n.update()
+        assert len(node.o.data) == 50
+        pd.testing.assert_frame_equal(node.o.data, reference.o.data)
+
+    def test_late_board_filled_with_nan_after_max_delay(self, mock_board):
+        node, boards = self._node(
+            mock_board, [_board_data(0, 1, n=500), np.empty((31, 0))], max_delay=1
+        )
+        self._poll(node)
+        node.update()
+        df = node.o.data
+        assert len(df) == 250  # 2 s received, minus 1 s of tolerated delay
+        assert df.filter(like="bob_").isna().all().all()
+
+    def test_separate_ports(self, mock_board):
+        node, _ = self._node(
+            mock_board, [_board_data(0, 1), _board_data(0.2, 2, n=40)], combine=False
+        )
+        node.o_alice = MagicMock()
+        node.o_bob = MagicMock()
+        self._poll(node)
+        node.update()
+        assert node.o_alice.data.shape == (100, 16)
+        assert node.o_bob.data.shape == (40, 16)
+        assert list(node.o_bob.data.columns) == CHANNEL_NAMES["synthetic"]
+
+    def test_terminate_releases_all_boards(self, mock_board):
+        node, boards = self._node(mock_board, [_board_data(0, 1), _board_data(0, 2)])
+        node.terminate()
+        for board in boards:
+            board.release_session.assert_called_once()
+
+
+class TestAlign:
+
+    def test_nearest_sample(self):
+        stamps = np.array([0, 10, 20, 30], dtype=np.int64)
+        values = np.array([[0.0, 1.0, 2.0, 3.0]])
+        grid = np.array([4, 6, 29], dtype=np.int64)
+        np.testing.assert_array_equal(_align(grid, stamps, values, 5), [[0.0, 1.0, 3.0]])
+
+    def test_out_of_tolerance_is_nan(self):
+        stamps = np.array([0, 10], dtype=np.int64)
+        values = np.array([[0.0, 1.0]])
+        grid = np.array([10, 40], dtype=np.int64)
+        out = _align(grid, stamps, values, 5)
+        assert out[0, 0] == 1.0
+        assert np.isnan(out[0, 1])
+
+
 class TestBoardMap:
 
     def test_all_channel_names_have_board_map_entry(self):
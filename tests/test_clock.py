@@ -0,0 +1,63 @@
+"""Tests for the sample-counter clock model."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nodes.common.clock import ClockModel
+
+
+T0 = 1700000000.0
+
+
+class TestClockModel:
+
+    def test_requires_observation(self):
+        clock = ClockModel(rate=250)
+        with pytest.raises(RuntimeError):
+            clock.timestamps(0, 10)
+
+    def test_nominal_period_before_warmup(self):
+        clock = ClockModel(rate=250)
+        clock.observe(0, T0)
+        stamps = clock.timestamps(0, 5)
+        assert (np.diff(stamps.asi8) == 4_000_000).all()
+        assert stamps[0] == pd.Timestamp(T0, unit="s", tz="UTC")
+
+    def test_fits_true_rate_through_jitter(self):
+        """Jittery host times should be smoothed back to the true device rate."""
+        rng = np.random.default_rng(0)
+        clock = ClockModel(rate=250)
+        true_rate = 249.5  # device clock slightly off its nominal rate
+        for k in range(200):
+            idx = np.arange(k * 25, (k + 1) * 25)
+            clock.observe(idx, T0 + idx / true_rate + rng.uniform(0, 0.02, 25))
+        assert 1 / clock.period == pytest.approx(true_rate, rel=1e-3)
+
+    def test_timestamps_evenly_spaced_and_monotonic(self):
+        rng = np.random.default_rng(1)
+        clock = ClockModel(rate=100)
+        previous = None
+        for k in range(100):
+            clock.observe(k * 10 + 9, T0 + (k * 10 + 9) / 100 + rng.uniform(0, 0.05))
+            stamps = clock.timestamps(k * 10, 10).asi8
+            deltas = np.diff(stamps)
+            assert deltas.min() > 0
+            assert deltas.max() - deltas.min() <= 1  # nanosecond rounding
+            if previous is not None:
+                assert stamps[0] > previous[-1]
+            previous = stamps
+
+    def test_period_is_bounded(self):
+        clock = ClockModel(rate=100, tolerance=0.1)
+        clock.observe(np.arange(200), T0 + np.arange(200) / 50)  # twice too slow
+        assert clock.period == pytest.approx(0.011)
+
+    def test_monotonic_when_fit_moves_backwards(self):
+        clock = ClockModel(rate=10)
+        clock.observe(0, T0)
+        first = clock.timestamps(0, 10)
+        # A late observation pulls the fit behind what was already emitted
+        clock.observe(10, T0 - 5)
+        second = clock.timestamps(0, 10)
+        assert second[0] > first[-1]
@@ -0,0 +1,108 @@
+"""Tests for the streaming ECG R-peak detector."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from nodes.physio.ecg import RPeakDetector
+
+RATE = 100
+
+
+def _ecg(beats, duration, rate=RATE, seed=0):
+    """Synthetic ECG: narrow QRS spikes, broad T waves, baseline wander and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * rate)) / rate
+    x = 0.1 * np.sin(2 * np.pi * 0.3 * t) + rng.normal(0, 0.02, t.size)
+    for beat in beats:
+        x += np.exp(-0.5 * ((t - beat) / 0.012) ** 2)
+        x += 0.3 * np.exp(-0.5 * ((t - beat - 0.25) / 0.05) ** 2)
+    index = pd.to_datetime(1700000000 + t, unit="s", utc=True)
+    return pd.DataFrame({"A1_ECG": x}, index=index)
+
+
+def _beats(duration, mean=0.8, seed=1):
+    rng = np.random.default_rng(seed)
+    rr = mean + rng.normal(0, 0.05, int(duration / mean) + 2)
+    beats = 0.5 + np.cumsum(rr)
+    return beats[beats < duration - 0.5]
+
+
+def _seconds(out):
+    return out.index.asi8 / 1e9 - 1700000000
+
+
+def _run(frame, chunk, **kwargs):
+    node = RPeakDetector(**kwargs)
+    node.i = MagicMock()
+    node.i.meta = {"rate": RATE}
+    outputs = []
+    for start in range(0, len(frame), chunk):
+        node.i.ready.return_value = True
+        node.i.data = frame.iloc[start:start + chunk]
+        node.o = MagicMock()
+        node.o.data = None
+        node.update()
+        if isinstance(node.o.data, pd.DataFrame):
+            outputs.append(node.o.data)
+    return pd.concat(outputs) if outputs else pd.DataFrame(columns=["rr"])
+
+
+class TestRPeakDetector:
+
+    def test_detects_every_beat_after_learning(self):
+        beats = _beats(60)
+        detected = _seconds(_run(_ecg(beats, 60), chunk=10))
+        # Beats at the very end of the 2 s learning phase may or may not be kept
+        assert detected.min() > 1.8
+        expected = beats[beats > 2.5]
+        detected = detected[detected > 2.5]
+        assert len(detected) == len(expected)
+        np.testing.assert_allclose(detected, expected, atol=0.01)
+
+    def test_rr_intervals_in_milliseconds(self):
+        beats = _beats(30)
+        out = _run(_ecg(beats, 30), chunk=25)
+        assert np.isnan(out["rr"].iloc[0])
+        expected = np.diff(beats[beats > _seconds(out)[0] - 0.05]) * 1000
+        np.testing.assert_allclose(out["rr"].values[1:], expected, atol=20)
+
+    def test_chunking_does_not_change_result(self):
+        frame = _ecg(_beats(30), 30)
+        one = _run(frame, chunk=len(frame))
+        small = _run(frame, chunk=7)
+        assert one.index.equals(small.index)
+
+    def test_t_waves_are_not_counted(self):
+        # 40 bpm leaves plenty of room for the T wave outside the refractory period
+        beats = _beats(30, mean=1.5)
+        detected = _seconds(_run(_ecg(beats, 30), chunk=10))
+        assert (detected > 2.5).sum() == (beats > 2.5).sum()
+
+    def test_microsecond_index(self):
+        beats = _beats(30)
+        frame = _ecg(beats, 30)
+        frame.index = frame.index.as_unit("us")
+        out = _run(frame, chunk=10)
+        reference = frame.copy()
+        reference.index = reference.index.as_unit("ns")
+        expected = _run(reference, chunk=10)
+        assert out.index.equals(expected.index)
+        np.testing.assert_allclose(out["rr"].values[1:], expected["rr"].values[1:])
+
+    def test_rate_from_params(self):
+        node = RPeakDetector(rate=RATE)
+        node.i = MagicMock()
+        node.i.meta = None
+        node.i.data = _ecg([1.0], 3)
+        node.update()
+        assert node._ready
+
+    def test_missing_rate_raises(self):
+        node = RPeakDetector()
+        node.i = MagicMock()
+        node.i.meta = {}
+        node.i.data = _ecg([1.0], 3)
+        with pytest.raises(ValueError, match="rate"):
+            node.update()
@@ -1,12 +1,51 @@
 """Tests for the realistic EEG simulator node."""
 
+import json
 import numpy as np
 import pandas as pd
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from scipy.signal import welch
 
-from nodes.eeg.simulator import EEGSimulator, DEFAULT_CHANNELS
+from nodes.eeg.simulator import (
+    EEGSimulator, DEFAULT_CHANNELS, _BANDS, _REGION_WEIGHTS, _EventInjector, _region_for_channel,
+)
+
+
+def _reference_chunks(channels, rate, n, chunks, alpha_amp=15.0, noise_amp=30.0,
+                      drift=0.02, seed=42):
+    """Per-channel, per-sample loop reproducing the original generator."""
+    rng = np.random.default_rng(seed=seed)
+    phases = {}
+    for ch in channels:
+        phases[ch] = {}
+        for band, (flo, fhi) in _BANDS.items():
+            center = (flo + fhi) / 2 + rng.uniform(-0.5, 0.5)
+            phases[ch][band] = {"freq": center, "phase": rng.uniform(0, 2 * np.pi)}
+    weights = np.array([_REGION_WEIGHTS[_region_for_channel(ch)] for ch in channels])
+    state_phase = rng.uniform(0, 2 * np.pi, size=5)
+    pink = np.zeros(len(channels))
+    dt = 1.0 / rate
+    for k in range(chunks):
+        t = k * n * dt + np.arange(n) * dt
+        state_mod = np.zeros(5)
+        for b in range(5):
+            state_phase[b] += dt * n * drift * (0.5 + 0.5 * b)
+            state_mod[b] = 0.5 + 0.5 * np.sin(state_phase[b])
+        out = np.zeros((len(channels), n))
+        for c, ch in enumerate(channels):
+            for b, band in enumerate(_BANDS):
+                info = phases[ch][band]
+                amp = (alpha_amp if band == "alpha" else alpha_amp * 0.4) * weights[c, b] * state_mod[b]
+                out[c] += amp * np.sin(2 * np.pi * info["freq"] * t + info["phase"])
+                info["phase"] += 2 * np.pi * info["freq"] * n * dt
+        noise = np.empty((len(channels), n))
+        for i in range(n):
+            pink = 0.98 * pink + rng.standard_normal(len(channels))
+            noise[:, i] = pink
+        out += noise / noise.std(axis=1, keepdims=True) * noise_amp
+        out += rng.standard_normal((len(channels), n)) * 2.0
+        yield out.T
 
 
 class TestEEGSimulator:
@@ -28,6 +67,16 @@ class TestEEGSimulator:
         df = self.sim.o.data
         assert list(df.columns) == DEFAULT_CHANNELS
 
+    def test_chunks_are_contiguous(self):
+        """Consecutive chunks should continue the same evenly spaced time grid."""
+        self.sim.update()
+        first = self.sim.o.data.index
+        self.sim.update()
+        second = self.sim.o.data.index
+        step = first[1] - first[0]
+        assert abs(step - pd.Timedelta(milliseconds=4)) < pd.Timedelta(microseconds=1)
+        assert abs((second[0] - first[-1]) - step) < pd.Timedelta(microseconds=1)
+
     def test_no_nans(self):
         """Signal should never contain NaN."""
         for _ in range(100):
@@ -101,6 +150,23 @@ class TestEEGSimulator:
         df2 = sim2.o.data
         np.testing.assert_array_almost_equal(df1.values, df2.values, decimal=10)
 
+    def test_matches_per_sample_reference(self):
+        """Vectorized generation reproduces the per-sample loop for a given seed."""
+        channels = ["Fp1", "C3", "O2"]
+        sim = EEGSimulator(channels=channels, rate=500, chunk_duration=0.04, seed=3)
+        sim.o = MagicMock()
+        for expected in _reference_chunks(channels, 500, 20, 30, seed=3):
+            sim.update()
+            np.testing.assert_allclose(sim.o.data.values, expected, rtol=0, atol=1e-9)
+
+    def test_many_channels_high_rate(self):
+        channels = [f"C{i}" for i in range(256)]
+        sim = EEGSimulator(channels=channels, rate=2000, chunk_duration=0.1)
+        sim.o = MagicMock()
+        sim.update()
+        assert sim.o.data.shape == (200, 256)
+        assert sim.o.meta == {"rate": 2000}
+
     def test_metrics_vary_over_time(self):
         """Band ratios should change over time (not constant like white noise)."""
         ratios = []
@@ -120,3 +186,184 @@ class TestEEGSimulator:
         # The ratios should vary (std > 0.05) thanks to drift
         if len(ratios) > 10:
             assert np.std(ratios) > 0.01, "Band ratios should vary over time"
+
+
+class TestLoadMode:
+
+    def test_speed_multiplies_samples_per_tick(self):
+        sim = EEGSimulator(rate=250, chunk_duration=0.1, speed=10)
+        sim.o = MagicMock()
+        sim.update()
+        assert sim.o.data.shape == (250, 14)
+
+    def test_virtual_timeline_ignores_host_clock(self):
+        sim = EEGSimulator(rate=250, chunk_duration=0.1, speed=20)
+        sim.o = MagicMock()
+        with patch("nodes.eeg.simulator.time.time", side_effect=[1700000000.0, 1700000000.1, 1700000000.2]):
+            sim.update()
+            first = sim.o.data.index
+            sim.update()
+            second = sim.o.data.index
+        index = first.append(second)
+        assert len(index) == 1000
+        assert np.ptp(np.diff(index.asi8)) == 0
+        # 4 s of signal emitted within two ticks
+        assert (index[-1] - index[0]) == pd.Timedelta(milliseconds=4 * 999)
+
+    def test_subjects_on_separate_ports(self):
+        sim = EEGSimulator(subjects=3)
+        for i in range(3):
+            setattr(sim, f"o_subject_{i}", MagicMock())
+        sim.update()
+        frames = [getattr(sim, f"o_subject_{i}").data for i in range(3)]
+        assert all(frame.shape == (25, 14) for frame in frames)
+        assert frames[0].index.equals(frames[1].index)
+        assert not np.allclose(frames[0].values, frames[1].values)
+
+    def test_subject_seeds_are_offset(self):
+        single = EEGSimulator(seed=43)
+        single.o = MagicMock()
+        multi = EEGSimulator(seed=42, subjects=["alice", "bob"])
+        multi.o_alice = MagicMock()
+        multi.o_bob = MagicMock()
+        single.update()
+        multi.update()
+        np.testing.assert_array_equal(multi.o_bob.data.values, single.o.data.values)
+
+    @pytest.mark.parametrize("speed", [0, -2])
+    def test_non_positive_speed_raises(self, speed):
+        with pytest.raises(ValueError, match="positive"):
+            EEGSimulator(speed=speed)
+
+    def test_duplicate_subject_names_raise(self):
+        with pytest.raises(ValueError, match="unique"):
+            EEGSimulator(subjects=["a", "a"])
+
+
+class TestWavetableMode:
+
+    def test_loops_over_generated_bank(self, tmp_path):
+        path = str(tmp_path / "eeg.npy")
+        sim = EEGSimulator(rate=250, chunk_duration=0.1, wavetable=path, wavetable_duration=1)
+        sim.o = MagicMock()
+        chunks = []
+        for _ in range(20):
+            sim.update()
+            chunks.append(sim.o.data.values)
+        data = np.concatenate(chunks)
+        bank = np.load(path)
+        assert bank.shape[1] == 14
+        np.testing.assert_array_equal(data[:len(bank)], bank)
+        np.testing.assert_array_equal(data[len(bank):2 * len(bank)], bank)
+
+    def test_bank_matches_live_signal_statistics(self, tmp_path):
+        sim = EEGSimulator(wavetable=str(tmp_path / "eeg.npy"), wavetable_duration=2)
+        sim.o = MagicMock()
+        sim.update()
+        assert sim.o.data.shape == (25, 14)
+        assert 5 < sim.o.data.values.std() < 100
+
+    def test_subjects_read_from_offsets(self, tmp_path):
+        sim = EEGSimulator(subjects=2, wavetable=str(tmp_path / "eeg.npy"), wavetable_duration=2)
+        sim.o_subject_0 = MagicMock()
+        sim.o_subject_1 = MagicMock()
+        sim.update()
+        bank = np.load(str(tmp_path / "eeg.npy"))
+        np.testing.assert_array_equal(sim.o_subject_1.data.values, bank[len(bank) // 2:][:25])
+
+    def test_bank_rebuilt_when_parameters_change(self, tmp_path):
+        path = str(tmp_path / "eeg.npy")
+        EEGSimulator(wavetable=path, wavetable_duration=1)
+        sim = EEGSimulator(channels=["Cz"], wavetable=path, wavetable_duration=1)
+        assert sim._generators[0].channels == 1
+        quiet = np.load(path)
+        EEGSimulator(channels=["Cz"], wavetable=path, wavetable_duration=1, alpha_amplitude=0,
+                     noise_amplitude=0)
+        assert np.abs(np.load(path)).max() < np.abs(quiet).max()
+
+    def test_bank_reused_with_same_parameters(self, tmp_path):
+        path = str(tmp_path / "eeg.npy")
+        EEGSimulator(wavetable=path, wavetable_duration=1)
+        with patch("nodes.eeg.simulator.EEGGenerator") as generator:
+            EEGSimulator(wavetable=path, wavetable_duration=1)
+        generator.assert_not_called()
+
+class TestEventInjection:
+
+    def _run(self, ticks, **kwargs):
+        # Virtual clock: onsets map to exact sample positions
+        sim = EEGSimulator(rate=250, chunk_duration=0.1, speed=1, **kwargs)
+        sim.o = MagicMock()
+        sim.o_events = MagicMock()
+        chunks, events = [], []
+        for _ in range(ticks):
+            sim.o_events.data = None
+            sim.update()
+            chunks.append(sim.o.data)
+            if sim.o_events.data is not None:
+                events.append(sim.o_events.data)
+        return pd.concat(chunks), (pd.concat(events) if events else None)
+
+    def test_left_imagery_attenuates_right_hemisphere(self):
+        events = {"interval": 2, "classes": ["left"], "erd": 0.9, "erd_duration": 4}
+        base, _ = self._run(60, noise_amplitude=5)
+        data, truth = self._run(60, noise_amplitude=5, events=events)
+        onset = data.index.get_loc(truth.index[0])
+        assert onset == 500
+        # ERD plateau of the first trial, 0.5 s .. 3.5 s after onset
+        plateau = slice(onset + 125, onset + 875)
+        _, psd_base = welch(base["C2"].values[plateau], fs=250, nperseg=250)
+        _, psd = welch(data["C2"].values[plateau], fs=250, nperseg=250)
+        assert psd[8:13].sum() < 0.5 * psd_base[8:13].sum()
+        # Ipsilateral and non-motor channels are untouched
+        np.testing.assert_allclose(data["C1"].values, base["C1"].values)
+        np.testing.assert_allclose(data["O1"].values, base["O1"].values)
+
+    def test_blink_raises_frontal_channels(self):
+        events = {"interval": 1, "classes": ["blink"], "blink_amplitude": 200}
+        data, truth = self._run(20, events=events)
+        clean, _ = self._run(20)
+        diff = data.values - clean.values
+        fp1, f3, o1 = (DEFAULT_CHANNELS.index(ch) for ch in ("Fp1", "F3", "O1"))
+        assert diff[:, fp1].max() == pytest.approx(200, rel=0.01)
+        assert 0 < diff[:, f3].max() < diff[:, fp1].max()
+        assert np.allclose(diff[:, o1], 0)
+        # The deflection starts at the announced onset
+        assert np.flatnonzero(diff[:, fp1] > 1e-9)[0] == data.index.get_loc(truth.index[0]) + 1
+
+    def test_blink_weights_follow_10_20_prefixes(self):
+        channels = ["Fp1", "Fpz", "AF3", "Fz", "F3", "FC3", "FT7", "Cz", "O1"]
+        injector = _EventInjector(channels, 250, 42, classes=["blink"])
+        np.testing.assert_array_equal(
+            injector._blink_weights, [1.0, 1.0, 0.7, 0.4, 0.4, 0.2, 0.2, 0.0, 0.0]
+        )
+
+    def test_ground_truth_format(self):
+        _, truth = self._run(60, events={"interval": 1})
+        assert len(truth) == 5
+        assert set(truth["label"]) <= {"trial_begins", "stim"}
+        for label, data in zip(truth["label"], truth["data"]):
+            payload = json.loads(data)
+            if label == "trial_begins":
+                assert (payload["id"], payload["message"]) in [(0, "LEFT"), (1, "RIGHT")]
+            else:
+                assert payload == {"status": True}
+        assert np.allclose(np.diff(truth.index.asi8) / 1e9, 1.0)
+
+    def test_schedule_is_deterministic(self):
+        _, first = self._run(60, events={"interval": 0.5})
+        _, second = self._run(60, events={"interval": 0.5})
+        assert list(first["data"]) == list(second["data"])
+        assert len(set(first["data"])) == 3
+
+    def test_unknown_class_raises(self):
+        with pytest.raises(ValueError, match="Unknown event class"):
+            EEGSimulator(events={"classes": ["jaw"]})
+
+    def test_motor_events_need_central_channels(self):
+        with pytest.raises(ValueError, match="sensorimotor"):
+            EEGSimulator(channels=["Fp1", "O1"], events={"classes": ["left"]})
+
+    def test_wavetable_mode_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="wavetable"):
+            EEGSimulator(wavetable=str(tmp_path / "eeg.npy"), events={})
@@ -0,0 +1,116 @@
+"""Tests for the batched EmotiBit OSC receiver.
+
+Packets are built with python-osc and fed either directly to the parser or
+over a local UDP socket.
+"""
+
+import socket
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+pytest.importorskip("pythonosc")
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+
+from nodes.physio.emotibit import EmotiBitReceiver
+
+
+def _message(address, values):
+    builder = OscMessageBuilder(address=address)
+    for value in values:
+        builder.add_arg(float(value))
+    return builder.build()
+
+
+def _bundle(*messages):
+    builder = OscBundleBuilder(IMMEDIATELY)
+    for message in messages:
+        builder.add_content(message)
+    return builder.build()
+
+
+@pytest.fixture
+def node():
+    node = EmotiBitReceiver(ip="127.0.0.1", port=0)
+    for name in ("ppg", "hr", "eda", "temperature"):
+        setattr(node, f"o_{name}", MagicMock())
+    node.logger = MagicMock()
+    yield node
+    node.terminate()
+
+
+class TestEmotiBitReceiver:
+
+    def test_messages_assembled_into_one_chunk(self, node):
+        for i in range(5):
+            node.receive(_message("/EmotiBit/0/PPG_RED", range(i * 4, i * 4 + 4)).dgram,
+                         1700000000 + i * 4 / 25)
+        node.update()
+        df = node.o_ppg.data
+        assert list(df.columns) == ["0"]
+        np.testing.assert_array_equal(df["0"].values, np.arange(20))
+        assert node.o_ppg.meta == {"rate": 25}
+
+    def test_bundles_fan_out_to_streams(self, node):
+        bundle = _bundle(
+            _message("/EmotiBit/0/PPG_RED", [1, 2, 3]),
+            _message("/EmotiBit/0/EDA", [0.5, 0.6]),
+            _message("/EmotiBit/0/Unknown", [9]),
+        )
+        node.receive(bundle.dgram, 1700000000.0)
+        node.update()
+        assert len(node.o_ppg.data) == 3
+        np.testing.assert_allclose(node.o_eda.data["0"].values, [0.5, 0.6], rtol=1e-6)  # OSC float32
+        assert not isinstance(node.o_temperature.data, pd.DataFrame)
+
+    def test_chunks_are_contiguous(self, node):
+        chunks = []
+        for i in range(10):
+            node.receive(_message("/EmotiBit/0/PPG_RED", [0] * 5).dgram,
+                         1700000000 + (i + 1) * 5 / 25 + 0.003 * (i % 3))
+            if i % 4 == 3:
+                node.update()
+                chunks.append(node.o_ppg.data.index)
+        node.update()
+        chunks.append(node.o_ppg.data.index)
+        index = chunks[0].append(chunks[1:])
+        assert len(index) == 50
+        # Jitter is absorbed by the clock model: no gap or overlap at chunk edges
+        np.testing.assert_allclose(np.diff(index.asi8), 40e6, rtol=0.1)
+
+    def test_irregular_stream_uses_arrival_time(self, node):
+        node.receive(_message("/EmotiBit/0/HR", [72]).dgram, 1700000000.5)
+        node.update()
+        df = node.o_hr.data
+        assert df.index[0] == pd.Timestamp(1700000000.5, unit="s", tz="UTC")
+        assert df["0"].iloc[0] == 72
+
+    def test_garbage_is_ignored(self, node):
+        node.receive(b"not an osc packet", 0.0)
+        node.update()
+        assert not isinstance(node.o_ppg.data, pd.DataFrame)
+
+    def test_overflow_is_reported(self):
+        node = EmotiBitReceiver(ip="127.0.0.1", port=0, buffer_duration=1,
+                                streams={"ppg": {"address": "/ppg", "rate": 25}})
+        node.o_ppg = MagicMock()
+        node.logger = MagicMock()
+        node.receive(_message("/ppg", range(30)).dgram, 1700000000.0)
+        node.update()
+        node.terminate()
+        node.logger.warning.assert_called_once()
+        assert len(node.o_ppg.data) == 25
+
+    def test_receives_over_udp(self, node):
+        address = node._socket.getsockname()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.sendto(_message("/EmotiBit/0/TEMP", [31.5, 31.6]).dgram, address)
+        sender.close()
+        deadline = time.time() + 2
+        while len(node._streams["temperature"]["buffer"]) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        node.update()
+        np.testing.assert_allclose(node.o_temperature.data["0"].values, [31.5, 31.6], rtol=1e-6)
@@ -1,7 +1,11 @@
-"""Tests for HRV-based metric nodes (ArousalMetric, AttentionMetric, CognitiveLoadMetric, StressMetric)."""
+"""Tests for HRV-based metric nodes (ArousalMetric, AttentionMetric, CognitiveLoadMetric, StressMetric, HRVMetrics)."""
 
 import numpy as np
+import pandas as pd
 import pytest
+from unittest.mock import MagicMock
+
+from nodes.physio.ppg import HRVMetrics
 
 
 class TestHRVNormalization:
@@ -91,3 +95,85 @@ class TestCognitiveLoadMetricWeights:
     def test_default_weights(self):
         weights = {'HRV_SDNN': 0.5, 'HRV_RMSSD': 0.5}
         assert sum(weights.values()) == 1.0
+
+
+class TestHRVMetrics:
+
+    def _run(self, rows, **kwargs):
+        node = HRVMetrics(**kwargs)
+        node.i = MagicMock()
+        node.o = MagicMock()
+        for name in node._metrics:
+            setattr(node, f"o_{name}", MagicMock())
+        index = pd.date_range("2024-01-01", periods=len(rows), freq="1s", tz="UTC")
+        node.i.data = pd.DataFrame(rows, index=index)
+        node.update()
+        return node
+
+    def _reference(self, row):
+        """Scalar formulas of the single-metric nodes, with the PPG graph weights."""
+        inv = lambda v, lo, hi: max(min(1 - (v - lo) / (hi - lo), 1), 0)
+        dir_ = lambda v, lo, hi: max(min((v - lo) / (hi - lo), 1), 0)
+        return {
+            "PPG_Arousal_Metric": 0.34 * inv(row["HRV_MeanNN"], 50, 120)
+            + 0.33 * inv(row["HRV_RMSSD"], 20, 100) + 0.33 * inv(row["HRV_SDSD"], 20, 100),
+            "PPG_Attention_Metric": 0.40 * inv(row["HRV_RMSSD"], 20, 100)
+            + 0.30 * inv(row["HRV_SDNN"], 20, 100) + 0.30 * dir_(row["HRV_pNN50"], 0, 20),
+            "PPG_Cognitive_Load_Metric": 0.5 * inv(row["HRV_SDNN"], 30, 140)
+            + 0.5 * inv(row["HRV_RMSSD"], 20, 100),
+            "PPG_Stress_Metric": 0.33 * inv(row["HRV_SDNN"], 30, 140)
+            + 0.33 * inv(row["HRV_RMSSD"], 20, 100) + 0.34 * dir_(row["HRV_pNN50"], 0, 20),
+        }
+
+    def test_matches_scalar_formulas(self):
+        rng = np.random.default_rng(0)
+        rows = [
+            {"HRV_MeanNN": m, "HRV_SDNN": s, "HRV_RMSSD": r, "HRV_SDSD": d, "HRV_pNN50": p}
+            for m, s, r, d, p in zip(rng.uniform(30, 150, 20), rng.uniform(10, 160, 20),
+                                     rng.uniform(10, 120, 20), rng.uniform(10, 120, 20),
+                                     rng.uniform(-5, 30, 20))
+        ]
+        node = self._run(rows)
+        for (_, out), row in zip(node.o.data.iterrows(), rows):
+            for name, value in self._reference(row).items():
+                assert out[name] == pytest.approx(value)
+
+    def test_per_metric_ports(self):
+        row = {"HRV_MeanNN": 80, "HRV_SDNN": 50, "HRV_RMSSD": 40, "HRV_SDSD": 40, "HRV_pNN50": 5}
+        node = self._run([row])
+        assert list(node.o_PPG_Stress_Metric.data.columns) == ["PPG_Stress_Metric"]
+        assert node.o_PPG_Stress_Metric.data.index.equals(node.o.data.index)
+
+    def test_source_prefix(self):
+        row = {"HRV_MeanNN": 80, "HRV_SDNN": 50, "HRV_RMSSD": 40, "HRV_SDSD": 40, "HRV_pNN50": 5}
+        ppg = self._run([row])
+        ecg = self._run([row], source="ECG")
+        assert list(ecg.o.data.columns) == [name.replace("PPG_", "ECG_") for name in ppg.o.data.columns]
+        np.testing.assert_array_equal(ecg.o.data.values, ppg.o.data.values)
+        assert list(ecg.o_ECG_Stress_Metric.data.columns) == ["ECG_Stress_Metric"]
+
+    def test_missing_features(self):
+        node = self._run([{"HRV_SDNN": 30, "HRV_RMSSD": 20}],
+                         metrics={"load": {"HRV_SDNN": [0.5, 140, 30], "HRV_RMSSD": [0.5, 100, 20]},
+                                  "calm": {"HRV_pNN50": [1, 0, 20]}})
+        assert node.o.data["load"].iloc[0] == pytest.approx(1.0)
+        # A metric only depends on its own features
+        assert np.isnan(node.o.data["calm"].iloc[0])
+
+    def test_equal_bounds_raise(self):
+        with pytest.raises(ValueError, match="equal bounds"):
+            HRVMetrics(metrics={"bad": {"HRV_SDNN": [1, 50, 50]}})
+
+    def test_several_devices(self):
+        rows = [
+            {"HRV_MeanNN": 80, "HRV_SDNN": 50, "HRV_RMSSD": 40, "HRV_SDSD": 40, "HRV_pNN50": 5},
+            {"HRV_MeanNN": 60, "HRV_SDNN": 120, "HRV_RMSSD": 90, "HRV_SDSD": 85, "HRV_pNN50": 18},
+        ]
+        wide = {f"{device}_{name}": value
+                for device, row in zip(["p0", "p1"], rows) for name, value in row.items()}
+        node = self._run([wide])
+        for device, row in zip(["p0", "p1"], rows):
+            for name, value in self._reference(row).items():
+                assert node.o.data[f"{device}_{name}"].iloc[0] == pytest.approx(value)
+        assert list(node.o_PPG_Stress_Metric.data.columns) == ["p0_PPG_Stress_Metric",
+                                                               "p1_PPG_Stress_Metric"]
@@ -0,0 +1,117 @@
+"""Tests for the LSL outlet node.
+
+StreamInfo and StreamOutlet are patched, so no LSL network is required.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from nodes.output.lsl import Outlet
+
+
+def _port(frame, meta=None):
+    port = MagicMock()
+    port.ready.return_value = frame is not None
+    port.data = frame
+    port.meta = meta
+    return port
+
+
+def _frame(n=10, columns=("Fp1", "Fp2"), start=1700000000.0):
+    index = pd.to_datetime(start + np.arange(n) / 250, unit="s", utc=True)
+    data = np.arange(n * len(columns), dtype=np.float64).reshape(n, len(columns))
+    return pd.DataFrame(data, index=index, columns=list(columns))
+
+
+@pytest.fixture
+def lsl():
+    with patch("nodes.output.lsl.StreamInfo") as info, \
+         patch("nodes.output.lsl.StreamOutlet") as outlet, \
+         patch("nodes.output.lsl.local_clock", return_value=100.0), \
+         patch("nodes.output.lsl.time.time", return_value=1700000000.0):
+        yield info, outlet
+
+
+def _node(ports, **kwargs):
+    node = Outlet(**kwargs)
+    node.logger = MagicMock()
+    node.iterate = lambda pattern: [(f"i_{name}", name, port) for name, port in ports.items()]
+    return node
+
+
+class TestOutlet:
+
+    def test_outlet_created_from_first_frame(self, lsl):
+        info, outlet = lsl
+        port = _port(_frame(), {"rate": 250})
+        node = _node({"eeg_filtered": port}, types={"eeg_filtered": "EEG"})
+        node.update()
+        info.assert_called_once()
+        args = info.call_args[0]
+        assert args[0] == "prometheus_eeg_filtered"
+        assert args[1] == "EEG"
+        assert args[2] == 2
+        assert args[3] == 250.0
+        labels = [
+            call[0][1] for call in
+            info.return_value.desc.return_value.append_child.return_value
+            .append_child.return_value.append_child_value.call_args_list
+        ]
+        assert labels == ["Fp1", "Fp2"]
+
+    def test_push_chunk_contiguous_float32(self, lsl):
+        _, outlet = lsl
+        frame = _frame()
+        node = _node({"eeg": _port(frame, {"rate": 250})})
+        node.update()
+        data, timestamps = outlet.return_value.push_chunk.call_args[0]
+        assert data.dtype == np.float32
+        assert data.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(data, frame.values.astype(np.float32))
+        # Unix time converted to the LSL clock (offset = 1700000000 - 100)
+        np.testing.assert_allclose(timestamps, 100.0 + np.arange(10) / 250, atol=1e-6)
+
+    def test_microsecond_index(self, lsl):
+        _, outlet = lsl
+        frame = _frame()
+        frame.index = frame.index.as_unit("us")
+        node = _node({"eeg": _port(frame, {"rate": 250})})
+        node.update()
+        _, timestamps = outlet.return_value.push_chunk.call_args[0]
+        np.testing.assert_allclose(timestamps, 100.0 + np.arange(10) / 250, atol=1e-5)
+
+    def test_outlet_reused_across_updates(self, lsl):
+        info, outlet = lsl
+        node = _node({"eeg": _port(_frame(), {"rate": 250})})
+        node.update()
+        node.update()
+        info.assert_called_once()
+        assert outlet.return_value.push_chunk.call_count == 2
+
+    def test_irregular_rate_without_meta(self, lsl):
+        info, _ = lsl
+        node = _node({"ppg_stress_metric": _port(_frame(columns=("stress",)))})
+        node.update()
+        assert info.call_args[0][1] == "Misc"
+        assert info.call_args[0][3] == 0.0
+
+    def test_non_numeric_columns_skipped(self, lsl):
+        info, outlet = lsl
+        frame = _frame(columns=("score",))
+        frame["label"] = "x"
+        node = _node({"metric": _port(frame)})
+        node.update()
+        assert info.call_args[0][2] == 1
+        assert outlet.return_value.push_chunk.call_args[0][0].shape == (10, 1)
+
+    def test_one_outlet_per_port(self, lsl):
+        info, _ = lsl
+        node = _node({
+            "a": _port(_frame(), {"rate": 250}),
+            "b": _port(_frame(columns=("x",)), {"rate": 1}),
+            "c": _port(None),
+        })
+        node.update()
+        assert [call[0][0] for call in info.call_args_list] == ["prometheus_a", "prometheus_b"]
@@ -0,0 +1,128 @@
+"""Tests for the LSL source node.
+
+Uses a fake inlet that writes into the caller's buffer, mimicking
+``pull_chunk(dest_obj=...)`` — no LSL network required.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from nodes.eeg.lsl_source import LSLSource
+
+LABELS = ["AF3", "T7", "Pz", "T8", "AF4"]
+
+
+class FakeInlet:
+    """Serve a (samples, channels) array in pulls of at most max_samples."""
+
+    def __init__(self, data, stamps, rate=128):
+        self._data = data
+        self._stamps = stamps
+        self._pos = 0
+        self.pulls = 0
+        self._info = MagicMock()
+        self._info.channel_format.return_value = 1
+        self._info.channel_count.return_value = data.shape[1]
+        self._info.nominal_srate.return_value = rate
+        channels = [MagicMock() for _ in LABELS]
+        for channel, label, sibling in zip(channels, LABELS, channels[1:] + [None]):
+            channel.child_value.return_value = label
+            channel.next_sibling.return_value = sibling
+        self._info.desc.return_value.child.return_value.child.return_value = channels[0]
+
+    def info(self):
+        return self._info
+
+    def pull_chunk(self, timeout=0.0, max_samples=1024, dest_obj=None):
+        self.pulls += 1
+        n = min(max_samples, len(self._stamps) - self._pos)
+        dest_obj[:n] = self._data[self._pos:self._pos + n]
+        stamps = list(self._stamps[self._pos:self._pos + n])
+        self._pos += n
+        return None, stamps
+
+
+@pytest.fixture
+def inlet():
+    data = np.tile(np.arange(300, dtype=np.float32), (5, 1)).T
+    data *= np.arange(1, 6, dtype=np.float32)
+    # Jittery LSL timestamps at 128 Hz
+    rng = np.random.default_rng(0)
+    stamps = 1000 + np.arange(300) / 128 + rng.uniform(0, 0.004, 300)
+    fake = FakeInlet(data, stamps)
+    with patch("nodes.eeg.lsl_source.resolve_byprop", return_value=["stream"]), \
+         patch("nodes.eeg.lsl_source.StreamInlet", return_value=fake), \
+         patch("nodes.eeg.lsl_source.local_clock", return_value=1000.0), \
+         patch("nodes.eeg.lsl_source.time.time", return_value=1700000000.0):
+        yield fake
+
+
+def _node(**kwargs):
+    node = LSLSource(value="EmotivDataStream-EEG", **kwargs)
+    node.o = MagicMock()
+    node.logger = MagicMock()
+    return node
+
+
+class TestLSLSource:
+
+    def test_waits_for_stream(self):
+        with patch("nodes.eeg.lsl_source.resolve_byprop", return_value=[]):
+            node = _node()
+            node.update()
+        assert node._inlet is None
+        assert not isinstance(node.o.data, pd.DataFrame)
+
+    def test_selects_channels_by_label(self, inlet):
+        node = _node(channels=["Pz", "AF3"], buffer_duration=10)
+        node.update()
+        df = node.o.data
+        assert list(df.columns) == ["Pz", "AF3"]
+        np.testing.assert_array_equal(df["Pz"].values, np.arange(300) * 3)
+        np.testing.assert_array_equal(df["AF3"].values, np.arange(300))
+        assert node.o.meta == {"rate": 128}
+
+    def test_all_channels_by_default(self, inlet):
+        node = _node(buffer_duration=10)
+        node.update()
+        assert list(node.o.data.columns) == LABELS
+
+    def test_unknown_channel_raises(self, inlet):
+        node = _node(channels=["Cz"])
+        with pytest.raises(ValueError, match="Unknown channels"):
+            node.update()
+
+    def test_backlog_drained_in_several_pulls(self, inlet):
+        # 1 s buffer = 128 samples; 300 samples need three pulls
+        node = _node(channels=["T7"])
+        node.update()
+        assert inlet.pulls == 3
+        np.testing.assert_array_equal(node.o.data["T7"].values, np.arange(300) * 2)
+
+    def test_buffer_is_allocated_once(self, inlet):
+        node = _node()
+        node.update()
+        buffer = node._buffer
+        node.update()
+        assert node._buffer is buffer
+
+    def test_clock_model_stamps_evenly_in_unix_time(self, inlet):
+        node = _node()
+        node.update()
+        index = node.o.data.index
+        assert isinstance(index, pd.DatetimeIndex)
+        assert np.ptp(np.diff(index.asi8)) <= 1  # nanosecond rounding only
+        assert abs(index[0].timestamp() - 1700000000.0) < 0.01
+
+    def test_lsl_clock_keeps_stamps(self, inlet):
+        node = _node(clock="lsl")
+        node.update()
+        index = node.o.data.index
+        assert abs(index[0].timestamp() - (1700000000.0 + inlet._stamps[0] - 1000)) < 1e-6
+        assert np.ptp(np.diff(index.asi8)) > 1000
+
+    def test_unknown_clock_raises(self):
+        with pytest.raises(ValueError, match="Unknown clock"):
+            LSLSource(value="x", clock="wall")
@@ -3,16 +3,24 @@
 import numpy as np
 import pandas as pd
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from scipy import signal as sp_signal
 from nodes.physio.ppg import (
     PPGSimulator,
+    EDASimulator,
+    ECGSimulator,
     StressCalculator,
     CognitiveLoadCalculator,
     AwakenessCalculator,
     AttentionCalculator,
+    RespiratoryScores,
     RespiratoryMetricsCalculator,
     RespiratoryRateCalculator,
+    HRVTimeDomainCalculator,
+    HRVFrequencyDomainCalculator,
+    RespiratorySignalExtractor,
+    PPGPeakDetector,
+    BeatQuality,
 )
 
 
@@ -91,6 +99,53 @@ class TestAttentionCalculator:
 
 # ── RespiratoryMetricsCalculator ────────────────────────────────────────────
 
+class TestRespiratoryScores:
+
+    def _scores(self, rates, **kwargs):
+        node = RespiratoryScores(**kwargs)
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        index = pd.date_range("2024-01-01", periods=len(rates), freq="1s", tz="UTC")
+        node.i.data = pd.DataFrame({"respiratory_rate": rates}, index=index)
+        node.update()
+        return node.o.data
+
+    def test_matches_single_calculators(self):
+        rates = [4, 10, 12.5, 18, 25, 60]
+        out = self._scores(rates)
+        assert list(out.columns) == ["stress_score", "CognitiveLoad_score",
+                                     "awakeness_score", "attention_score"]
+        calculators = {
+            "stress_score": _make_calculator(StressCalculator, min_rate=10, max_rate=40),
+            "CognitiveLoad_score": _make_calculator(CognitiveLoadCalculator, min_rate=18, max_rate=30),
+            "awakeness_score": _make_calculator(AwakenessCalculator, min_rate=6, max_rate=15),
+            "attention_score": _make_calculator(AttentionCalculator, min_rate=10, max_rate=20),
+        }
+        for name, calc in calculators.items():
+            expected = [calc.calculate_score(rate) for rate in rates]
+            np.testing.assert_allclose(out[name].values, expected)
+
+    def test_custom_table(self):
+        out = self._scores([15], scores={"calm_score": [10, 20]})
+        assert out.to_dict("list") == {"calm_score": [50.0]}
+
+    def test_invalid_range_raises(self):
+        with pytest.raises(ValueError, match="min_rate"):
+            RespiratoryScores(scores={"bad": [20, 10]})
+
+    def test_missing_column_is_logged(self):
+        node = RespiratoryScores()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.o.data = None
+        node.logger = MagicMock()
+        node.i.data = pd.DataFrame({"other": [1.0]})
+        node.update()
+        assert node.o.data is None
+        node.logger.error.assert_called_once()
+
+
 class TestRespiratoryMetricsCalculator:
 
     def setup_method(self):
@@ -192,3 +247,683 @@ class TestPPGSimulator:
             self.sim.o.data["0"].values,
             sim2.o.data["0"].values,
         )
+
+    def test_matches_per_sample_reference(self):
+        """Beat-segment synthesis reproduces the original per-sample loop."""
+        rng = np.random.default_rng(seed=42)
+        mean_rr, phase, rr = 60 / 70, 0.0, 60 / 70
+        expected = []
+        for _ in range(100):
+            chunk = np.empty(5)
+            for i in range(5):
+                phase += 1 / 25 / rr
+                if phase >= 1.0:
+                    phase -= 1.0
+                    rr = np.clip(mean_rr + rng.normal(0, 0.04), mean_rr * 0.7, mean_rr * 1.4)
+                chunk[i] = self.sim._ppg_waveform(phase)
+            expected.append(chunk + rng.normal(0, 0.01, size=5))
+        values = []
+        for _ in range(100):
+            self.sim.update()
+            values.append(self.sim.o.data["0"].values)
+        np.testing.assert_allclose(np.concatenate(values), np.concatenate(expected), atol=1e-9)
+
+    def test_heart_rate_setter(self):
+        """A new heart rate applies from the next beat, at the same variability."""
+        self.sim.hrv_std = 0
+        self.sim.heart_rate = 120
+        assert self.sim.heart_rate == pytest.approx(120)
+        from scipy.signal import find_peaks
+        peaks, _ = find_peaks(self.sim.generate(25 * 20)[:, 0], height=0.5)
+        np.testing.assert_allclose(np.diff(peaks[1:]), 12.5, atol=1)
+
+    def test_many_channels(self):
+        sim = PPGSimulator(sampling_rate=250, chunk_duration=1, channels=64)
+        sim.o = MagicMock()
+        for _ in range(10):
+            sim.update()
+        df = sim.o.data
+        assert df.shape == (250, 64)
+        assert list(df.columns[:2]) == ["0", "1"]
+        # Channels have their own heart rate variability
+        assert not np.allclose(df["0"].values, df["1"].values, atol=0.1)
+
+    def test_wavetable_loops_at_beat_onset(self, tmp_path):
+        path = str(tmp_path / "ppg.npy")
+        sim = PPGSimulator(wavetable=path, wavetable_duration=10)
+        sim.o = MagicMock()
+        bank = np.load(path)[:, 0]
+        assert len(bank) >= 250
+        values = []
+        for _ in range(2 * len(bank) // 5 + 1):
+            sim.update()
+            values.extend(sim.o.data["0"].values)
+        np.testing.assert_array_equal(values[len(bank):2 * len(bank)], bank)
+        # The loop point falls between two beats: no peak is cut in half
+        from scipy.signal import find_peaks
+        peaks, _ = find_peaks(np.array(values), height=0.5, distance=10)
+        intervals = np.diff(peaks)
+        assert intervals.min() > 0.6 * 25 * 60 / 70
+
+    def test_multichannel_wavetable(self, tmp_path):
+        path = str(tmp_path / "ppg.npy")
+        sim = PPGSimulator(channels=3, wavetable=path, wavetable_duration=10)
+        sim.o = MagicMock()
+        sim.update()
+        assert sim.o.data.shape == (5, 3)
+        # Another channel count rebuilds the bank
+        sim = PPGSimulator(channels=2, wavetable=path, wavetable_duration=10)
+        sim.o = MagicMock()
+        sim.update()
+        assert sim.o.data.shape == (5, 2)
+
+
+# ── EDA / ECG simulators ──────────────────────────────────────────────────
+
+def _fake_simulate(length, sampling_rate, random_state, **kwargs):
+    """Segment whose values encode the seed, to trace segment joins."""
+    return np.full(length, float(random_state))
+
+
+class TestSegmentSimulators:
+
+    def test_eda_emits_one_chunk_per_tick(self):
+        with patch("nodes.physio.ppg.nk.eda_simulate", side_effect=_fake_simulate) as simulate:
+            sim = EDASimulator(sampling_rate=15, chunk_duration=0.2, segment_duration=10)
+            sim.o = MagicMock()
+            for _ in range(10):
+                sim.update()
+                assert sim.o.data.shape == (3, 1)
+        # 30 samples emitted from a single 150-sample segment
+        assert simulate.call_count == 1
+        assert list(sim.o.data.columns) == ["eda_signal"]
+        assert sim.o.meta == {"rate": 15}
+
+    def test_timestamps_follow_declared_rate(self):
+        with patch("nodes.physio.ppg.nk.ecg_simulate", side_effect=_fake_simulate):
+            sim = ECGSimulator(sampling_rate=100, chunk_duration=0.2)
+            sim.o = MagicMock()
+            with patch("nodes.physio.ppg.time.time", side_effect=[1700000000.0, 1700000000.2]):
+                sim.update()
+                first = sim.o.data.index
+                sim.update()
+                second = sim.o.data.index
+        index = first.append(second)
+        assert len(index) == 40
+        assert np.allclose(np.diff(index.asi8), 10_000_000, atol=1)
+
+    def test_segments_are_crossfaded(self):
+        with patch("nodes.physio.ppg.nk.eda_simulate", side_effect=_fake_simulate) as simulate:
+            sim = EDASimulator(sampling_rate=10, chunk_duration=1, segment_duration=3, seed=0)
+            sim.o = MagicMock()
+            values = []
+            for _ in range(6):
+                sim.update()
+                values.extend(sim.o.data["eda_signal"].values)
+        assert simulate.call_args_list[1].kwargs["random_state"] == 1
+        values = np.array(values)
+        # Seed 0 segment, a 1 s ramp, then seed 1 segment
+        assert np.all(values[:30] == 0)
+        assert np.all(np.diff(values[30:40]) > 0)
+        assert np.all(values[40:60] == 1)
+
+    def test_ecg_column_can_stand_in_for_bitalino(self):
+        with patch("nodes.physio.ppg.nk.ecg_simulate", side_effect=_fake_simulate):
+            sim = ECGSimulator(column="A1_ECG")
+            sim.o = MagicMock()
+            sim.update()
+        assert list(sim.o.data.columns) == ["A1_ECG"]
+        assert sim.o.data.shape == (20, 1)
+
+
+# ── HRVTimeDomainCalculator ──────────────────────────────────────────────
+
+def _hrv_reference(rr):
+    """NeuroKit time-domain conventions, computed from scratch."""
+    diff = np.diff(rr)
+    return {
+        "HRV_MeanNN": np.mean(rr),
+        "HRV_SDNN": np.std(rr, ddof=1),
+        "HRV_RMSSD": np.sqrt(np.mean(diff ** 2)),
+        "HRV_SDSD": np.std(diff, ddof=1),
+        "HRV_pNN50": 100 * np.sum(np.abs(diff) > 50) / len(rr),
+    }
+
+
+class TestHRVTimeDomainCalculator:
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.rr = 850 + 60 * rng.standard_normal(400)  # ms
+        self.times = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(
+            np.concatenate([[0], np.cumsum(self.rr)]), unit="ms")
+        self.rr = np.diff(self.times.asi8) / 1e6  # as stamped
+
+    def _node(self, **kwargs):
+        node = HRVTimeDomainCalculator(**kwargs)
+        node.i = MagicMock()
+        node.o = MagicMock()
+        return node
+
+    def _feed(self, node, times):
+        node.o.data = None
+        node.i.ready.return_value = True
+        node.i.data = pd.DataFrame({"peak": 1.0}, index=times)
+        node.update()
+        return node.o.data
+
+    def test_matches_reference(self):
+        node = self._node(horizon=1e6)
+        for k in range(0, len(self.times), 7):
+            out = self._feed(node, self.times[k:k + 7])
+        expected = _hrv_reference(self.rr)
+        for key, value in expected.items():
+            assert out[key].iloc[0] == pytest.approx(value, rel=1e-9)
+        assert out.index[0] == self.times[-1]
+
+    def test_overlapping_windows_are_deduplicated(self):
+        sliding = self._node(horizon=1e6)
+        for k in range(1, len(self.times) + 1):
+            # Growing window of the last 12 beats, like a Slide node
+            out = self._feed(sliding, self.times[max(0, k - 12):k])
+        assert out["HRV_MeanNN"].iloc[0] == pytest.approx(np.mean(self.rr), rel=1e-9)
+        assert out["HRV_pNN50"].iloc[0] == pytest.approx(_hrv_reference(self.rr)["HRV_pNN50"])
+
+    def test_emits_only_on_new_beats(self):
+        node = self._node()
+        assert self._feed(node, self.times[:5]) is not None
+        assert self._feed(node, self.times[:5]) is None
+        assert self._feed(node, self.times[3:6]) is not None
+
+    def test_horizon_bounds_memory(self):
+        node = self._node(horizon=60)
+        for k in range(len(self.times)):
+            out = self._feed(node, self.times[k:k + 1])
+        # Beats within the last 60 s only
+        recent = (self.times[-1] - self.times[1:]) <= pd.Timedelta(seconds=60)
+        expected = _hrv_reference(self.rr[recent])
+        for key, value in expected.items():
+            assert out[key].iloc[0] == pytest.approx(value, rel=1e-6)
+        assert len(node._beats) == recent.sum()
+        assert len(node._diffs) == recent.sum() - 1
+
+
+# ── HRVFrequencyDomainCalculator ─────────────────────────────────────────
+
+def _beat_times(rr_of_t, duration):
+    """Beat times whose RR interval (ms) follows ``rr_of_t`` (t in seconds)."""
+    t, times = 0.0, [0.0]
+    while t < duration:
+        t += rr_of_t(t) / 1000
+        times.append(t)
+    return pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(np.array(times), unit="s")
+
+
+class TestHRVFrequencyDomainCalculator:
+
+    def _run(self, times, chunk=5, **kwargs):
+        node = HRVFrequencyDomainCalculator(**kwargs)
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        outputs = []
+        for k in range(0, len(times), chunk):
+            node.o.data = None
+            # Overlapping windows, like a Slide node
+            node.i.data = pd.DataFrame({"peak": 1.0}, index=times[max(0, k - 10):k + chunk])
+            node.update()
+            if node.o.data is not None:
+                outputs.append(node.o.data)
+        return node, pd.concat(outputs)
+
+    def test_lf_oscillation(self):
+        # 30 ms modulation at 0.1 Hz: variance of 450 ms² in the LF band
+        times = _beat_times(lambda t: 800 + 30 * np.sin(2 * np.pi * 0.1 * t), 200)
+        _, out = self._run(times)
+        last = out.iloc[-1]
+        assert last["HRV_LF"] == pytest.approx(450, rel=0.2)
+        assert last["HRV_HF"] < 0.1 * last["HRV_LF"]
+        assert last["HRV_LFHF"] > 10
+
+    def test_hf_oscillation(self):
+        # Respiratory sinus arrhythmia at 0.25 Hz
+        times = _beat_times(lambda t: 900 + 40 * np.sin(2 * np.pi * 0.25 * t), 200)
+        _, out = self._run(times)
+        last = out.iloc[-1]
+        assert last["HRV_HF"] == pytest.approx(800, rel=0.2)
+        assert last["HRV_LFHF"] < 0.1
+
+    def test_matches_scipy_lombscargle(self):
+        rng = np.random.default_rng(1)
+        times = _beat_times(lambda t: 850 + 50 * rng.standard_normal(), 150)
+        node, _ = self._run(times)
+        t = np.array([beat[1] for beat in node._beats])
+        rr = np.array([beat[2] for beat in node._beats])
+        expected = sp_signal.lombscargle(t, rr - rr.mean(), node._omega)
+        duration = t[-1] - t[0]
+        np.testing.assert_allclose(node._spectrum(), expected * 2 * duration / len(t), rtol=1e-6)
+
+    def test_waits_for_min_duration_and_bounds_window(self):
+        times = _beat_times(lambda t: 1000, 400)
+        node, out = self._run(times, horizon=120, min_duration=60)
+        assert out.index[0] - times[0] >= pd.Timedelta(seconds=60)
+        assert len(node._beats) <= 121
+
+    def test_repeats_last_spectrum_during_gap(self):
+        times = _beat_times(lambda t: 800 + 30 * np.sin(2 * np.pi * 0.1 * t), 100)
+        node, out = self._run(times, interval=5)
+        # Dropout: ticks with no input, then with only invalid beats
+        invalid = pd.DataFrame({"rr": np.nan}, index=times[-1] + pd.to_timedelta([1, 2], unit="s"))
+        start, stamps = node._published, []
+        for k, now in enumerate(start + np.arange(1, 12)):
+            node.o.data = None
+            node.i.ready.return_value = k == 3
+            node.i.data = invalid
+            with patch("nodes.physio.ppg.time.time", return_value=now):
+                node.update()
+            if node.o.data is not None:
+                np.testing.assert_array_equal(node.o.data.values, out.iloc[-1:].values)
+                stamps.append(node.o.data.index[0])
+        assert stamps == list(pd.to_datetime([start + 5, start + 10], unit="s", utc=True))
+
+    def test_no_repeat_without_interval(self):
+        times = _beat_times(lambda t: 800, 100)
+        node, _ = self._run(times, interval=None)
+        node.o.data = None
+        node.i.ready.return_value = False
+        with patch("nodes.physio.ppg.time.time", return_value=1e12):
+            node.update()
+        assert node.o.data is None
+
+
+# ── RespiratorySignalExtractor ───────────────────────────────────────────
+
+def _rsa_ppg(duration=120, rate=25, breathing=0.25):
+    """PPG pulses whose intervals are modulated by breathing (sinus arrhythmia)."""
+    beats, t = [], 0.0
+    while t < duration:
+        beats.append(t)
+        t += 0.85 + 0.08 * np.sin(2 * np.pi * breathing * t)
+    time_axis = np.arange(int(duration * rate)) / rate
+    ppg = np.zeros_like(time_axis)
+    for beat in beats:
+        ppg += np.exp(-((time_axis - beat - 0.15) ** 2) / (2 * 0.06 ** 2))
+    index = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(time_axis, unit="s")
+    return pd.DataFrame({"0": ppg}, index=index)
+
+
+class TestRespiratorySignalExtractor:
+
+    def _run(self, ppg, chunk):
+        node = RespiratorySignalExtractor()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        node.i.meta = {"rate": 25}
+        outputs = []
+        for k in range(0, len(ppg), chunk):
+            node.o.data = None
+            node.i.data = ppg.iloc[k:k + chunk]
+            node.update()
+            if node.o.data is not None:
+                outputs.append(node.o.data)
+        return node, pd.concat(outputs)
+
+    def test_recovers_breathing_rate(self):
+        _, out = self._run(_rsa_ppg(), chunk=5)
+        rsp = out["rsp_signal"].values[len(out) // 4:]  # past the filter transient
+        freqs, psd = sp_signal.welch(rsp, fs=25, nperseg=min(len(rsp), 1000))
+        assert freqs[np.argmax(psd)] == pytest.approx(0.25, abs=0.03)
+
+    def test_outputs_only_new_samples(self):
+        ppg = _rsa_ppg(duration=60)
+        node, out = self._run(ppg, chunk=5)
+        assert out.index.is_monotonic_increasing and out.index.is_unique
+        # Contiguous: every input sample between the first and last emitted one
+        span = ppg.loc[out.index[0]:out.index[-1]]
+        assert len(span) == len(out)
+        assert node.o.meta == {"rate": 25}
+        # Bounded look-back
+        assert len(node._values) <= 2 * 25 + 8 + 5
+
+    def test_chunking_does_not_change_output(self):
+        ppg = _rsa_ppg(duration=60)
+        _, streamed = self._run(ppg, chunk=3)
+        _, batched = self._run(ppg, chunk=250)
+        common = streamed.index.intersection(batched.index)
+        assert len(common) > 0.8 * len(batched)
+        np.testing.assert_allclose(streamed.loc[common, "rsp_signal"],
+                                   batched.loc[common, "rsp_signal"], atol=1e-9)
+
+    def test_microsecond_index(self):
+        ppg = _rsa_ppg(duration=60)
+        ppg.index = pd.date_range("2024-01-01", periods=len(ppg), freq="40ms", tz="UTC")
+        _, streamed = self._run(ppg, chunk=5)
+        reference = ppg.copy()
+        reference.index = reference.index.as_unit("ns")
+        _, expected = self._run(reference, chunk=5)
+        assert streamed.index.equals(expected.index)
+        np.testing.assert_allclose(streamed["rsp_signal"], expected["rsp_signal"])
+
+    def test_rate_is_required(self):
+        node = RespiratorySignalExtractor()
+        node.i = MagicMock()
+        node.i.ready.return_value = True
+        node.i.meta = {}
+        node.i.data = _rsa_ppg(duration=1)
+        with pytest.raises(ValueError, match="rate"):
+            node.update()
+
+
+# ── PPGPeakDetector ──────────────────────────────────────────────────────
+
+def _pulse_ppg(beats, duration, rate=25, seed=0):
+    """PPG with a systolic peak and a dicrotic wave per beat, off the sample grid."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * rate)) / rate
+    x = 0.2 * np.sin(2 * np.pi * 0.05 * t) + rng.normal(0, 0.01, t.size)
+    for beat in beats:
+        x += np.exp(-0.5 * ((t - beat) / 0.08) ** 2)
+        x += 0.4 * np.exp(-0.5 * ((t - beat - 0.3) / 0.06) ** 2)
+    index = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(t, unit="s")
+    return pd.DataFrame({"0": x}, index=index)
+
+
+def _pulse_beats(duration, mean=0.85, seed=1):
+    rng = np.random.default_rng(seed)
+    beats = 0.3 + np.cumsum(mean + rng.normal(0, 0.05, int(duration / mean) + 2))
+    return beats[beats < duration - 0.5]
+
+
+class TestPPGPeakDetector:
+
+    def _run(self, frame, chunk, **kwargs):
+        node = PPGPeakDetector(**kwargs)
+        node.i = MagicMock()
+        node.i.ready.return_value = True
+        node.i.meta = {"rate": 25}
+        outputs = []
+        for k in range(0, len(frame), chunk):
+            node.o = MagicMock()
+            node.o.data = None
+            node.i.data = frame.iloc[k:k + chunk]
+            node.update()
+            if node.o.data is not None:
+                outputs.append(node.o.data)
+        return pd.concat(outputs)
+
+    def test_detects_every_beat_without_dicrotic_wave(self):
+        beats = _pulse_beats(60)
+        out = self._run(_pulse_ppg(beats, 60), chunk=5)
+        assert list(out.columns) == ["rr"]
+        expected = beats[beats > 2.5]
+        detected = out.index[out.index > pd.Timestamp("2024-01-01 00:00:02.5", tz="UTC")]
+        assert len(detected) == len(expected)
+
+    def test_sub_sample_rr_intervals(self):
+        beats = _pulse_beats(60)
+        out = self._run(_pulse_ppg(beats, 60), chunk=5)
+        assert np.isnan(out["rr"].iloc[0])
+        first = (out.index[0] - pd.Timestamp("2024-01-01", tz="UTC")).total_seconds()
+        expected = np.diff(beats[beats > first - 0.2]) * 1000
+        errors = out["rr"].values[1:len(expected) + 1] - expected
+        # Well under the 40 ms sampling period
+        assert np.sqrt(np.mean(errors ** 2)) < 5
+        # RR intervals match the timestamps, which feed the HRV nodes
+        np.testing.assert_allclose(out["rr"].values[1:], np.diff(out.index.asi8) / 1e6)
+
+    def test_chunking_does_not_change_result(self):
+        frame = _pulse_ppg(_pulse_beats(30), 30)
+        one = self._run(frame, chunk=len(frame))
+        small = self._run(frame, chunk=3)
+        assert one.index.equals(small.index)
+
+    def test_recovers_from_amplitude_drop(self):
+        beats = _pulse_beats(60)
+        frame = _pulse_ppg(beats, 60)
+        frame.iloc[len(frame) // 2:] *= 0.2
+        out = self._run(frame, chunk=5)
+        late = out.index > pd.Timestamp("2024-01-01 00:00:40", tz="UTC")
+        assert late.sum() == (beats > 40).sum()
+
+    def test_feeds_hrv_time_domain(self):
+        out = self._run(_pulse_ppg(_pulse_beats(60), 60), chunk=5)
+        node = HRVTimeDomainCalculator()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        node.i.data = out
+        node.update()
+        assert node.o.data["HRV_MeanNN"].iloc[0] == pytest.approx(np.nanmean(out["rr"]), rel=1e-6)
+
+    def test_microsecond_index(self):
+        beats = _pulse_beats(60)
+        frame = _pulse_ppg(beats, 60)
+        frame.index = pd.date_range("2024-01-01", periods=len(frame), freq="40ms", tz="UTC")
+        assert frame.index.unit == "us"
+        out = self._run(frame, chunk=5)
+        assert len(out) == (beats > 2).sum()
+        assert out["rr"].median() == pytest.approx(np.median(np.diff(beats)) * 1000, rel=0.05)
+        assert out.index[0].year == 2024
+
+    def test_missing_rate_raises(self):
+        node = PPGPeakDetector()
+        node.i = MagicMock()
+        node.i.ready.return_value = True
+        node.i.meta = {}
+        node.i.data = _pulse_ppg([1.0], 3)
+        with pytest.raises(ValueError, match="rate"):
+            node.update()
+
+
+# ── BeatQuality ──────────────────────────────────────────────────────────
+
+def _with_artefact(frame, start, stop, seed=2):
+    """Add a motion artefact: large, slow random swings between two times (s)."""
+    rng = np.random.default_rng(seed)
+    frame = frame.copy()
+    t = (frame.index - frame.index[0]).total_seconds()
+    burst = (t >= start) & (t < stop)
+    frame.loc[burst, "0"] += np.cumsum(rng.normal(0, 0.6, burst.sum()))
+    return frame
+
+
+class TestBeatQuality:
+
+    def _run(self, frame, chunk=5, **kwargs):
+        detector = PPGPeakDetector(rate=25)
+        node = BeatQuality(rate=25, **kwargs)
+        detector.i = node.i = MagicMock()
+        node.i.ready.return_value = True
+        node.i_beats = MagicMock()
+        outputs = []
+        for k in range(0, len(frame), chunk):
+            node.i.data = frame.iloc[k:k + chunk]
+            detector.o = node.i_beats
+            detector.o.data = None
+            detector.update()
+            node.i_beats.ready.return_value = detector.o.data is not None
+            node.o = MagicMock()
+            node.o.data = None
+            node.update()
+            if node.o.data is not None:
+                outputs.append(node.o.data)
+        return node, pd.concat(outputs)
+
+    def _seconds(self, out):
+        return (out.index - pd.Timestamp("2024-01-01", tz="UTC")).total_seconds()
+
+    def test_clean_beats_are_valid(self):
+        beats = _pulse_beats(60)
+        node, out = self._run(_pulse_ppg(beats, 60))
+        assert list(out.columns) == ["rr", "quality", "valid"]
+        assert out["valid"].all()
+        assert out["quality"].min() > 0.9
+        # Every detected beat is scored, in order, and the signal history stays bounded
+        assert out.index.is_monotonic_increasing
+        assert len(out) == (beats > 2).sum()
+        assert len(node._values) < 25 * 4
+
+    def test_artefact_beats_are_marked(self):
+        frame = _with_artefact(_pulse_ppg(_pulse_beats(60), 60), 30, 34)
+        _, out = self._run(frame)
+        seconds = self._seconds(out)
+        assert out["valid"][(seconds > 5) & (seconds < 29)].all()
+        assert out["valid"][seconds > 38].all()
+        assert not out["valid"][(seconds > 30) & (seconds < 34)].any()
+        # The first interval after an artefact is not a normal-to-normal interval
+        after = np.flatnonzero(out["valid"].values[1:] & ~out["valid"].values[:-1]) + 1
+        assert np.isnan(out["rr"].values[after]).all()
+
+    def test_drop_mode(self):
+        frame = _with_artefact(_pulse_ppg(_pulse_beats(60), 60), 30, 34)
+        _, marked = self._run(frame)
+        _, dropped = self._run(frame, mode="drop")
+        assert dropped["valid"].all()
+        assert dropped.index.equals(marked.index[marked["valid"].values])
+
+    def test_hrv_skips_flagged_intervals(self):
+        frame = _with_artefact(_pulse_ppg(_pulse_beats(60), 60), 30, 34)
+        _, out = self._run(frame)
+        node = HRVTimeDomainCalculator()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        node.i.data = out
+        node.update()
+        usable = out["valid"].values & ~np.isnan(out["rr"].values)
+        rr = np.diff(out.index.asi8)[usable[1:]] / 1e6
+        assert node.o.data["HRV_MeanNN"].iloc[0] == pytest.approx(rr.mean(), rel=1e-6)
+        assert len(node._beats) == usable.sum()
+
+    def test_hrv_skips_update_without_valid_beats(self):
+        node = HRVTimeDomainCalculator()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        index = pd.date_range("2024-01-01", periods=4, freq="800ms", tz="UTC")
+        node.i.data = pd.DataFrame({"rr": np.nan, "valid": True}, index=index)
+        node.i.data.loc[index[1:], "rr"] = 800.0
+        node.update()
+        node.o.data = None
+        later = index[-1:] + pd.Timedelta("800ms")
+        node.i.data = pd.DataFrame({"rr": [800.0], "valid": [False]}, index=later)
+        node.update()
+        assert node.o.data is None
+
+    def _feed(self, node, ppg=None, beats=None):
+        node.i.ready.return_value = ppg is not None
+        node.i.data = ppg
+        node.i_beats.ready.return_value = beats is not None
+        node.i_beats.data = beats
+        node.o = MagicMock()
+        node.o.data = None
+        node.update()
+        return node.o.data
+
+    def test_beat_outside_history(self):
+        beats = _pulse_beats(30)
+        frame = _pulse_ppg(beats, 30)
+        frame.index = pd.date_range("2024-01-01", periods=len(frame), freq="40ms", tz="UTC")
+        node = BeatQuality(rate=25, learning=3)
+        node.i = MagicMock()
+        node.i_beats = MagicMock()
+        times = frame.index[0] + pd.to_timedelta(beats, unit="s")
+        # 20 s of signal first: the window of the first beat has left the history
+        self._feed(node, ppg=frame.iloc[:500])
+        outputs = [self._feed(node, beats=pd.DataFrame({"rr": np.nan}, index=times[:1]))]
+        for k in range(500, len(frame), 5):
+            chunk = frame.iloc[k:k + 5]
+            new = times[(times >= chunk.index[0]) & (times <= chunk.index[-1])]
+            outputs.append(self._feed(node, ppg=chunk,
+                                      beats=pd.DataFrame({"rr": 850.0}, index=new)))
+        out = pd.concat([output for output in outputs if output is not None])
+        assert out.index[0] == times[0]
+        assert not out["valid"].iloc[0] and np.isnan(out["quality"].iloc[0])
+        # The template is learnt from the next beats, which are all valid. The
+        # last beat is still waiting for the signal after it.
+        assert len(out) - 1 == (times >= frame.index[500]).sum() - 1
+        assert out["valid"].iloc[1:].all()
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown mode"):
+            BeatQuality(mode="keep")
+
+
+# ── Several devices ──────────────────────────────────────────────────────
+
+def _room(devices=3, duration=60):
+    """One PPG column per device, each with its own beats; the last one has an artefact."""
+    columns = {}
+    for d in range(devices):
+        frame = _pulse_ppg(_pulse_beats(duration, mean=0.7 + 0.1 * d, seed=d), duration, seed=d)
+        if d == devices - 1:
+            frame = _with_artefact(frame, 30, 34)
+        columns[f"p{d}"] = frame["0"]
+    return pd.DataFrame(columns)
+
+
+class TestSeveralDevices:
+
+    def _run(self, frame, column, chunk=5):
+        """Run detector, quality and time-domain HRV like the PPG graph does."""
+        detector = PPGPeakDetector(rate=25, column=column)
+        quality = BeatQuality(rate=25, column=column)
+        hrv = HRVTimeDomainCalculator()
+        detector.i = quality.i = MagicMock()
+        quality.i.ready.return_value = True
+        quality.i_beats = detector.o = MagicMock()
+        hrv.i = quality.o = MagicMock()
+        hrv.o = MagicMock()
+        beats, scored, indices = [], [], []
+        for k in range(0, len(frame), chunk):
+            quality.i.data = frame.iloc[k:k + chunk]
+            for node, outputs in ((detector, beats), (quality, scored), (hrv, indices)):
+                node.o.data = None
+                node.update()
+                node.o.ready.return_value = node.o.data is not None
+                if node.o.data is not None:
+                    outputs.append(node.o.data)
+        return pd.concat(beats), pd.concat(scored), pd.concat(indices)
+
+    def test_matches_one_device_at_a_time(self):
+        frame = _room()
+        beats, scored, indices = self._run(frame, column=["p0", "p1", "p2"])
+        for device in frame.columns:
+            single_beats, single_scored, single_indices = self._run(frame, column=device)
+            mine = beats[beats["device"] == device].drop(columns="device")
+            pd.testing.assert_frame_equal(mine, single_beats)
+            mine = scored[scored["device"] == device].drop(columns="device")
+            pd.testing.assert_frame_equal(mine, single_scored)
+            # Same indices, published in the row of the update that brought the beat
+            rows = indices.index.searchsorted(single_indices.index)
+            np.testing.assert_allclose(indices[f"{device}_HRV_RMSSD"].values[rows],
+                                       single_indices["HRV_RMSSD"].values)
+
+    def test_devices_as_columns(self):
+        _, scored, indices = self._run(_room(), column=["p0", "p1", "p2"])
+        assert list(scored.columns) == ["rr", "quality", "valid", "device"]
+        for _, beats in scored.groupby("device"):
+            assert beats.index.is_monotonic_increasing
+        assert {f"p{d}_HRV_MeanNN" for d in range(3)} <= set(indices.columns)
+        # Heart rates of the devices are told apart
+        last = indices.iloc[-1]
+        assert last["p0_HRV_MeanNN"] < last["p1_HRV_MeanNN"] < last["p2_HRV_MeanNN"]
+        # Only the device with the artefact has invalid beats
+        invalid = scored.loc[~scored["valid"], "device"].unique()
+        assert list(invalid) == ["p2"]
+
+    def test_frequency_domain_per_device(self):
+        index = _beat_times(lambda t: 800 + 30 * np.sin(2 * np.pi * 0.1 * t), 200)
+        other = _beat_times(lambda t: 900 + 40 * np.sin(2 * np.pi * 0.25 * t), 200)
+        beats = pd.concat([pd.DataFrame({"device": "a"}, index=index),
+                           pd.DataFrame({"device": "b"}, index=other)]).sort_index()
+        node = HRVFrequencyDomainCalculator()
+        node.i = MagicMock()
+        node.o = MagicMock()
+        node.i.ready.return_value = True
+        node.i.data = beats
+        node.update()
+        last = node.o.data.iloc[-1]
+        assert last["a_HRV_LFHF"] > 10
+        assert last["b_HRV_LFHF"] < 0.1
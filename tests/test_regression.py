@@ -4,9 +4,12 @@ These tests lock down critical constants, default values, and interfaces
 so that accidental changes are caught immediately.
 """
 
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 import pytest
+import yaml
 from nodes.eeg.metrics import bandpower as metrics_bandpower
 from nodes.eeg.ratio import bandpower as ratio_bandpower
 from nodes.classification.bayesian import BayesianAccumulation
@@ -19,6 +22,8 @@ from nodes.physio.ppg import (
 )
 from scripts.setup_ui import SCHEMA, HEADSETS
 
+GRAPHS = Path(__file__).parent.parent / "graphs"
+
 
 # ── Bandpower consistency ───────────────────────────────────────────────────
 
@@ -180,7 +185,8 @@ class TestSchemaRegression:
         """Schema must contain these sections."""
         section_names = [s["section"] for s in SCHEMA]
         expected = ["Devices", "Training — Baseline", "Training — Motor Imagery",
-                     "Training — Blink Detection", "OSC Output", "Paths & Models"]
+                     "Training — Blink Detection", "OSC Output", "LSL Output",
+                     "Paths & Models"]
         assert section_names == expected
 
     def test_expected_headset_ids(self):
@@ -198,3 +204,21 @@ class TestSchemaRegression:
         critical = {"PPG_DEVICE", "CAMERA_ENABLE", "MOTOR_ENABLE", "BLINK_ENABLE",
                     "OSC_ENABLE", "OSC_IP", "OSC_PORT", "BASELINE_ENABLE"}
         assert critical.issubset(all_keys), f"Missing: {critical - all_keys}"
+
+
+# ── Graph timing ────────────────────────────────────────────────────────────
+
+class TestGraphRegression:
+
+    @pytest.mark.parametrize("path", [
+        path for path in sorted(GRAPHS.glob("**/*.yaml")) if "chunk_duration" in path.read_text()
+    ], ids=lambda path: str(path.relative_to(GRAPHS)))
+    def test_chunks_match_graph_rate(self, path):
+        """Simulators must emit one tick of signal per tick, at the graph rate."""
+        config = yaml.safe_load(path.read_text())
+        for graph in config["graphs"]:
+            rate = graph.get("rate", 1)  # Timeflux default
+            for node in graph["nodes"]:
+                duration = node.get("params", {}).get("chunk_duration")
+                if duration is not None:
+                    assert duration * rate == pytest.approx(1), f"{graph['id']}: {node['id']}"
@@ -0,0 +1,54 @@
+"""Tests for the fixed-size ring buffer used by acquisition threads."""
+
+import numpy as np
+import pytest
+
+from nodes.common.ringbuffer import RingBuffer
+
+
+def _chunk(start, n, rows=2):
+    """Build a (rows, n) chunk whose values are the running sample index."""
+    return np.tile(np.arange(start, start + n, dtype=float), (rows, 1))
+
+
+class TestRingBuffer:
+
+    def test_read_returns_only_new_samples(self):
+        buf = RingBuffer(2, 10)
+        buf.write(_chunk(0, 4))
+        np.testing.assert_array_equal(buf.read(), _chunk(0, 4))
+        buf.write(_chunk(4, 3))
+        np.testing.assert_array_equal(buf.read(), _chunk(4, 3))
+        assert buf.read().shape == (2, 0)
+
+    def test_wrap_around_preserves_order(self):
+        buf = RingBuffer(2, 5)
+        buf.write(_chunk(0, 4))
+        buf.read()
+        buf.write(_chunk(4, 4))  # wraps past the end of storage
+        np.testing.assert_array_equal(buf.read(), _chunk(4, 4))
+
+    def test_overflow_drops_oldest_and_counts(self):
+        buf = RingBuffer(2, 5)
+        buf.write(_chunk(0, 4))
+        buf.write(_chunk(4, 4))
+        assert buf.overflows == 3
+        np.testing.assert_array_equal(buf.read(), _chunk(3, 5))
+
+    def test_chunk_larger_than_capacity(self):
+        buf = RingBuffer(2, 5)
+        buf.write(_chunk(0, 12))
+        assert buf.overflows == 7
+        assert buf.written == 12
+        np.testing.assert_array_equal(buf.read(), _chunk(7, 5))
+
+    def test_len_counts_unread(self):
+        buf = RingBuffer(1, 8)
+        buf.write(_chunk(0, 3, rows=1))
+        assert len(buf) == 3
+        buf.read()
+        assert len(buf) == 0
+
+    def test_zero_capacity_raises(self):
+        with pytest.raises(ValueError):
+            RingBuffer(1, 0)
@@ -1,5 +1,6 @@
 """Tests for the setup UI (parse_env, write_env, schema validation)."""
 
+import re
 import pytest
 from pathlib import Path
 from scripts.setup_ui import parse_env, write_env, SCHEMA, HEADSETS
@@ -102,6 +103,18 @@ class TestWriteEnv:
             for field in section["fields"]:
                 assert field["key"] in content, f"{field['key']} missing from .env output"
 
+    def test_app_flags_survive_rewrite(self, tmp_path):
+        """Every variable app.yaml reads must be in the schema, or rewriting .env drops it."""
+        app = (Path(__file__).parent.parent / "app.yaml").read_text()
+        blocks = re.findall(r"\{[{%](.*?)[%}]\}", app)
+        flags = {name for block in blocks for name in re.findall(r"\b[A-Z][A-Z_]+\b", block)}
+        env_file = tmp_path / ".env"
+        write_env(env_file, {"LSL_ENABLE": "true"})
+        parsed = parse_env(env_file)
+        assert parsed["LSL_ENABLE"] == "true"
+        keys = {field["key"] for section in SCHEMA for field in section["fields"]}
+        assert flags - keys <= {"EEG_DEVICE"}
+
 
 # ── Schema Validation ──────────────────────────────────────────────────────
 
@@ -0,0 +1,89 @@
+"""Tests for the virtual subject simulator."""
+
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from scipy.signal import find_peaks, welch
+
+from nodes.vision.virtual_subject import (
+    VirtualSubject, FACIAL_METRICS, BLENDSHAPES, LATENTS, _EEG_COUPLING,
+)
+
+PORTS = ["o_eeg", "o_ppg", "o_facial_metrics", "o_blendshapes", "o_state"]
+
+
+def _node(**kwargs):
+    node = VirtualSubject(**kwargs)
+    for port in PORTS:
+        setattr(node, port, MagicMock())
+    return node
+
+
+def _frozen(stress, attention, arousal, **kwargs):
+    """Virtual subject whose latent state stays put."""
+    node = _node(time_constant=1e12, **kwargs)
+    state = np.array([stress, attention, arousal])
+    node._latent = np.log(state / (1 - state))
+    return node
+
+
+def _run(node, ticks):
+    outputs = {port: [] for port in PORTS}
+    for _ in range(ticks):
+        node.update()
+        for port in PORTS:
+            outputs[port].append(getattr(node, port).data)
+    return {port: pd.concat(frames) for port, frames in outputs.items()}
+
+
+class TestVirtualSubject:
+
+    def test_outputs(self):
+        node = _node()
+        node.update()
+        assert node.o_eeg.data.shape == (25, 14)
+        assert node.o_eeg.meta == {"rate": 250}
+        assert node.o_ppg.data.shape == (2, 1)
+        assert list(node.o_facial_metrics.data.columns) == FACIAL_METRICS
+        assert list(node.o_blendshapes.data.columns) == BLENDSHAPES
+        assert list(node.o_state.data.columns) == LATENTS
+        assert node.o_state.data.index[0] == node.o_eeg.data.index[-1]
+
+    def test_coupling_follows_generator_bands(self):
+        node = _node()
+        assert node._eeg.bands == ["delta", "theta", "alpha", "beta", "gamma"]
+        assert _EEG_COUPLING.shape == (len(node._eeg.bands), len(LATENTS))
+
+    def test_state_is_bounded_and_drifts(self):
+        out = _run(_node(time_constant=5), 300)
+        state = out["o_state"].values
+        assert np.all((state > 0) & (state < 1))
+        assert np.all(np.ptp(state, axis=0) > 0.1)
+
+    def test_deterministic(self):
+        first = _run(_node(seed=3), 20)
+        second = _run(_node(seed=3), 20)
+        for port in PORTS:
+            np.testing.assert_array_equal(first[port].values, second[port].values)
+
+    def test_attention_desynchronizes_alpha(self):
+        focused = _run(_frozen(0.5, 0.95, 0.5), 100)["o_eeg"]["O1"].values
+        wandering = _run(_frozen(0.5, 0.05, 0.5), 100)["o_eeg"]["O1"].values
+        _, psd_focused = welch(focused, fs=250, nperseg=500)
+        _, psd_wandering = welch(wandering, fs=250, nperseg=500)
+        assert psd_focused[16:25].sum() < 0.7 * psd_wandering[16:25].sum()
+
+    def test_arousal_speeds_up_heart(self):
+        def beats(arousal):
+            ppg = _run(_frozen(0.5, 0.5, arousal), 400)["o_ppg"]["0"].values
+            return len(find_peaks(ppg, height=0.5, distance=10)[0])
+        assert beats(0.95) > 1.1 * beats(0.05)
+
+    def test_facial_metrics_follow_state(self):
+        calm = _run(_frozen(0.1, 0.9, 0.5), 50)["o_facial_metrics"]
+        tense = _run(_frozen(0.9, 0.1, 0.5), 50)["o_facial_metrics"]
+        assert calm["attention"].mean() > tense["attention"].mean() + 0.3
+        assert tense["stress"].mean() > calm["stress"].mean() + 0.3
+        blendshapes = _run(_frozen(0.9, 0.5, 0.5), 10)["o_blendshapes"]
+        assert blendshapes["browDownLeft"].mean() > 0.4
+        assert blendshapes.values.min() >= 0 and blendshapes.values.max() <= 1
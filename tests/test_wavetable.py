@@ -0,0 +1,84 @@
+"""Tests for the memory-mapped wavetable signal bank."""
+
+import numpy as np
+import pytest
+
+from nodes.common.wavetable import WaveTable
+
+
+def _ramp(length):
+    return np.stack([np.arange(length, dtype=float), -np.arange(length, dtype=float)], axis=1)
+
+
+class TestWaveTable:
+
+    def test_generated_once_then_reused(self, tmp_path):
+        path = str(tmp_path / "bank.npy")
+        calls = []
+
+        def generate(length):
+            calls.append(length)
+            return _ramp(length)
+
+        WaveTable(path, generate, 100)
+        table = WaveTable(path, generate, 100)
+        assert calls == [100]
+        assert len(table) == 100
+        assert table.channels == 2
+
+    def test_rebuilt_when_parameters_change(self, tmp_path):
+        path = str(tmp_path / "bank.npy")
+        calls = []
+
+        def generate(length):
+            calls.append(length)
+            return _ramp(length)
+
+        WaveTable(path, generate, 100, params={"rate": 250})
+        WaveTable(path, generate, 100, params={"rate": 250})
+        WaveTable(path, generate, 100, params={"rate": 500})
+        table = WaveTable(path, generate, 50, params={"rate": 500})
+        assert calls == [100, 100, 50]
+        assert len(table) == 50
+
+    def test_read_is_memory_mapped(self, tmp_path):
+        table = WaveTable(str(tmp_path / "bank.npy"), _ramp, 10)
+        assert isinstance(table._data, np.memmap)
+
+    def test_wrap_around_is_continuous(self, tmp_path):
+        table = WaveTable(str(tmp_path / "bank.npy"), _ramp, 10)
+        first = table.read(7)
+        second = table.read(7)
+        np.testing.assert_array_equal(first[:, 0], np.arange(7))
+        np.testing.assert_array_equal(second[:, 0], [7, 8, 9, 0, 1, 2, 3])
+
+    def test_read_longer_than_bank(self, tmp_path):
+        table = WaveTable(str(tmp_path / "bank.npy"), _ramp, 4)
+        np.testing.assert_array_equal(table.read(10)[:, 0], [0, 1, 2, 3, 0, 1, 2, 3, 0, 1])
+
+    def test_start_offset(self, tmp_path):
+        table = WaveTable(str(tmp_path / "bank.npy"), _ramp, 10, start=8)
+        np.testing.assert_array_equal(table.read(3)[:, 0], [8, 9, 0])
+
+    def test_crossfade_makes_loop_seamless(self, tmp_path):
+        # A sine whose length is not a whole number of periods
+        t = np.arange(1030)
+        signal = np.sin(2 * np.pi * t / 97.3)
+        table = WaveTable(str(tmp_path / "bank.npy"), lambda n: signal, 1030, crossfade=30)
+        assert len(table) == 1000
+        out = table.read(2000)[:, 0]
+        step = np.abs(np.diff(out)).max()
+        assert step <= np.abs(np.diff(signal)).max() * 1.01
+
+    def test_modulation_changes_gain_per_loop(self, tmp_path):
+        path = str(tmp_path / "bank.npy")
+        WaveTable.create(path, np.ones((5, 1)))
+        table = WaveTable(path, modulation=0.1, seed=0)
+        out = table.read(15)[:, 0]
+        gains = out.reshape(3, 5)
+        assert np.all(gains == gains[:, :1])
+        assert len(np.unique(gains[:, 0])) == 3
+
+    def test_missing_bank_without_generator_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="does not exist"):
+            WaveTable(str(tmp_path / "missing.npy"))
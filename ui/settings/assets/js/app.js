@@ -18,6 +18,8 @@ const SCHEMA = [
               description: 'Photoplethysmography sensor', options: ['fake', 'emotibit'] },
             { key: 'ECG', label: 'ECG Serial Port', type: 'text', default: '',
               description: 'BITalino serial port (leave empty to disable)', placeholder: '/dev/tty.BITalino-XX-XX' },
+            { key: 'ECG_TOPIC', label: 'ECG Topic', type: 'text', default: '',
+              description: 'Topic of the ECG heart metrics (leave empty for the BITalino)', placeholder: 'ecg_simulated' },
             { key: 'CAMERA_ENABLE', label: 'Camera', type: 'bool', default: 'false',
               description: 'Enable facial expression detection via camera' },
         ],
@@ -68,6 +70,14 @@ const SCHEMA = [
               description: 'Target OSC server port' },
         ],
     },
+    {
+        section: 'LSL Output',
+        icon: `<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5"><circle cx="12" cy="12" r="2"/><path d="M16.24 7.76a6 6 0 0 1 0 8.49M7.76 16.24a6 6 0 0 1 0-8.49M19.07 4.93a10 10 0 0 1 0 14.14M4.93 19.07a10 10 0 0 1 0-14.14"/></svg>`,
+        fields: [
+            { key: 'LSL_ENABLE', label: 'LSL Streaming', type: 'bool', default: 'false',
+              description: 'Publish filtered EEG and metrics as LSL outlets' },
+        ],
+    },
     {
         section: 'Paths & Models',
         icon: `<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5"><path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"/></svg>`,